@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Times the browser fetch path both ways against the stand-in server (fantasy.standin), on
+# synthetic static pages that look like the real ones to Chrome: the wanted table plus images,
+# a web font and an analytics script, every response delayed to stand in for the network.
+#   per page   a fresh headless Chrome for every page, nothing blocked (what SeleniumSource did)
+#   shared     one BrowserSession: all pages opened in tabs at once, images/fonts/analytics blocked
+# and reports Chrome starts, time spent starting Chrome, total fetch time, and the requests and
+# bytes the server had to send. Needs selenium and a Chrome that webdriver.Chrome() can start.
+#
+# Usage
+#  python benchmarks/bench_browser.py                         2 pages (the IPL fetcher's), 3 runs
+#  python benchmarks/bench_browser.py --pages 4 --images 40 --delay 0.2 --runs 5
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fantasy import standin  # noqa: E402
+from fantasy.browser import BrowserSession, table_ready  # noqa: E402
+from fantasy.sources import USER_AGENT, Page  # noqa: E402
+
+HOST = 'stats.example.com'
+
+
+def write_fixtures(root, n_pages, n_images, rows=300, image_kb=64):
+    """n_pages pages at https://stats.example.com/page_N/, each with a `rows`-row Pts table."""
+    site = os.path.join(root, HOST)
+    os.makedirs(os.path.join(site, 'static'), exist_ok=True)
+    for i in range(n_images):
+        with open(os.path.join(site, 'static', f'img_{i}.png'), 'wb') as f:
+            f.write(os.urandom(image_kb * 1024))
+    with open(os.path.join(site, 'static', 'font.woff2'), 'wb') as f:
+        f.write(os.urandom(128 * 1024))
+    analytics = os.path.join(root, 'www.google-analytics.com')
+    os.makedirs(analytics, exist_ok=True)
+    with open(os.path.join(analytics, 'analytics.js'), 'w') as f:
+        f.write('window.ga = function () {};\n' * 2000)
+    pages = []
+    for p in range(n_pages):
+        body = ''.join(f'<tr><td>player {p}-{r}</td><td>{r % 97}</td></tr>' for r in range(rows))
+        images = ''.join(f'<img src="/{HOST}/static/img_{i}.png">' for i in range(n_images))
+        html = ('<html><head><style>@font-face { font-family: f; src: url("/' + HOST + '/static/font.woff2"); }'
+                ' body { font-family: f; }</style>'
+                '<script src="/www.google-analytics.com/analytics.js"></script></head>'
+                f'<body>{images}<table><tr><th>Player</th><th>Pts</th></tr>{body}</table></body></html>')
+        os.makedirs(os.path.join(site, f'page_{p}'), exist_ok=True)
+        with open(os.path.join(site, f'page_{p}', 'index.html'), 'w') as f:
+            f.write(html)
+        pages.append(Page(f'page_{p}', f'https://{HOST}/page_{p}/', marker='Pts', ready=table_ready('Pts')))
+    return pages
+
+
+class Counter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = self.bytes = 0
+
+    def reset(self):
+        with self.lock:
+            self.requests = self.bytes = 0
+
+    def add(self, size):
+        with self.lock:
+            self.requests += 1
+            self.bytes += size
+
+
+def counting_handler(counter):
+    class CountingHandler(standin.StandinHandler):
+        def send_header(self, keyword, value):
+            if keyword == 'Content-Length':
+                counter.add(int(value))
+            super().send_header(keyword, value)
+    return CountingHandler
+
+
+def per_page(pages, base_url):
+    starts = 0.0
+    for page in pages:
+        session = BrowserSession(USER_AGENT, base_url=base_url, blocked=[])
+        t = time.perf_counter()
+        session.start()
+        starts += time.perf_counter() - t
+        try:
+            session.html(page)
+        finally:
+            session.close()
+    return len(pages), starts
+
+
+def shared(pages, base_url):
+    session = BrowserSession(USER_AGENT, base_url=base_url)
+    t = time.perf_counter()
+    session.start()
+    start = time.perf_counter() - t
+    try:
+        session.prefetch(pages)
+        for page in pages:
+            session.html(page)
+    finally:
+        session.close()
+    return session.chrome_starts, start
+
+
+def run(mode, pages, base_url, counter, runs):
+    fetch = per_page if mode == 'per page' else shared
+    walls, starts = [], []
+    for _ in range(runs):
+        counter.reset()
+        t = time.perf_counter()
+        n_starts, start_time = fetch(pages, base_url)
+        walls.append(time.perf_counter() - t)
+        starts.append(start_time)
+    return n_starts, statistics.median(starts), statistics.median(walls), counter.requests, counter.bytes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='One shared browser session against a browser per page')
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--images', type=int, default=20, help='images per page')
+    parser.add_argument('--delay', type=float, default=0.1, help='seconds added to every response')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    counter = Counter()
+    with tempfile.TemporaryDirectory() as root:
+        pages = write_fixtures(root, args.pages, args.images)
+        server, base_url = standin.serve(root, handler=counting_handler(counter), delay=args.delay)
+        try:
+            results = {mode: run(mode, pages, base_url, counter, args.runs) for mode in ('per page', 'shared')}
+        finally:
+            server.shutdown()
+
+    print(f'{args.pages} pages, {args.images} images each, {args.delay:g}s per response; medians of {args.runs} runs')
+    print(f'{"":10}{"chrome starts":>14}{"start time":>12}{"fetch time":>12}{"requests":>10}{"KB sent":>10}')
+    for mode, (n_starts, start, wall, requests, sent) in results.items():
+        print(f'{mode:10}{n_starts:14}{start:11.2f}s{wall:11.2f}s{requests:10}{sent / 1024:10.0f}')
+    (_, start_a, wall_a, _, sent_a), (_, start_b, wall_b, _, sent_b) = results.values()
+    print(f'saved: {start_a - start_b:.2f}s of Chrome startup, {wall_a - wall_b:.2f}s of fetch time, '
+          f'{(sent_a - sent_b) / 1024:.0f} KB')
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Times and memory-profiles the scoring pipeline on synthetic tournaments (benchmarks/synthetic.py)
+# of growing size, stage by stage, and shows how each stage scales.
+#
+# Usage
+#  python benchmarks/bench_pipeline.py                                   default sizes, both layouts
+#  python benchmarks/bench_pipeline.py --layout ipl --sizes 10x300x30,1000x3000x120
+#                                                                        managers x players x days
+#  (the t20 progression GIF draws a line per manager in every frame, so its big sizes take minutes)
+#
+# Every size is generated once and scored for its last day, with the days before it already in
+# the group's history and results stores, the way a mid-season run finds them. Stages:
+#   load       the season store (the day's points by player id) and the day's standings table
+#   names      build the name resolver and resolve every roster name
+#   scoring    ownership matrix + the day's totals (ipl: plus the W/N/R team bonus)
+#   history    ipl: points history + results store appends; t20: every day's totals in one product
+#   writes     leaderboard text (+ ipl scoring checkpoint)
+#   rendering  ipl: leaderboard chart; t20: progression GIF from a cold frame cache and the pie chart
+#   script     the script's own load_shared + score_group + render_group, end to end
+# Time is measured without tracing; peak memory (tracemalloc, so Python and numpy allocations) comes
+# from a second run on a fresh copy of the tournament.
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fantasy.checkpoint import ScoringCheckpoint, roster_fingerprint  # noqa: E402
+from fantasy.history import PointsHistory  # noqa: E402
+from fantasy.names import NameResolver  # noqa: E402
+from fantasy.render import RenderCache, plt, progression_gif  # noqa: E402
+from fantasy.results_store import ResultsStore, save_trend_chart  # noqa: E402
+from fantasy.scoring import ScoringEngine  # noqa: E402
+from fantasy.season_store import import_archive  # noqa: E402
+from fantasy.snapshots import SnapshotArchive  # noqa: E402
+from synthetic import generate  # noqa: E402
+
+SCRIPTS = {'ipl': os.path.join(ROOT, 'ipl2025', 'ipl2025_fantasy.py'),
+           't20': os.path.join(ROOT, 't20_wc_2026', 't20_wc_2026_fantasy.py')}
+STAGES = ['load', 'names', 'scoring', 'history', 'writes', 'rendering', 'script']
+DEFAULT_SIZES = '10x300x30,100x1000x75'
+
+
+def parse_size(size):
+    managers, players, days = (int(x) for x in size.split('x'))
+    return managers, players, days
+
+
+# ---------- stages, mirroring what the scripts do for one group ----------
+
+def ipl_stages(day_num):
+    def load(s):
+        season = import_archive('./data')
+        s['registry'], s['season_players'] = season.registry, season.players()
+        s['day_pts'] = season.day_points(day_num)[1]
+        s['standings'] = SnapshotArchive('./data').read('standings', day_num)
+        summary = pd.read_csv('./group_1/IPL2025MockAuctionSummary.csv')
+        s['manager_teams'] = summary.iloc[0].to_dict()
+        s['rosters'] = {mgr: summary[mgr].iloc[1:].astype(str).str.lower() for mgr in summary.columns}
+
+    def names(s):
+        s['resolver'] = NameResolver.from_sources([s['season_players']])
+        for roster in s['rosters'].values():
+            for name in roster:
+                s['resolver'].lookup(name)
+
+    def scoring(s):
+        engine = ScoringEngine(s['rosters'], s['registry'], manager_teams=s['manager_teams'],
+                               teams=s['standings']['Teams'], resolver=s['resolver'])
+        s['player_totals'] = engine.player_totals(s['day_pts'])
+        wins, nrs = engine.standings_results(s['standings'])
+        s['scores'] = dict(zip(engine.managers, s['player_totals'] + engine.team_bonus(wins, nrs)))
+        s['engine'] = engine
+
+    def history(s):
+        PointsHistory('./group_1/points_history.csv').append(day_num, s['engine'].roster_points(s['day_pts']))
+        s['results'] = ResultsStore('./group_1/results')
+        s['results'].append(day_num, s['scores'])
+
+    def writes(s):
+        engine = s['engine']
+        s['results'].write_leaderboard('./group_1/ipl_leaderboard.txt', day_num)
+        ScoringCheckpoint(day_num, engine.players, s['day_pts'], engine.managers, s['player_totals'],
+                          [s['scores'][m] for m in engine.managers], roster_fingerprint(engine)
+                          ).save('./group_1/scoring_checkpoint.npz')
+
+    def rendering(s):
+        save_trend_chart(s['results'].trend(stop=day_num), './group_1/ipl_leaderboard.png')
+
+    return [load, names, scoring, history, writes, rendering]
+
+
+def t20_stages(day_num):
+    def load(s):
+        season = import_archive('./data')
+        s['history_days'], s['history_pts'] = season.points()
+        s['day_pts'] = season.day_points(day_num)[1]
+        s['registry'], s['season_players'] = season.registry, season.players()
+        summary = pd.read_csv('./group_1/AuctionSummary.csv')
+        s['rosters'] = {mgr: summary[mgr] for mgr in summary.columns}
+
+    def names(s):
+        s['resolver'] = NameResolver.from_sources([s['season_players']], players_csv='./data/players.csv')
+        for roster in s['rosters'].values():
+            for name in roster.dropna():
+                s['resolver'].lookup(name)
+
+    def scoring(s):
+        engine = ScoringEngine(s['rosters'], s['registry'], resolver=s['resolver'])
+        s['scores'] = dict(zip(engine.managers, engine.player_totals(s['day_pts'])))
+        s['engine'] = engine
+
+    def history(s):
+        totals = s['engine'].player_totals(s['history_pts'])
+        s['series'] = {mgr: [0] + totals[i].tolist() for i, mgr in enumerate(s['engine'].managers)}
+        s['results'] = ResultsStore('./group_1/results')
+        s['results'].append(day_num, s['scores'])
+
+    def writes(s):
+        s['results'].write_leaderboard('./group_1/t20_wc_2026_leaderboard.txt', day_num)
+
+    def rendering(s):
+        progression_gif(RenderCache('./group_1'), './group_1/points_progression.gif', s['series'],
+                        title='THE CHASE: LIVE PROGRESSION')
+        scores = pd.Series(s['scores']).clip(lower=0)
+        fig = plt.figure(figsize=(6, 6))
+        plt.pie(scores, labels=scores.index, autopct='%1.1f%%')
+        fig.savefig('./group_1/manager_distribution.png', transparent=True)
+        plt.close(fig)
+
+    return [load, names, scoring, history, writes, rendering]
+
+
+def prefill(layout, days):
+    """The stores as a run on the last day would find them (the fetcher has already filed the
+    snapshots into the archive and the season store)."""
+    import_archive('./data')
+    results = ResultsStore('./group_1/results')
+    rng = np.random.default_rng(1)
+    if layout == 'ipl':
+        summary = pd.read_csv('./group_1/IPL2025MockAuctionSummary.csv')
+        history = PointsHistory('./group_1/points_history.csv')
+        for d in range(days):
+            history.append(d, {mgr: {p: float(d) for p in summary[mgr].iloc[1:]} for mgr in summary.columns})
+            results.append(d, dict(zip(summary.columns, rng.random(len(summary.columns)) * 10 * d)))
+    else:
+        managers = pd.read_csv('./group_1/AuctionSummary.csv').columns
+        for d in range(days):
+            results.append(d, dict(zip(managers, rng.random(len(managers)) * 10 * d)))
+
+
+def run_script(layout, day_num):
+    spec = importlib.util.spec_from_file_location(f'bench_{layout}_script', SCRIPTS[layout])
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+    if layout == 'ipl':
+        script.day_num, script.day = day_num, f'day_{day_num}'
+    shared = script.load_shared()
+    job = script.score_group('group_1', shared)
+    script.render_group(*job)
+
+
+def measure(fn, memory):
+    if memory:
+        tracemalloc.start()
+    t = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    elapsed = time.perf_counter() - t
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def run_size(layout, size, workdir, memory):
+    managers, players, days = size
+    base = os.path.join(workdir, 'base')
+    generate(base, layout, managers=managers, players=players, days=days)
+    out = {}
+    for traced in ([False, True] if memory else [False]):
+        for kind in ('stages', 'script'):
+            root = os.path.join(workdir, f'{kind}-{traced}')
+            shutil.copytree(base, root)
+            cwd = os.getcwd()
+            os.chdir(root)
+            try:
+                prefill(layout, days)
+                if kind == 'stages':
+                    state = {}
+                    stages = ipl_stages(days) if layout == 'ipl' else t20_stages(days)
+                    for stage in stages:
+                        t, peak = measure(lambda: stage(state), traced)
+                        out.setdefault(stage.__name__, {})['peak' if traced else 'time'] = peak if traced else t
+                else:
+                    t, peak = measure(lambda: run_script(layout, days), traced)
+                    out.setdefault('script', {})['peak' if traced else 'time'] = peak if traced else t
+            finally:
+                os.chdir(cwd)
+                shutil.rmtree(root)
+    shutil.rmtree(base)
+    return out
+
+
+def report(layout, sizes, results):
+    print(f'\n{layout}: time / peak memory per stage (managers x players x days)')
+    header = f"{'stage':10}" + ''.join(f'{"x".join(map(str, s)):>24}' for s in sizes)
+    if len(sizes) > 1:
+        header += f"{'time growth':>14}"
+    print(header)
+    for stage in STAGES:
+        cells = []
+        for r in results:
+            t, peak = r[stage].get('time'), r[stage].get('peak')
+            cell = f'{t * 1000:9.1f} ms'
+            cell += f' {peak / 2 ** 20:8.1f} MB' if peak is not None else ' ' * 12
+            cells.append(f'{cell:>24}')
+        line = f'{stage:10}' + ''.join(cells)
+        if len(sizes) > 1:
+            line += f"{results[-1][stage]['time'] / results[0][stage]['time']:>13.1f}x"
+        print(line)
+    if len(sizes) > 1:
+        work = [m * d for m, _, d in sizes]
+        print(f"{'':10}(managers x days grew {work[-1] / work[0]:.0f}x, players {sizes[-1][1] / sizes[0][1]:.0f}x)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stage-by-stage timings of the scoring pipeline')
+    parser.add_argument('--layout', choices=['ipl', 't20', 'both'], default='both')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='comma separated managers x players x days')
+    parser.add_argument('--no-memory', action='store_true', help='skip the traced (peak memory) run')
+    args = parser.parse_args()
+    # The chart titles' emoji aren't in matplotlib's default font; the benchmark doesn't care
+    warnings.filterwarnings('ignore', message='Glyph')
+
+    sizes = [parse_size(s) for s in args.sizes.split(',')]
+    layouts = ['ipl', 't20'] if args.layout == 'both' else [args.layout]
+    for layout in layouts:
+        results = []
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as workdir:
+                results.append(run_size(layout, size, workdir, not args.no_memory))
+            print(f'{layout} {"x".join(map(str, size))} done', file=sys.stderr)
+        report(layout, sizes, results)
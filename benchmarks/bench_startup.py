@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Times the `python -m fantasy` subcommands end to end in fresh interpreters, on a synthetic
+# tournament (benchmarks/synthetic.py), and shows how much of each run is spent importing and
+# which heavy dependencies it pulled in. `render` imports what running the scoring script always
+# did; `score` and `report` should stay clear of matplotlib and selenium.
+#
+# Usage
+#  python benchmarks/bench_startup.py                        both layouts, 10 x 300 x 30, 5 runs each
+#  python benchmarks/bench_startup.py --layout t20 --size 100x1000x75 --runs 10
+#
+# Every run gets a fresh copy of the tournament (with day N-1 already scored, the way a daily run
+# finds it) and scores day N; report shows day N-1. Import time is what `python -X importtime`
+# reports for the run's top-level imports.
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic import generate  # noqa: E402
+
+TOURNAMENTS = {'ipl': 'ipl2025', 't20': 't20_wc_2026'}
+COMMANDS = ['report', 'score', 'render']
+HEAVY = ['pandas', 'numpy', 'matplotlib', 'bs4', 'selenium', 'thefuzz', 'httpx']
+
+
+def parse_size(size):
+    managers, players, days = (int(x) for x in size.split('x'))
+    return managers, players, days
+
+
+def cli(command, layout, directory, day_num, importtime=False):
+    argv = [sys.executable] + (['-X', 'importtime'] if importtime else [])
+    argv += ['-m', 'fantasy', command, '--tournament', TOURNAMENTS[layout], '--dir', directory, '--day', str(day_num)]
+    env = dict(os.environ, PYTHONPATH=ROOT, MPLBACKEND='Agg')
+    t = time.perf_counter()
+    done = subprocess.run(argv, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - t
+    if done.returncode:
+        raise RuntimeError(f'{command} failed:\n{done.stderr[-2000:]}')
+    return elapsed, done.stderr
+
+
+def import_summary(stderr):
+    """(seconds spent in top-level imports, heavy packages imported) from -X importtime output."""
+    total, packages = 0, set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name[1:].startswith(' '):
+            total += int(cumulative)
+        packages.add(name.strip().split('.')[0])
+    return total / 1e6, [p for p in HEAVY if p in packages]
+
+
+def run_layout(layout, size, runs, workdir):
+    managers, players, days = size
+    base = os.path.join(workdir, 'base')
+    generate(base, layout, managers=managers, players=players, days=days)
+    # The day before is scored once, so every timed run finds the stores a daily run would
+    cli('score', layout, base, days - 1)
+    out = {}
+    for command in COMMANDS:
+        # report only reads the stores, so it shows the day already in them
+        day_num = days - 1 if command == 'report' else days
+        times = []
+        for run in range(runs + 1):
+            root = os.path.join(workdir, f'{command}-{run}')
+            shutil.copytree(base, root)
+            if run == runs:
+                out[command] = import_summary(cli(command, layout, root, day_num, importtime=True)[1])
+            else:
+                times.append(cli(command, layout, root, day_num)[0])
+            shutil.rmtree(root)
+        out[command] = (statistics.median(times),) + out[command]
+    shutil.rmtree(base)
+    return out
+
+
+def report(layout, size, results):
+    print(f'\n{layout} {"x".join(map(str, size))}: median wall time per run, time in imports, heavy imports')
+    for command in COMMANDS:
+        wall, imports, heavy = results[command]
+        print(f'{command:8}{wall * 1000:9.0f} ms{imports * 1000:9.0f} ms   {", ".join(heavy) or "-"}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Startup and import cost of the python -m fantasy subcommands')
+    parser.add_argument('--layout', choices=['ipl', 't20', 'both'], default='both')
+    parser.add_argument('--size', default='10x300x30', help='managers x players x days')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    for layout in ['ipl', 't20'] if args.layout == 'both' else [args.layout]:
+        with tempfile.TemporaryDirectory() as workdir:
+            report(layout, size, run_layout(layout, size, args.runs, workdir))
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Times the streaming table parser (fantasy.tables) against the pd.read_html path the fetchers
+# used before, on saved pages, and checks both give the same table.
+#
+# Usage
+#  python benchmarks/bench_tables.py                       synthetic pages (decoy tables + target table)
+#  python benchmarks/bench_tables.py --rows 5000           bigger synthetic pages
+#  python benchmarks/bench_tables.py ipl_mvp=fixtures/www.iplt20.com/stats/2025/index.html
+#                                                          pages recorded with python -m fantasy.standin record
+#
+# Peak memory is how far a fresh process's RSS high-water mark climbs above its RSS just before
+# parsing the page once, so libxml2's own allocations (which tracemalloc doesn't see) are counted
+# too. That needs Linux's /proc/self/clear_refs.
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fantasy.tables import T20_POINTS, ipl_mvp_row, ipl_standings_row, read_table, t20_player_row
+
+
+# The fetchers' old read_html path, kept here as the baseline
+
+def read_html_ipl_mvp(html):
+    mvp_df = [t for t in pd.read_html(io.StringIO(html)) if 'Pts' in t][0]
+    mvp_df[['Player', 'Team']] = mvp_df['Player'].str.rsplit(' ', n=1, expand=True)
+    mvp_df['Player'] = mvp_df['Player'].str.replace('\\s+', ' ', regex=True)
+    mvp_df['Player'] = mvp_df['Player'].str.lower()
+    return mvp_df
+
+
+def read_html_ipl_standings(html):
+    tbl = [t for t in pd.read_html(io.StringIO(html)) if 'PT' in t][0]
+    tbl = tbl.iloc[::2]
+    tbl = tbl.iloc[:, :12]
+    tbl['Teams'] = tbl['Teams'].replace('\\s+', ' ', regex=True).replace('\\d', '', regex=True)
+    return tbl
+
+
+def read_html_t20_players(html):
+    mvp_df = [t for t in pd.read_html(io.StringIO(html)) if T20_POINTS in t][0]
+    mvp_df[['Player', 'Player Short Name']] = mvp_df['Player'].str.rsplit('  ', n=1, expand=True)
+    mvp_df[['Team long name', 'Team']] = mvp_df['Team'].str.rsplit('  ', n=1, expand=True)
+    mvp_df[['Position long name', 'Position']] = mvp_df['Position'].str.rsplit('  ', n=1, expand=True)
+    for col in ['Player', 'Team', 'Position', 'Player Short Name']:
+        mvp_df[col] = mvp_df[col].str.lower()
+    mvp_df = mvp_df.rename(columns={T20_POINTS: 'Pts'})
+    return mvp_df[['Player', 'Player Short Name', 'Team', 'Position', 'Pts']]
+
+
+PAGES = {
+    'ipl_mvp': (read_html_ipl_mvp, lambda html: read_table(html, 'Pts', ipl_mvp_row)),
+    'ipl_standings': (read_html_ipl_standings, lambda html: read_table(html, 'PT', ipl_standings_row)),
+    't20_players': (read_html_t20_players, lambda html: read_table(html, T20_POINTS, t20_player_row)),
+}
+
+
+# Synthetic pages shaped like the real ones: navigation, a few unrelated stats tables and then the
+# target table, with the cell markup the row functions expect
+
+def _table(header, rows, attrs=''):
+    head = ''.join(f'<th>{h}</th>' for h in header)
+    body = ''.join(row if isinstance(row, str) else '<tr>' + ''.join(f'<td>{c}</td>' for c in row) + '</tr>\n'
+                   for row in rows)
+    return f'<table{attrs}><thead><tr>{head}</tr></thead><tbody>\n{body}</tbody></table>\n'
+
+
+def _decoys(n_rows):
+    nav = '<div class="nav">' + ''.join(f'<a href="/p/{i}">link {i}</a>' for i in range(500)) + '</div>\n'
+    return nav + ''.join(_table(['Rank', 'Name', 'Runs', 'Avg', 'SR'],
+                                [[i, f'Some Player {i}', i * 3, 31.5, 140.2] for i in range(n_rows)])
+                         for _ in range(4))
+
+
+def synthetic_page(kind, n_rows):
+    if kind == 'ipl_mvp':
+        header = ['POS', 'Player', 'Pts', 'Mat', 'Wkts', 'Dots', '4s', '6s', 'Catches', 'Run outs', 'Stumpings']
+        rows = [[i + 1, f'<div>Player {i} Name</div>\n <span>{"RR CSK MI GT"[3 * (i % 4):3 * (i % 4) + 3].strip()}</span>',
+                 n_rows - i + 0.5 * (i % 2), 14, i % 7, i % 50, i % 60, i % 30, i % 10, '0', '0'] for i in range(n_rows)]
+        target = _table(header, rows)
+    elif kind == 'ipl_standings':
+        header = ['Teams', 'M', 'W', 'L', 'N/R', 'PT', 'NRR', 'Series Form', 'Next', 'For', 'Against', '']
+        rows = []
+        for i in range(n_rows):
+            rows.append([f'{i + 1}<span>Team {i}</span>', 14, 9, 4, 1, 19, 0.372, 'WWWLW', 'vs A, B',
+                         '2447/246.4', '2395/250.5', ''])
+            rows.append('<tr><td colspan="12"><div>recent matches</div></td></tr>\n')
+        target = _table(header, rows)
+    else:
+        header = ['Player', 'Team', 'Position', '<span>Points</span>\n  <span>Points</span>\n  <span>Arrow up</span>'
+                  '\n  <span>Arrow down</span>\n  <span>Total Points</span>']
+        rows = [[f'<span>Player {i} Name</span>\n  <span>P {i}</span>', '<span>New Zealand</span>\n  <span>NZ</span>',
+                 '<span>Wicket Keeper</span>\n  <span>WK</span>', n_rows - i] for i in range(n_rows)]
+        target = _table(header, rows)
+    return f'<html><head><title>{kind}</title></head><body>{_decoys(n_rows // 4 + 10)}{target}<footer/></body></html>'
+
+
+def _status_kb(field):
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(field + ':'))
+
+
+def _child(kind, parser, path):
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    # Reset the process's RSS high-water mark so the imports' peak doesn't hide the parser's
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    before = _status_kb('VmRSS')
+    t = time.perf_counter()
+    PAGES[kind][0 if parser == 'read_html' else 1](html)
+    elapsed = time.perf_counter() - t
+    print(json.dumps({'seconds': elapsed, 'peak_kb': _status_kb('VmHWM') - before}))
+
+
+def _measure(kind, parser, path):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', kind, parser, path],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def bench(kind, path, repeat):
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    old, new = (PAGES[kind][0](html), PAGES[kind][1](html))
+    same = old.reset_index(drop=True).to_csv(index=False) == new.to_csv(index=False)
+    timings = {}
+    for parser in ('read_html', 'streaming'):
+        runs = [_measure(kind, parser, path) for _ in range(repeat)]
+        timings[parser] = (min(r['seconds'] for r in runs), max(r['peak_kb'] for r in runs))
+    (t_old, m_old), (t_new, m_new) = timings['read_html'], timings['streaming']
+    print(f'{kind:14} {len(html) / 1e6:6.2f} MB {len(new):6} rows  read_html {t_old * 1000:8.1f} ms {m_old / 1024:7.1f} MB'
+          f'  streaming {t_new * 1000:8.1f} ms {m_new / 1024:7.1f} MB  x{t_old / t_new:5.1f}'
+          f"  {'same table' if same else 'TABLES DIFFER'}")
+    return same
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        _child(*sys.argv[2:5])
+        sys.exit()
+    parser = argparse.ArgumentParser(description='Streaming table parser vs pd.read_html')
+    parser.add_argument('pages', nargs='*', help='kind=path of a saved page, kind one of ' + ', '.join(PAGES))
+    parser.add_argument('--rows', type=int, default=1000, help='rows in each synthetic target table')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pages = [page.split('=', 1) for page in args.pages]
+        if not pages:
+            for kind in PAGES:
+                path = os.path.join(tmp, f'{kind}.html')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(synthetic_page(kind, args.rows if kind != 'ipl_standings' else max(args.rows // 50, 10)))
+                pages.append((kind, path))
+        ok = all([bench(kind, path, args.repeat) for kind, path in pages])
+    sys.exit(0 if ok else 1)
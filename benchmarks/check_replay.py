@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Checks that replaying the archive (fantasy.replay) writes what the daily runs wrote, on a synthetic
+# IPL season (benchmarks/synthetic.py) whose last day only changed the standings: its MVP table is
+# the day before's, so the snapshot archive keeps no MVP snapshot for it, only a standings one. The
+# daily run scores that day (and labels the leaderboard with it); replay has to as well, rather
+# than stopping at the last MVP day.
+#
+# Usage
+#  python benchmarks/check_replay.py                  prints any mismatch and exits non-zero
+#  python benchmarks/check_replay.py --days 20 --managers 30
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fantasy.results_store import ResultsStore  # noqa: E402
+from fantasy.snapshots import import_snapshots  # noqa: E402
+from synthetic import generate  # noqa: E402
+
+TOURNAMENT = 'ipl2025'
+LEADERBOARD = 'ipl_leaderboard.txt'
+
+
+def cli(*argv):
+    env = dict(os.environ, PYTHONPATH=ROOT, MPLBACKEND='Agg')
+    done = subprocess.run([sys.executable, '-m', 'fantasy', *argv], env=env, capture_output=True, text=True)
+    if done.returncode:
+        raise RuntimeError(f'{" ".join(argv)} failed:\n{done.stderr[-2000:]}')
+    return done.stdout
+
+
+def standings_only_last_day(base, days):
+    """Makes the last day's MVP table the day before's, and makes sure its standings moved."""
+    data = os.path.join(base, 'data')
+    shutil.copyfile(os.path.join(data, f'mvp_day_{days - 1}.csv'), os.path.join(data, f'mvp_day_{days}.csv'))
+    path = os.path.join(data, f'standings_day_{days}.csv')
+    standings = pd.read_csv(path)
+    standings.loc[0, ['M', 'W', 'PT']] += [1, 1, 2]
+    standings.to_csv(path, index=False)
+    archive = import_snapshots(data)
+    assert archive.days('mvp')[-1] < days == archive.days('standings')[-1], 'the last day should be standings-only'
+
+
+def check(days, managers, workdir):
+    base = os.path.join(workdir, 'base')
+    generate(base, 'ipl', managers=managers, days=days)
+    standings_only_last_day(base, days)
+    daily, replayed = os.path.join(workdir, 'daily'), os.path.join(workdir, 'replay')
+    shutil.copytree(base, daily)
+    shutil.copytree(base, replayed)
+    for day_num in (days - 1, days):
+        cli('score', '--tournament', TOURNAMENT, '--dir', daily, '--day', str(day_num))
+    print(cli('replay', '--tournament', TOURNAMENT, '--dir', replayed).splitlines()[0])
+
+    failures = []
+    for group in sorted(g for g in os.listdir(base) if g.startswith('group_')):
+        ran, rebuilt = (ResultsStore(os.path.join(root, group, 'results')) for root in (daily, replayed))
+        if rebuilt.days()[-1] != days:
+            failures.append(f'{group}: replay stopped at day_{rebuilt.days()[-1]}, not day_{days}')
+        for day_num in np.intersect1d([days - 1, days], rebuilt.days()):
+            a, b = ran.day(day_num), rebuilt.day(day_num).reindex(ran.day(day_num).index)
+            if not np.allclose(a.to_numpy(), b.to_numpy(), equal_nan=False):
+                failures.append(f'{group}: day_{day_num} totals differ\n{pd.DataFrame({"daily": a, "replay": b})}')
+        texts = []
+        for root in (daily, replayed):
+            with open(os.path.join(root, group, LEADERBOARD)) as f:
+                texts.append(f.read())
+        if texts[0] != texts[1]:
+            failures.append(f'{group}: {LEADERBOARD} differs\n{texts[0]}\n{texts[1]}')
+    return failures
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check replay against the daily runs on a standings-only last day')
+    parser.add_argument('--days', type=int, default=10)
+    parser.add_argument('--managers', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        failures = check(args.days, args.managers, workdir)
+    for failure in failures:
+        print(failure)
+    if failures:
+        sys.exit(1)
+    print(f'Replay matches the daily runs for day_{args.days - 1} and the standings-only day_{args.days}')
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Writes a made-up tournament in the same on-disk layout the scoring scripts read, at whatever size
+# is wanted, so the pipeline can be timed on leagues much bigger than the real groups:
+#   ipl layout   data/mvp_day_N.csv, data/standings_day_N.csv,
+#                group_K/IPL2025MockAuctionSummary.csv, group_K/{manager}.csv
+#   t20 layout   data/mvp_day_N.csv, data/players.csv, group_K/AuctionSummary.csv,
+#                group_K/winners/{manager}.csv
+#
+# Usage
+#  python benchmarks/synthetic.py /tmp/league --layout ipl --managers 2000 --players 3000 --days 120
+#
+# Teams play every couple of days and their players pick up points when they do, so totals grow
+# the way a real season's do. A few roster names are misspelt to keep the name matching honest.
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+IPL_TEAMS = {
+    'Chennai Super Kings': 'CSK', 'Delhi Capitals': 'DC', 'Gujarat Titans': 'GT', 'Kolkata Knight Riders': 'KKR',
+    'Lucknow Super Giants': 'LSG', 'Mumbai Indians': 'MI', 'Punjab Kings': 'PBKS', 'Rajasthan Royals': 'RR',
+    'Royal Challengers Bengaluru': 'RCB', 'Sunrisers Hyderabad': 'SRH',
+}
+T20_TEAMS = ['afg', 'aus', 'ban', 'can', 'eng', 'ind', 'ire', 'ita', 'nam', 'nep', 'ned', 'nz', 'oma', 'pak',
+             'sco', 'sa', 'sl', 'uae', 'usa', 'wi']
+POSITIONS = ['bat', 'bowl', 'alr', 'wk']
+
+FIRST = ['aarav', 'adam', 'aiden', 'ajay', 'alex', 'ali', 'amir', 'anil', 'arjun', 'ben', 'chris', 'dan', 'david',
+         'dev', 'dinesh', 'faf', 'fazal', 'glenn', 'harry', 'imran', 'ishan', 'jack', 'james', 'jos', 'kane',
+         'karan', 'kyle', 'liam', 'marco', 'mark', 'matt', 'mitchell', 'mohammed', 'nathan', 'nitish', 'pat',
+         'phil', 'quinton', 'rahul', 'rashid', 'ravi', 'rohit', 'ryan', 'sam', 'sanju', 'shai', 'shubman',
+         'steve', 'suresh', 'tim', 'travis', 'trent', 'usman', 'varun', 'virat', 'will', 'yash', 'zak']
+LAST = ['agarwal', 'ahmed', 'babar', 'bairstow', 'bishnoi', 'boult', 'brook', 'buttler', 'chahal', 'conway',
+        'cummins', 'curran', 'de kock', 'dhawan', 'ellis', 'ferguson', 'gill', 'green', 'hazlewood', 'head',
+        'henry', 'hetmyer', 'hope', 'iyer', 'jadeja', 'jansen', 'khan', 'kishan', 'kohli', 'kumar', 'livingstone',
+        'malik', 'markram', 'marsh', 'maxwell', 'miller', 'mitchell', 'nabi', 'narine', 'nortje', 'overton',
+        'pandya', 'patel', 'phillips', 'pooran', 'powell', 'rabada', 'rahane', 'rana', 'rashid', 'russell',
+        'salt', 'samson', 'santner', 'sharma', 'shepherd', 'singh', 'smith', 'stoinis', 'starc', 'tewatia',
+        'thakur', 'varma', 'warner', 'williamson', 'wood', 'yadav', 'zampa']
+
+
+def player_names(n, rng):
+    names = [f'{f} {l}' for f in FIRST for l in LAST]
+    rng.shuffle(names)
+    extra = 0
+    while len(names) < n:
+        # More players than first x last names: add middle initials
+        extra += 1
+        names += [f'{name.split()[0]} {chr(96 + extra % 26 or 26)} {" ".join(name.split()[1:])}'
+                  for name in names[:n - len(names)]]
+    return names[:n]
+
+
+def misspell(name, rng):
+    i = int(rng.integers(1, max(len(name) - 1, 2)))
+    if rng.random() < 0.5 and name[i] != ' ' and name[i - 1] != ' ':
+        return name[:i - 1] + name[i] + name[i - 1] + name[i + 1:]
+    return name[:i] + name[i + 1:]
+
+
+def season(players, teams, days, rng):
+    """Cumulative points (players x days+1, day 0 = 0) plus each team's results per day."""
+    n_teams = len(teams)
+    team_of = rng.integers(0, n_teams, len(players))
+    skill = rng.gamma(2.0, 1.0, len(players))
+    points = np.zeros((len(players), days + 1))
+    results = np.zeros((n_teams, days + 1, 4))  # M, W, L, N/R cumulative
+    for d in range(1, days + 1):
+        points[:, d] = points[:, d - 1]
+        results[:, d] = results[:, d - 1]
+        order = rng.permutation(n_teams)
+        for a, b in zip(order[0:n_teams // 2 * 2:2], order[1:n_teams // 2 * 2:2]):
+            if rng.random() > 0.55:
+                continue
+            playing = (team_of == a) | (team_of == b)
+            points[playing, d] += np.round(rng.gamma(1.5, 8.0, playing.sum()) * skill[playing]) / 2
+            results[[a, b], d, 0] += 1
+            if rng.random() < 0.05:
+                results[[a, b], d, 3] += 1
+            else:
+                win, lose = (a, b) if rng.random() < 0.5 else (b, a)
+                results[win, d, 1] += 1
+                results[lose, d, 2] += 1
+    return team_of, points, results
+
+
+def rosters(players, n_managers, roster_size, typo_rate, rng):
+    """Each manager's roster (unique within a roster, shared across managers once players run out)."""
+    out = []
+    pool = rng.permutation(len(players))
+    for m in range(n_managers):
+        start = (m * roster_size) % len(players)
+        ids = pool[np.arange(start, start + roster_size) % len(players)]
+        names = [misspell(players[i], rng) if rng.random() < typo_rate else players[i] for i in ids]
+        out.append(names)
+    return out
+
+
+def manager_names(n):
+    return [f'manager_{i + 1:0{len(str(n))}d}' for i in range(n)]
+
+
+def write_ipl(root, players, days, n_managers, n_groups, roster_size, typo_rate, rng):
+    teams = list(IPL_TEAMS)
+    team_of, points, results = season(players, teams, days, rng)
+    data = os.path.join(root, 'data')
+    os.makedirs(data, exist_ok=True)
+    abbrev = np.array([IPL_TEAMS[t] for t in teams])[team_of]
+    for d in range(1, days + 1):
+        pts = points[:, d]
+        played = pts > 0
+        mvp = pd.DataFrame({'Player': np.array(players)[played], 'Pts': pts[played], 'Team': abbrev[played]})
+        mvp = mvp.sort_values('Pts', ascending=False, kind='stable').reset_index(drop=True)
+        n = len(mvp)
+        mvp.insert(0, 'POS', np.arange(1, n + 1))
+        for col in ['Mat', 'Wkts', 'Dots', '4s', '6s', 'Catches']:
+            mvp.insert(len(mvp.columns) - 1, col, rng.integers(0, 20, n))
+        mvp.insert(len(mvp.columns) - 1, 'Run outs', rng.integers(0, 2, n).astype(float))
+        mvp.insert(len(mvp.columns) - 1, 'Stumpings', rng.integers(0, 2, n))
+        mvp.to_csv(os.path.join(data, f'mvp_day_{d}.csv'), index=False)
+
+        m, w, lo, nr = (results[:, d, k] for k in range(4))
+        standings = pd.DataFrame({'Teams': teams, 'M': m, 'W': w, 'L': lo, 'N/R': nr, 'PT': 2 * w + nr})
+        standings = standings.astype({c: int for c in ['M', 'W', 'L', 'N/R', 'PT']})
+        standings = standings.sort_values('PT', ascending=False, kind='stable')
+        standings.to_csv(os.path.join(data, f'standings_day_{d}.csv'), index=False)
+
+    for g in range(1, n_groups + 1):
+        group = os.path.join(root, f'group_{g}')
+        os.makedirs(group, exist_ok=True)
+        mgrs = manager_names(n_managers)
+        squads = rosters(players, n_managers, roster_size, typo_rate, rng)
+        summary = pd.DataFrame({mgr: [teams[i % len(teams)]] + squad for i, (mgr, squad) in enumerate(zip(mgrs, squads))})
+        summary.to_csv(os.path.join(group, 'IPL2025MockAuctionSummary.csv'), index=False)
+        for mgr, squad in zip(mgrs, squads):
+            pd.DataFrame({mgr: squad}).to_csv(os.path.join(group, f'{mgr}.csv'), index=False)
+
+
+def write_t20(root, players, days, n_managers, n_groups, roster_size, typo_rate, rng):
+    team_of, points, _ = season(players, T20_TEAMS, days, rng)
+    data = os.path.join(root, 'data')
+    os.makedirs(data, exist_ok=True)
+    meta = pd.DataFrame({
+        'Player': players,
+        'Player Short Name': [f'{p.split()[0][0]} {p.split()[-1]}' for p in players],
+        'Team': np.array(T20_TEAMS)[team_of],
+        'Position': rng.choice(POSITIONS, len(players)),
+    })
+    meta.assign(Pts=0).to_csv(os.path.join(data, 'players.csv'), index=False)
+    for d in range(1, days + 1):
+        mvp = meta.assign(Pts=points[:, d].astype(int)).sort_values('Pts', ascending=False, kind='stable')
+        mvp.to_csv(os.path.join(data, f'mvp_day_{d}.csv'), index=False)
+
+    for g in range(1, n_groups + 1):
+        group = os.path.join(root, f'group_{g}')
+        os.makedirs(os.path.join(group, 'winners'), exist_ok=True)
+        mgrs = manager_names(n_managers)
+        squads = rosters(players, n_managers, roster_size, typo_rate, rng)
+        pd.DataFrame(dict(zip(mgrs, squads))).to_csv(os.path.join(group, 'AuctionSummary.csv'), index=False)
+        team = dict(zip(players, meta['Team']))
+        for mgr, squad in zip(mgrs, squads):
+            pd.DataFrame({'Player': squad, 'Team': [team.get(p, '') for p in squad]}).to_csv(
+                os.path.join(group, 'winners', f'{mgr}.csv'), index=False)
+
+
+def generate(root, layout='ipl', managers=10, players=300, days=30, groups=1, roster_size=12,
+             typo_rate=0.03, seed=0):
+    rng = np.random.default_rng(seed)
+    names = player_names(players, rng)
+    writer = write_ipl if layout == 'ipl' else write_t20
+    writer(root, names, days, managers, groups, roster_size, typo_rate, rng)
+    return root
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write a synthetic tournament in the scoring scripts\' layout')
+    parser.add_argument('root')
+    parser.add_argument('--layout', choices=['ipl', 't20'], default='ipl')
+    parser.add_argument('--managers', type=int, default=10, help='managers per group')
+    parser.add_argument('--players', type=int, default=300)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--groups', type=int, default=1)
+    parser.add_argument('--roster-size', type=int, default=12)
+    parser.add_argument('--typo-rate', type=float, default=0.03, help='share of roster names misspelt')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    generate(args.root, args.layout, args.managers, args.players, args.days, args.groups, args.roster_size,
+             args.typo_rate, args.seed)
+    print(f'Wrote a {args.layout} tournament to {args.root}')
@@ -0,0 +1,3 @@
+# Shared building blocks for the per-tournament fantasy scripts (ipl2025/, t20_wc_2026/).
+# The scripts are run from inside their tournament directory, so they put the repo root on
+# sys.path before importing from here.
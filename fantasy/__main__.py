@@ -0,0 +1,146 @@
+import argparse
+import importlib.util
+import os
+import sys
+
+# One entry point for every tournament's fetcher and scoring script, with the tournament, groups
+# and day given explicitly instead of coming from date.today() and sys.argv:
+#   python -m fantasy score  --tournament t20_wc_2026 [--group group_1 ...] [--day 8]
+#                            scores and leaderboards only: never imports matplotlib or selenium
+#   python -m fantasy render --tournament ipl2025 --group group_1 --day 60
+#                            what running the scoring script does: scores, charts and reports
+#   python -m fantasy report --tournament ipl2025 [--day 60] [--k 10]
+#                            the leaderboards from the results stores, without scoring anything
+#   python -m fantasy fetch  --tournament t20_wc_2026
+#                            the points fetcher (bs4, and selenium if the page needs a browser)
+#   python -m fantasy replay --tournament ipl2025 [--group group_1 ...] [--start 10] [--stop 40]
+#                            rebuilds history, results and leaderboards from the archive (fantasy/replay.py)
+#   python -m fantasy serve  --tournament ipl2025 [--group group_1 ...] [--port 8767]
+#                            the read-only JSON query API over the stores (fantasy/query_api.py)
+# Run from the repository root, or from inside a tournament directory with --tournament left out.
+# This module only imports the standard library; each subcommand imports what it uses, so a
+# `report` or `score` run doesn't pay for the imports of the others (see benchmarks/bench_startup.py).
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+# tournament directory -> (scoring script, points fetcher)
+TOURNAMENTS = {
+    'ipl2025': ('ipl2025_fantasy.py', 'ipl2025_fantasy_points_fetcher.py'),
+    't20_wc_2026': ('t20_wc_2026_fantasy.py', 't20_wc_2026_fantasy_points_fetcher.py'),
+}
+
+
+def tournament_dir(tournament, directory=None):
+    return directory or os.path.join(ROOT, tournament)
+
+
+def load_script(tournament, day_num=None):
+    """Imports a tournament's scoring script as a module (from inside its directory, where its
+    relative paths point), set to score `day_num` instead of today's day."""
+    script = TOURNAMENTS[tournament][0]
+    name = os.path.splitext(script)[0]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(tournament_dir(tournament), script))
+    module = importlib.util.module_from_spec(spec)
+    # Registered before it runs so the render pool's workers can unpickle its functions
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    if day_num is not None:
+        module.day_num, module.day = day_num, f'day_{day_num}'
+    return module
+
+
+def score(args, render=False):
+    from fantasy.batch import discover_groups
+
+    module = load_script(args.tournament, args.day)
+    module.main(args.group or discover_groups('.'), render=render)
+
+
+def report(args):
+    from fantasy.batch import discover_groups
+    from fantasy.league import Standings
+    from fantasy.results_store import ResultsStore
+
+    for group in args.group or discover_groups('.'):
+        store = ResultsStore(os.path.join(group, 'results'))
+        if not len(store.days()):
+            print(f'{group}: no results yet')
+            continue
+        print(group)
+        print(Standings.from_store(store, args.day).top_text(args.k))
+
+
+def replay(args):
+    from fantasy.replay import replay as replay_season
+
+    season, engines = replay_season(args.tournament, '.', args.group, args.start, args.stop)
+    print(f'Replayed day_{season.grid[0]}..day_{season.grid[-1]} for {", ".join(engines)}')
+    if len(season.gaps):
+        print(f'No snapshot for days {", ".join(map(str, season.gaps))}: carried the day before forward')
+
+
+def serve(args):
+    import threading
+
+    from fantasy.query_api import QueryService, serve as serve_api
+
+    server, base_url = serve_api(QueryService('.', args.tournament, args.group), args.host, args.port)
+    print(f'Serving {args.tournament} at {base_url}/')
+    threading.Event().wait()
+
+
+def fetch(args):
+    import runpy
+
+    path = os.path.join(tournament_dir(args.tournament), TOURNAMENTS[args.tournament][1])
+    sys.argv = [path]
+    runpy.run_path(path, run_name='__main__')
+
+
+def current_tournament():
+    here = os.path.basename(os.path.abspath('.'))
+    return here if here in TOURNAMENTS else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m fantasy', description='Fetch, score and report a tournament')
+    sub = parser.add_subparsers(dest='command', required=True)
+    commands = {
+        'fetch': sub.add_parser('fetch', help="fetch today's points (and standings) tables"),
+        'score': sub.add_parser('score', help='score groups: results stores and leaderboards, no charts'),
+        'render': sub.add_parser('render', help='score groups and draw their charts and reports'),
+        'report': sub.add_parser('report', help='print the leaderboards from the results stores'),
+        'replay': sub.add_parser('replay', help='rebuild history, results and leaderboards from the archive'),
+        'serve': sub.add_parser('serve', help='serve leaderboards, histories and ownership as JSON'),
+    }
+    for name, p in commands.items():
+        p.add_argument('--tournament', choices=sorted(TOURNAMENTS), default=current_tournament(),
+                       help='default: the tournament directory this is run from')
+        p.add_argument('--dir', help="run on this copy of the tournament's data and groups instead")
+        if name != 'fetch':
+            p.add_argument('--group', action='append', help='repeat for several groups (default: every group_*)')
+        if name not in ('fetch', 'replay', 'serve'):
+            p.add_argument('--day', type=int, help='tournament day (default: today; report: the latest scored)')
+    commands['report'].add_argument('--k', type=int, default=25, help='managers to show per group')
+    commands['replay'].add_argument('--start', type=int, help="first day (default: the archive's first)")
+    commands['replay'].add_argument('--stop', type=int, help="last day (default: the archive's last)")
+    commands['serve'].add_argument('--host', default='127.0.0.1')
+    commands['serve'].add_argument('--port', type=int, default=8767)
+    args = parser.parse_args(argv)
+    if args.tournament is None:
+        parser.error('--tournament is required outside a tournament directory')
+
+    os.chdir(tournament_dir(args.tournament, args.dir))
+    if args.command == 'fetch':
+        fetch(args)
+    elif args.command == 'report':
+        report(args)
+    elif args.command == 'replay':
+        replay(args)
+    elif args.command == 'serve':
+        serve(args)
+    else:
+        score(args, render=args.command == 'render')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Output files are written to a temp file in the same directory and renamed into place, so a
+# reader (or another group's worker) never sees a half-written CSV, chart or leaderboard.
+
+
+@contextmanager
+def atomic_path(path):
+    """A temp file name next to `path` (same extension, for writers that pick a format from it)
+    that replaces `path` once the block finishes without an error."""
+    directory = os.path.dirname(path) or '.'
+    base, ext = os.path.splitext(os.path.basename(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f'.{base}.', suffix=f'.tmp{ext}')
+    os.close(fd)
+    try:
+        yield tmp
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+@contextmanager
+def atomic_open(path, mode='w', **kwargs):
+    with atomic_path(path) as tmp:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+
+
+def write_csv(df, path, **kwargs):
+    with atomic_open(path, 'w', newline='') as f:
+        df.to_csv(f, **kwargs)
+
+
+def write_text(path, text):
+    with atomic_open(path, 'w') as f:
+        f.write(text)
+
+
+def save_figure(fig, path, **kwargs):
+    kwargs.setdefault('format', os.path.splitext(path)[1].lstrip('.') or 'png')
+    with atomic_open(path, 'wb') as f:
+        fig.savefig(f, **kwargs)
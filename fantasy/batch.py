@@ -0,0 +1,53 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from fantasy import instrument
+
+
+def discover_groups(tournament_dir='.'):
+    """Every group_* directory of a tournament, in group number order."""
+    groups = [d for d in os.listdir(tournament_dir)
+              if d.startswith('group_') and os.path.isdir(os.path.join(tournament_dir, d))]
+    return sorted(groups, key=lambda g: [int(t) if t.isdigit() else t for t in re.split(r'(\d+)', g)])
+
+
+def groups_from_args(argv, tournament_dir='.'):
+    """`script.py group_1 [group_2 ...]` scores those groups, `script.py all` (or no args) every group."""
+    groups = argv[1:]
+    if not groups or groups == ['all']:
+        return discover_groups(tournament_dir)
+    return groups
+
+
+def run_groups(groups, load_shared, score_group, render_group, workers=None):
+    """Score every group against one load of the shared tournament data, then render in parallel.
+
+    load_shared() reads the tournament-wide inputs once. score_group(group, shared) runs in this
+    process and returns the argument tuple for render_group (or None to skip rendering), which
+    runs in a process pool since chart rendering is the slow, independent part. With render_group
+    None nothing is rendered (and nothing that renders gets imported).
+    """
+    with instrument.span('load_shared'):
+        shared = load_shared()
+    jobs = []
+    for group in groups:
+        print(group)
+        with instrument.span(f'score {group}', group=group):
+            job = score_group(group, shared)
+        if job is not None:
+            jobs.append((group, job))
+    if render_group is None:
+        return shared
+    if len(jobs) <= 1 or workers == 1:
+        for group, job in jobs:
+            with instrument.span(f'render {group}', group=group):
+                render_group(*job)
+        return shared
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    # Each render reports its spans back from its worker process
+    with instrument.span('render', workers=workers), ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(instrument.call_traced, render_group, f'render {group}', *job) for group, job in jobs]
+        for future in futures:
+            instrument.attach(future.result()[1])
+    return shared
@@ -0,0 +1,125 @@
+from fantasy import instrument
+
+# One headless Chrome per fetch run. The selenium source used to start and quit a browser for
+# every page; a BrowserSession starts one the first time a page needs it and gives each page a tab
+# of its own:
+#   - pages are opened with the "none" page load strategy, so driver.get() returns at once and
+#     all the pages of a run load side by side (prefetch(pages) opens them together)
+#   - each tab then waits on its page's readiness condition (Page.ready, by default the document
+#     having finished loading) instead of a fixed sleep
+#   - images, fonts and analytics/ad requests are blocked in every tab (Network.setBlockedURLs),
+#     none of which the tables need
+# benchmarks/bench_browser.py compares it with a browser per page against the stand-in server.
+
+TIMEOUT = 30
+BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*googleadservices.com*', '*facebook.net*', '*scorecardresearch.com*', '*hotjar.com*', '*chartbeat.*',
+    '*segment.io*', '*quantserve.com*', '*taboola.com*', '*outbrain.com*',
+]
+
+
+def document_ready(driver):
+    return driver.execute_script('return document.readyState') == 'complete'
+
+
+def table_ready(marker):
+    """A Page.ready that waits until some table's first row has a `marker` cell."""
+    script = ("return Array.from(document.querySelectorAll('table')).some(t => t.rows.length > 1 && "
+              "Array.from(t.rows[0].cells).some(c => c.textContent.trim() === arguments[0]))")
+    return lambda driver: driver.execute_script(script, marker)
+
+
+def chrome_options(user_agent, block_images=True):
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument(f'user-agent={user_agent}')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    # Background tabs keep loading and running their scripts at full speed
+    options.add_argument('--disable-background-timer-throttling')
+    options.add_argument('--disable-backgrounding-occluded-windows')
+    options.add_argument('--disable-renderer-backgrounding')
+    options.page_load_strategy = 'none'
+    if block_images:
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    return options
+
+
+class BrowserSession:
+    """A headless Chrome shared by every page of a run, started on first use. page_loads counts
+    pages opened and chrome_starts how many browsers that took (at most one)."""
+
+    def __init__(self, user_agent, base_url=None, timeout=TIMEOUT, blocked=BLOCKED_URLS):
+        self.user_agent = user_agent
+        self.base_url = base_url
+        self.timeout = timeout
+        self.blocked = list(blocked or [])
+        self.driver = None
+        self.tabs = {}
+        self.chrome_starts = 0
+        self._failed = None
+
+    def start(self):
+        if self.driver is None:
+            # A browser that wouldn't start won't start for the next page either
+            if self._failed is not None:
+                raise self._failed
+            try:
+                from selenium import webdriver
+
+                with instrument.span('chrome start'):
+                    self.driver = webdriver.Chrome(options=chrome_options(self.user_agent, bool(self.blocked)))
+            except Exception as e:
+                self._failed = e
+                raise
+            self.chrome_starts += 1
+        return self.driver
+
+    def open(self, page):
+        """Starts loading a page in a tab of its own without waiting for it."""
+        if page.name in self.tabs:
+            return
+        from fantasy.sources import rebase
+
+        driver = self.start()
+        if self.tabs:
+            driver.switch_to.new_window('tab')
+        if self.blocked:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked})
+        with instrument.span('page open', url=page.url):
+            driver.get(rebase(page.url, self.base_url))
+        self.tabs[page.name] = driver.current_window_handle
+
+    def prefetch(self, pages):
+        for page in pages:
+            self.open(page)
+
+    def html(self, page):
+        """The page's HTML once it is ready and its browser steps have run."""
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        self.open(page)
+        driver = self.driver
+        driver.switch_to.window(self.tabs[page.name])
+        with instrument.span('page load', url=page.url):
+            WebDriverWait(driver, self.timeout).until(page.ready or document_ready)
+        if page.browser_steps:
+            with instrument.span('browser steps'):
+                page.browser_steps(driver)
+        return driver.page_source
+
+    @property
+    def page_loads(self):
+        return len(self.tabs)
+
+    def close(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+        self.tabs = {}
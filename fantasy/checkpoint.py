@@ -0,0 +1,118 @@
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from fantasy.atomic import atomic_open
+
+
+def fingerprint(*parts):
+    """Hash of chart or page inputs: DataFrames/Series, arrays and anything with a stable repr."""
+    h = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            columns = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+            h.update(repr((list(part.index), list(columns))).encode())
+            h.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+        elif isinstance(part, np.ndarray):
+            h.update(np.ascontiguousarray(part).tobytes())
+        else:
+            h.update(repr(part).encode())
+        h.update(b'\x1e')
+    return h.hexdigest()
+
+
+def roster_fingerprint(engine):
+    """Changes whenever a manager or a rostered player changes, which invalidates a checkpoint."""
+    h = hashlib.sha1()
+    for mgr in engine.managers:
+        h.update(('\x1e' + mgr + '\x1f' + '\x1f'.join(engine.roster_players(mgr))).encode())
+    return h.hexdigest()
+
+
+def engine_key(rosters_path, resolver=None, teams=()):
+    """Hash of what a group's ScoringEngine is built from besides the registry: its auction summary,
+    the confirmed aliases and the standings' teams (ScoringCheckpoint.engine_for checks the registry)."""
+    with open(rosters_path, 'rb') as f:
+        rosters = f.read()
+    aliases = sorted(resolver.aliases.items()) if resolver is not None else []
+    return fingerprint(rosters, aliases, sorted(str(t).strip() for t in teams))
+
+
+class ScoringCheckpoint:
+    """What one group's last scoring run saw: per-player points and per-manager totals, and from the
+    scoring scripts also the ScoringEngine itself with the engine_key of what it was built from.
+
+    Saved as ./{group}/scoring_checkpoint.npz next to the group's outputs. The next run reuses the
+    engine while its inputs are unchanged, diffs its snapshot against `points` over the rostered
+    players only and pushes just the changed ones through the ownership matrix.
+    """
+
+    def __init__(self, day_num, players, points, managers, player_totals, scores, fingerprint, engine=None,
+                 key=None):
+        self.day_num = int(day_num)
+        self.players = pd.Index(players)
+        self.points = np.nan_to_num(np.asarray(points, dtype=np.float64))
+        self.managers = list(managers)
+        self.player_totals = np.asarray(player_totals, dtype=np.float64)
+        self.scores = np.asarray(scores, dtype=np.float64)
+        self.fingerprint = fingerprint
+        self.engine = engine
+        self.key = key
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as f:
+            engine = pickle.loads(f['engine'].tobytes()) if 'engine' in f.files else None
+            return cls(f['day_num'], f['players'], f['points'], f['managers'].tolist(),
+                       f['player_totals'], f['scores'], str(f['fingerprint']), engine,
+                       str(f['key']) if 'key' in f.files else None)
+
+    def save(self, path):
+        saved = {}
+        if self.engine is not None:
+            saved = {'engine': np.frombuffer(pickle.dumps(self.engine), dtype=np.uint8), 'key': self.key}
+        with atomic_open(path, 'wb') as f:
+            np.savez(f, day_num=self.day_num, players=np.array(self.players, dtype=str),
+                     points=self.points, managers=np.array(self.managers, dtype=str),
+                     player_totals=self.player_totals, scores=self.scores, fingerprint=self.fingerprint, **saved)
+
+    def usable_for(self, engine):
+        return self.managers == engine.managers and self.fingerprint == roster_fingerprint(engine)
+
+    def engine_for(self, key, registry):
+        """The saved engine if it was built from the same inputs (engine_key), else None. Players added
+        to the registry since can only change how roster names matched if some didn't match exactly,
+        so then the engine is rebuilt too."""
+        if self.engine is None or self.key != key:
+            return None
+        inexact = self.engine.resolved or any(self.engine.missing.values())
+        if inexact and len(registry) != len(self.points):
+            return None
+        return self.engine
+
+    def points_for(self, players):
+        """This checkpoint's points re-aligned to another player order (0 for unseen players)."""
+        return pd.Series(self.points, index=self.players).reindex(players).fillna(0).to_numpy()
+
+
+def incremental_player_totals(engine, checkpoint, points):
+    """engine.player_totals(points), computed as checkpoint totals + the changed players' deltas.
+
+    Returns (player_totals, changed player ids, positions of the managers owning one of them). Only
+    the rostered players (engine.owned) are diffed, so with the checkpoint's engine (engine_for) a
+    run costs O(rostered players + changes x owners), not a product over every player and manager.
+    Engines are built over the player registry, whose ids cover every player ever seen, so a player
+    who drops out of today's table is still there (with NaN points, i.e. 0) and their delta is picked
+    up like any other.
+    """
+    owned = engine.owned
+    delta = np.nan_to_num(np.asarray(points, dtype=np.float64)[owned]) - checkpoint.points[owned]
+    k = np.flatnonzero(delta)
+    changed = owned[k]
+    totals = checkpoint.player_totals + engine.ownership.dot_sparse(changed, delta[k])
+    return totals, changed, np.unique(engine.ownership.column_rows(changed)[0])
@@ -0,0 +1,319 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from fantasy import tables
+from fantasy.batch import discover_groups
+from fantasy.checkpoint import ScoringCheckpoint, roster_fingerprint
+from fantasy.league import TOP_K, Standings, league_mode
+from fantasy.names import NameResolver
+from fantasy.registry import normalize_name
+from fantasy.season_store import import_archive
+from fantasy.scoring import ScoringEngine
+from fantasy.sources import USER_AGENT, rebase
+
+# Live mode: one warm process that polls the points page during matches instead of the daily
+# fetch + cold scoring run. Every poll is a conditional request per page (If-None-Match /
+# If-Modified-Since), so an unchanged page costs a 304 and no parsing. Changed pages are re-parsed,
+# and only the players whose points moved go through each group's ownership matrix
+# (OwnershipMatrix.dot_sparse). Standings are served locally and checkpointed to
+# ./{group}/live_checkpoint.npz after every change, so a restart picks up where it left off:
+#   GET /leaderboard.json                    every group's table (top of the table for big leagues)
+#   GET /groups/{group}.json                 one group
+#   GET /groups/{group}/around/{manager}     a manager's neighborhood in a big league
+#   GET /events                              server-sent events, one `leaderboard` event per change
+#
+# Usage (from the tournament directory; T20-style player points only, no standings bonus)
+#  python -m fantasy.daemon --url 'https://cricketxi.com/t20-world-cup-2026/players/?pg={page}' --pages 6 \
+#      --marker 'Points  Points  Arrow up  Arrow down  Total Points' --row t20_player_row --interval 60 --port 8766
+#  python -m fantasy.standin replay snapshots/ --every 30     recorded snapshots, one after another
+#  FANTASY_SOURCE_BASE_URL=http://127.0.0.1:8765 python -m fantasy.daemon ...   poll the stand-in instead
+
+INTERVAL = 60
+PORT = 8766
+CHECKPOINT = 'live_checkpoint.npz'
+KEEPALIVE = 15
+
+
+class ConditionalPages:
+    """The polled pages' last validators and parsed tables; a 304 reuses the table it had."""
+
+    def __init__(self, urls, marker, row=None, base_url=None):
+        self.urls = urls
+        self.marker = marker
+        self.row = row
+        self.base_url = base_url
+        self.validators = {}
+        self.tables = {}
+
+    async def fetch(self, client, url):
+        """True if the page changed since the last poll."""
+        headers = {}
+        etag, modified = self.validators.get(url, (None, None))
+        if etag:
+            headers['If-None-Match'] = etag
+        if modified:
+            headers['If-Modified-Since'] = modified
+        response = await client.get(rebase(url, self.base_url), headers=headers)
+        if response.status_code == 304:
+            return False
+        response.raise_for_status()
+        self.validators[url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        # Parsing is the slow part; keep it off the loop so the server stays responsive
+        table = await asyncio.to_thread(tables.read_table, response.text, self.marker, self.row)
+        if table is None:
+            raise ValueError(f'{url}: no table with a {self.marker!r} column')
+        self.tables[url] = table
+        return True
+
+    async def poll(self, client):
+        """The merged table if any page changed, else None."""
+        changed = await asyncio.gather(*(self.fetch(client, url) for url in self.urls))
+        if not any(changed):
+            return None
+        return pd.concat([self.tables[url] for url in self.urls if url in self.tables], ignore_index=True)
+
+
+class LiveGroup:
+    """A group's in-memory scoring state: current points per player and each manager's total."""
+
+    def __init__(self, name, rosters, resolver, players, checkpoint_path):
+        self.name = name
+        self.rosters = rosters
+        self.resolver = resolver
+        self.checkpoint_path = checkpoint_path
+        # Totals before the last change (for rank movement) and when that change came in
+        self.previous = None
+        self.updated = None
+        self._scored = False
+        self._build(players)
+        checkpoint = ScoringCheckpoint.load(checkpoint_path)
+        if checkpoint is not None and checkpoint.usable_for(self.engine):
+            # Warm start: the last state this daemon saved, so the first poll is incremental too
+            self.points = checkpoint.points_for(self.engine.players)
+            self.totals = self.engine.player_totals(self.points)
+            self._scored = True
+            print(f'{name}: resumed from {checkpoint_path}')
+
+    def _build(self, players):
+        self.engine = ScoringEngine(self.rosters, players, resolver=self.resolver)
+        self.points = np.zeros(len(self.engine.players))
+        self.totals = self.engine.player_totals(self.points)
+
+    def apply(self, table):
+        """Takes a new points table; returns the names of the players whose points changed."""
+        new_players = pd.Index(normalize_name(table['Player'])).difference(self.engine.players)
+        if len(new_players):
+            # Players the engine has never seen: rebuild over the wider player list (rare - the
+            # list only grows when a squad changes)
+            old = pd.Series(self.points, index=self.engine.players)
+            self._build(list(self.engine.players) + list(new_players))
+            self.points = old.reindex(self.engine.players).fillna(0).to_numpy()
+            self.totals = self.engine.player_totals(self.points)
+        points = np.nan_to_num(self.engine.snapshot_points(table))
+        delta = points - self.points
+        changed = np.flatnonzero(delta)
+        if len(changed):
+            self.previous = self.totals if self._scored else None
+            self._scored = True
+            self.totals = self.totals + self.engine.ownership.dot_sparse(changed, delta[changed])
+            self.points = points
+            self.updated = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        return self.engine.players[changed].tolist()
+
+    def checkpoint(self, day_num=0):
+        ScoringCheckpoint(day_num, self.engine.players, self.points, self.engine.managers, self.totals,
+                          self.totals, roster_fingerprint(self.engine)).save(self.checkpoint_path)
+
+    def standings(self):
+        return Standings(self.engine.managers, self.totals, self.previous)
+
+    def payload(self, k=TOP_K):
+        standings = self.standings()
+        rows = standings.top(k if league_mode(len(standings)) else len(standings))
+        return {'group': self.name, 'updated': self.updated, 'managers': len(standings),
+                'rows': rows.to_dict(orient='records')}
+
+
+class LiveServer:
+    """Minimal asyncio HTTP server for the JSON views and the server-sent event stream."""
+
+    def __init__(self, groups):
+        self.groups = groups
+        self.subscribers = set()
+
+    def publish(self, payload):
+        for queue in self.subscribers:
+            queue.put_nowait(payload)
+
+    async def handle(self, reader, writer):
+        try:
+            request = (await reader.readline()).decode('latin-1').split()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            if len(request) < 2 or request[0] != 'GET':
+                await self.respond(writer, 405, {'error': 'GET only'})
+            elif request[1] == '/events':
+                await self.stream(writer)
+            else:
+                status, body = self.route(request[1].split('?')[0])
+                await self.respond(writer, status, body)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def route(self, path):
+        parts = [p for p in path.split('/') if p]
+        if parts == ['leaderboard.json']:
+            return 200, {name: group.payload() for name, group in self.groups.items()}
+        if len(parts) == 2 and parts[0] == 'groups' and parts[1].removesuffix('.json') in self.groups:
+            return 200, self.groups[parts[1].removesuffix('.json')].payload()
+        if len(parts) == 4 and parts[0] == 'groups' and parts[2] == 'around' and parts[1] in self.groups:
+            from urllib.parse import unquote
+
+            try:
+                rows = self.groups[parts[1]].standings().around(unquote(parts[3]))
+            except KeyError as e:
+                return 404, {'error': str(e)}
+            return 200, {'group': parts[1], 'rows': rows.to_dict(orient='records')}
+        return 404, {'error': f'nothing at {path}'}
+
+    async def respond(self, writer, status, body):
+        data = json.dumps(body, default=_json_default).encode()
+        reason = {200: 'OK', 404: 'Not Found', 405: 'Method Not Allowed'}[status]
+        writer.write(f'HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(data)}\r\nConnection: close\r\n\r\n'.encode() + data)
+        await writer.drain()
+
+    async def stream(self, writer):
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n'
+                     b'Connection: keep-alive\r\n\r\n')
+        queue = asyncio.Queue()
+        self.subscribers.add(queue)
+        try:
+            # Current state first, then one event per change
+            queue.put_nowait({name: group.payload() for name, group in self.groups.items()})
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), KEEPALIVE)
+                except asyncio.TimeoutError:
+                    writer.write(b': keep-alive\n\n')
+                else:
+                    data = json.dumps(payload, default=_json_default)
+                    writer.write(f'event: leaderboard\ndata: {data}\n\n'.encode())
+                await writer.drain()
+        finally:
+            self.subscribers.discard(queue)
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def load_groups(tournament_dir, groups, auction_file, first_table):
+    """LiveGroups for the tournament's groups, with names matched as the T20 scoring script does."""
+    data = os.path.join(tournament_dir, 'data')
+    season = import_archive(data)
+    snapshots = [first_table.assign(Player=normalize_name(first_table['Player']))]
+    if len(season.days()):
+        snapshots.append(season.players())
+    resolver = NameResolver.from_sources(snapshots, players_csv=os.path.join(data, 'players.csv'),
+                                         alias_path=os.path.join(data, 'player_aliases.csv'))
+    players = pd.concat([normalize_name(first_table['Player'])] + [s['Player'] for s in snapshots[1:]], ignore_index=True)
+    live = {}
+    for group in groups or discover_groups(tournament_dir):
+        group_dir = os.path.join(tournament_dir, group)
+        summary = pd.read_csv(os.path.join(group_dir, auction_file))
+        summary.columns = [c.strip() for c in summary.columns]
+        rosters = {mgr: summary[mgr] for mgr in summary.columns}
+        live[group] = LiveGroup(group, rosters, resolver, players.drop_duplicates(),
+                                os.path.join(group_dir, CHECKPOINT))
+    return live
+
+
+class Daemon:
+    def __init__(self, pages, tournament_dir='.', groups=None, auction_file='AuctionSummary.csv',
+                 interval=INTERVAL, day_num=0):
+        self.pages = pages
+        self.tournament_dir = tournament_dir
+        self.group_names = groups
+        self.auction_file = auction_file
+        self.interval = interval
+        self.day_num = day_num
+        self.groups = {}
+        self.server = LiveServer(self.groups)
+        self.polls = 0
+
+    async def poll_once(self, client):
+        t = time.perf_counter()
+        table = await self.pages.poll(client)
+        self.polls += 1
+        if table is None:
+            print(f'poll {self.polls}: unchanged ({time.perf_counter() - t:.2f}s)')
+            return False
+        if not self.groups:
+            self.groups.update(load_groups(self.tournament_dir, self.group_names, self.auction_file, table))
+        updated = {}
+        for name, group in self.groups.items():
+            changed = group.apply(table)
+            if changed:
+                group.checkpoint(self.day_num)
+                updated[name] = group.payload()
+            print(f'poll {self.polls}: {name} {len(changed)} players changed')
+        if updated:
+            self.server.publish(updated)
+        print(f'poll {self.polls}: {len(table)} rows in {time.perf_counter() - t:.2f}s')
+        return bool(updated)
+
+    async def run(self, host='127.0.0.1', port=PORT, polls=None):
+        import httpx
+
+        server = await asyncio.start_server(self.server.handle, host, port)
+        print(f'Serving live standings at http://{host}:{server.sockets[0].getsockname()[1]}/leaderboard.json')
+        async with server, httpx.AsyncClient(timeout=30, headers={'User-Agent': USER_AGENT},
+                                             follow_redirects=True) as client:
+            while polls is None or self.polls < polls:
+                started = time.monotonic()
+                try:
+                    await self.poll_once(client)
+                except (httpx.HTTPError, ValueError) as e:
+                    # A failed poll keeps the last good standings; the next one tries again
+                    self.polls += 1
+                    print(f'poll {self.polls} failed: {e!r}')
+                await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Poll the points page and serve live standings')
+    parser.add_argument('--url', required=True, help='points page, with {page} where the page number goes')
+    parser.add_argument('--pages', type=int, default=1)
+    parser.add_argument('--marker', default=tables.T20_POINTS,
+                        help="a column header of the points table (default: the T20 points header)")
+    parser.add_argument('--row', help='row function from fantasy.tables, e.g. t20_player_row')
+    parser.add_argument('--tournament-dir', default='.')
+    parser.add_argument('--groups', nargs='*', help='default: every group_* directory')
+    parser.add_argument('--auction-file', default='AuctionSummary.csv')
+    parser.add_argument('--interval', type=float, default=INTERVAL, help='seconds between polls')
+    parser.add_argument('--day', type=int, default=0, help='day number recorded in the checkpoints')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--polls', type=int, help='stop after this many polls (default: run until killed)')
+    args = parser.parse_args()
+
+    urls = [args.url.format(page=n) for n in range(1, args.pages + 1)] if '{page}' in args.url else [args.url]
+    pages = ConditionalPages(urls, args.marker, getattr(tables, args.row) if args.row else None,
+                             base_url=os.environ.get('FANTASY_SOURCE_BASE_URL'))
+    daemon = Daemon(pages, args.tournament_dir, args.groups, args.auction_file, args.interval, args.day)
+    try:
+        asyncio.run(daemon.run(args.host, args.port, args.polls))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,109 @@
+import os
+import re
+import sys
+
+import pandas as pd
+
+from fantasy.atomic import write_csv
+
+# A group's per-player points history is one long-format, append-only CSV, ./{group}/points_history.csv:
+#   day,manager,player,points
+# A run appends that day's rows and never rewrites what is already there. Points are cumulative, so
+# an incremental run (fantasy.checkpoint) only appends rows for the managers owning a player whose
+# points moved; a manager with no rows on a day still has the rows of their last day before it. The
+# daily cost is the size of the changed rosters rather than rosters x days so far. The wide
+# per-manager tables (player x day_N, the old ./{group}/{manager}.csv files) are built from it, with
+# those days filled in, only when asked for:
+#   python -m fantasy.history ./group_1              write every manager's {manager}.csv
+#   python -m fantasy.history ./group_1 Raghav       just one
+
+COLUMNS = ['day', 'manager', 'player', 'points']
+# Blank roster slots (auction summaries are padded to the longest roster) aren't players
+_BLANK = ('', 'nan')
+_DAY = re.compile(r'^day_(\d+)$')
+
+
+class PointsHistory:
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def append(self, day_num, roster_points):
+        """roster_points: {manager: {rostered player: points}}, for every manager or only those
+        whose players' points changed since their last rows. Re-appending a day replaces it."""
+        rows = [(day_num, mgr, player, pts)
+                for mgr, players in roster_points.items() for player, pts in players.items()
+                if player not in _BLANK]
+        new = not self.exists()
+        with open(self.path, 'a', newline='') as f:
+            pd.DataFrame(rows, columns=COLUMNS).to_csv(f, header=new, index=False)
+
+    def replace_days(self, days, rows):
+        """Rewrites the history with every row of `days` replaced by `rows` (a COLUMNS frame)."""
+        kept = self.frame()
+        kept = kept[~kept['day'].isin(list(days))]
+        parts = [kept, rows[COLUMNS]] if len(kept) else [rows[COLUMNS]]
+        merged = pd.concat(parts, ignore_index=True).sort_values('day', kind='stable')
+        write_csv(merged, self.path, index=False)
+
+    def frame(self, manager=None):
+        if not self.exists():
+            return pd.DataFrame(columns=COLUMNS)
+        df = pd.read_csv(self.path, dtype={'manager': str, 'player': str}, keep_default_na=False,
+                         na_values={'points': ['']})
+        if manager is not None:
+            df = df[df['manager'] == manager]
+        # Later rows win, so a day that was scored twice shows its last run
+        return df.drop_duplicates(['day', 'manager', 'player'], keep='last')
+
+    def managers(self):
+        return list(dict.fromkeys(self.frame()['manager']))
+
+    def days(self):
+        return sorted(set(self.frame()['day']))
+
+    def wide(self, manager, days=None):
+        """The manager's players x day_N table, laid out like the old {manager}.csv files. It has a
+        column for every day in the history (and in `days`, e.g. the results store's); a day without
+        rows of the manager's repeats their day before."""
+        df = self.frame(manager)
+        players = list(dict.fromkeys(df['player']))
+        wide = df.pivot(index='player', columns='day', values='points').reindex(players)
+        if len(wide.columns):
+            days = sorted(set(wide.columns).union(self.days() if days is None else days))
+            wide = wide.reindex([d for d in days if d >= min(wide.columns)], axis=1).ffill(axis=1)
+        wide.columns = [f'day_{d}' for d in wide.columns]
+        return wide.rename_axis(manager).reset_index()
+
+    def export_wide(self, directory, managers=None, days=None):
+        days = sorted(set(self.days()).union(days if days is not None else []))
+        for mgr in managers or self.managers():
+            write_csv(self.wide(mgr, days), os.path.join(directory, f'{mgr}.csv'), index=False)
+
+    def import_wide(self, wide_files):
+        """Seeds an empty history from the old wide {manager}.csv files ({manager: path})."""
+        rows = []
+        for mgr, path in wide_files.items():
+            df = pd.read_csv(path, dtype={mgr: str}, keep_default_na=False, na_values=[''])
+            df[mgr] = df[mgr].fillna('')
+            for col in df.columns:
+                m = _DAY.match(str(col))
+                if m:
+                    rows.extend((int(m.group(1)), mgr, player, pts) for player, pts in zip(df[mgr], df[col])
+                                if player not in _BLANK)
+        rows.sort(key=lambda r: r[0])
+        write_csv(pd.DataFrame(rows, columns=COLUMNS), self.path, index=False)
+
+
+if __name__ == '__main__':
+    from fantasy.results_store import ResultsStore
+
+    group_dir = sys.argv[1] if len(sys.argv) > 1 else '.'
+    history = PointsHistory(os.path.join(group_dir, 'points_history.csv'))
+    # Every scored day gets a column, including days on which no manager's players moved
+    results = os.path.join(group_dir, 'results')
+    days = ResultsStore(results).days().tolist() if os.path.isdir(results) else None
+    history.export_wide(group_dir, sys.argv[2:] or None, days)
@@ -0,0 +1,289 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from fantasy.atomic import write_text
+
+# Named timing spans around the stages of the fetchers and scoring scripts. A script calls
+# start(name) once; from then on every `with span('stage'):` block records its wall and CPU time,
+# the rows it handled, the process RSS when it ended and the peak RSS reached inside it, nested
+# under whatever span was open when it started. When the script exits the tree is written as JSON
+# to ./reports/{name}.json (next to the data and group outputs it describes):
+#   {"name", "started", "wall_s", "cpu_s", "peak_rss_mb", "status", "meta", "spans": [
+#       {"name", "start_s", "wall_s", "cpu_s", "rss_mb", "peak_rss_mb", "rows", ..., "spans": [...]}]}
+# Without start() spans cost next to nothing and record nothing, so library code can always use them.
+#
+# FANTASY_PROFILE=cprofile   also profiles the run with cProfile: ./reports/{name}.prof plus the top
+#                            functions by cumulative time in the report
+# FANTASY_PROFILE=pyinstrument   the same with the pyinstrument sampling profiler (./reports/{name}.html)
+#
+# Spans are for synchronous stretches of one thread: one that is open across an `await` or is
+# entered from several threads would nest the wrong spans under it.
+
+REPORT_DIR = './reports'
+PROFILE_TOP = 25
+
+_PAGE_MB = os.sysconf('SC_PAGE_SIZE') / 2 ** 20 if hasattr(os, 'sysconf') else 0
+
+
+def _rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_MB
+    except OSError:
+        return None
+
+
+class _PeakRss:
+    """High-water RSS since the last reset: VmHWM, reset through /proc/self/clear_refs where the
+    kernel allows it, otherwise the never-reset ru_maxrss."""
+
+    def __init__(self):
+        self.resettable = True
+
+    def read(self):
+        try:
+            with open('/proc/self/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+    def reset(self):
+        if not self.resettable:
+            return
+        try:
+            with open('/proc/self/clear_refs', 'w') as f:
+                f.write('5')
+        except OSError:
+            self.resettable = False
+
+
+class Span:
+    def __init__(self, name, fields, t0):
+        self.name = name
+        self.fields = fields
+        self.rows = None
+        self.spans = []
+        self.peak = None
+        self._start = time.perf_counter()
+        self._cpu = time.process_time()
+        self._t0 = t0
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def _fold_peak(self, peak):
+        if peak is not None and (self.peak is None or peak > self.peak):
+            self.peak = peak
+
+    def close(self, error=None):
+        out = {'name': self.name, 'start_s': round(self._start - self._t0, 4),
+               'wall_s': round(time.perf_counter() - self._start, 4),
+               'cpu_s': round(time.process_time() - self._cpu, 4)}
+        rss = _rss_mb()
+        if rss is not None:
+            out['rss_mb'] = round(rss, 1)
+        if self.peak is not None:
+            out['peak_rss_mb'] = round(self.peak, 1)
+        if self.rows is not None:
+            out['rows'] = int(self.rows)
+        out.update({k: round(v, 4) if isinstance(v, float) else v for k, v in self.fields.items()})
+        if error is not None:
+            out['error'] = error
+        if self.spans:
+            out['spans'] = self.spans
+        return out
+
+
+class _NullSpan:
+    rows = None
+
+    def set(self, **fields):
+        pass
+
+
+_NULL = _NullSpan()
+
+
+class Recorder:
+    def __init__(self, name, meta=None):
+        self.name = name
+        self.meta = dict(meta or {})
+        self.started = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.peak = _PeakRss()
+        self.root = Span(name, {}, time.perf_counter())
+        self.stack = [self.root]
+        self.status = 'ok'
+        self.profiler = None
+        self._tick()
+
+    def _tick(self):
+        # Whatever the peak was since the last span boundary belongs to every span open now
+        peak = self.peak.read()
+        for open_span in self.stack:
+            open_span._fold_peak(peak)
+        self.peak.reset()
+
+    @contextmanager
+    def span(self, name, fields):
+        self._tick()
+        current = Span(name, fields, self.root._t0)
+        self.stack.append(current)
+        error = None
+        try:
+            yield current
+        except BaseException as e:
+            error = f'{type(e).__name__}: {e}'
+            raise
+        finally:
+            self._tick()
+            self.stack.pop()
+            self.stack[-1].spans.append(current.close(error))
+
+    def attach(self, span_report):
+        """Adds a span recorded elsewhere (another process) under the current one."""
+        self.stack[-1].spans.append(span_report)
+        self.stack[-1]._fold_peak(span_report.get('peak_rss_mb'))
+
+    def report(self):
+        self._tick()
+        root = self.root.close()
+        report = {'name': self.name, 'started': self.started, 'wall_s': root['wall_s'], 'cpu_s': root['cpu_s'],
+                  'peak_rss_mb': root.get('peak_rss_mb'), 'status': self.status, 'meta': self.meta,
+                  'spans': root.get('spans', [])}
+        return report
+
+
+_recorder = None
+
+
+def active():
+    return _recorder is not None
+
+
+def start(name, report_dir=REPORT_DIR, **meta):
+    """Starts recording this run; the report is written when the interpreter exits."""
+    global _recorder
+    import atexit
+
+    _recorder = Recorder(name, meta)
+    _recorder.report_dir = report_dir
+    _start_profiler(_recorder)
+
+    previous_hook = sys.excepthook
+
+    def excepthook(*exc_info):
+        if _recorder is not None:
+            _recorder.status = f'failed: {exc_info[0].__name__}: {exc_info[1]}'
+        previous_hook(*exc_info)
+
+    sys.excepthook = excepthook
+    atexit.register(finish)
+    return _recorder
+
+
+def finish():
+    """Writes the run report (and profile) now; later calls do nothing."""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is None:
+        return None
+    os.makedirs(recorder.report_dir, exist_ok=True)
+    report = recorder.report()
+    _stop_profiler(recorder, report)
+    path = os.path.join(recorder.report_dir, f'{recorder.name}.json')
+    write_text(path, json.dumps(report, indent=1, default=str))
+    print(f'Run report written to {path}')
+    return path
+
+
+def span(name, **fields):
+    """`with span('stage', key=value) as s: ...; s.rows = n`. Records nothing unless start() was called."""
+    if _recorder is None:
+        return _null_span()
+    return _recorder.span(name, fields)
+
+
+@contextmanager
+def _null_span():
+    yield _NULL
+
+
+def set_meta(**meta):
+    if _recorder is not None:
+        _recorder.meta.update(meta)
+
+
+def call_traced(fn, name, *args):
+    """Runs fn(*args) in a span of its own and returns (result, span report).
+
+    For work handed to a process pool: the child process records into a fresh recorder and the
+    parent attach()es the span it sends back.
+    """
+    global _recorder
+    _recorder = Recorder(name)
+    try:
+        with _recorder.span(name, {'pid': os.getpid()}):
+            result = fn(*args)
+        return result, _recorder.root.spans[-1]
+    finally:
+        _recorder = None
+
+
+def attach(span_report):
+    if _recorder is not None and span_report is not None:
+        _recorder.attach(span_report)
+
+
+# ---------- profilers ----------
+
+def _start_profiler(recorder):
+    kind = os.environ.get('FANTASY_PROFILE', '').strip().lower()
+    if not kind:
+        return
+    if kind == 'cprofile':
+        import cProfile
+
+        recorder.profiler = ('cprofile', cProfile.Profile())
+        recorder.profiler[1].enable()
+    elif kind == 'pyinstrument':
+        from pyinstrument import Profiler
+
+        recorder.profiler = ('pyinstrument', Profiler())
+        recorder.profiler[1].start()
+    else:
+        raise ValueError(f'FANTASY_PROFILE={kind!r}: expected cprofile or pyinstrument')
+    recorder.meta['profiler'] = kind
+
+
+def _stop_profiler(recorder, report):
+    if recorder.profiler is None:
+        return
+    kind, profiler = recorder.profiler
+    base = os.path.join(recorder.report_dir, recorder.name)
+    if kind == 'cprofile':
+        import pstats
+
+        profiler.disable()
+        profiler.dump_stats(base + '.prof')
+        stats = pstats.Stats(profiler)
+        top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]
+        report['profile'] = [{'function': f'{path}:{line}({func})', 'calls': calls, 'tottime_s': round(tt, 4),
+                              'cumtime_s': round(ct, 4)}
+                             for (path, line, func), (_, calls, tt, ct, _) in top]
+        report['profile_file'] = base + '.prof'
+    else:
+        profiler.stop()
+        write_text(base + '.html', profiler.output_html())
+        report['profile_file'] = base + '.html'
@@ -0,0 +1,166 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from fantasy.atomic import write_text
+from fantasy.results_store import ResultsStore
+
+# League mode, for public leagues with thousands of managers in a group. Ranks and day-over-day
+# rank movement are worked out for every manager at once from the results store (one stable argsort
+# per day, ties share the better rank), but only the top of the table and the few rows around each
+# manager are ever turned into DataFrames/markdown:
+#   python -m fantasy.league ./group_1 top [--k 25] [--day N]
+#   python -m fantasy.league ./group_1 around "manager name" [--radius 5] [--day N]
+#   python -m fantasy.league ./group_1 publish [--k 25] [--neighborhoods a,b] [--day N]
+# The scoring scripts switch to it by themselves for groups bigger than LEAGUE_MANAGERS, and publish
+# league_top.txt plus neighborhoods/{manager}.txt for every ranked manager each day.
+
+LEAGUE_MANAGERS = 50
+TOP_K = 25
+RADIUS = 5
+
+
+def league_mode(n_managers):
+    return n_managers > LEAGUE_MANAGERS
+
+
+def competition_ranks(totals):
+    """(ranks, order) for a totals array: 1-based ranks, best total first, equal totals sharing the
+    better rank (1, 2, 2, 4); managers without a total get rank 0 and are left out of order."""
+    totals = np.asarray(totals, dtype=np.float64)
+    has_total = ~np.isnan(totals)
+    ids = np.flatnonzero(has_total)
+    order = ids[np.argsort(-totals[ids], kind='stable')]
+    desc = -totals[order]
+    ranks = np.zeros(len(totals), dtype=np.int64)
+    ranks[order] = np.searchsorted(desc, desc, side='left') + 1
+    return ranks, order
+
+
+def movement_label(move):
+    if move > 0:
+        return f'▲{move}'
+    if move < 0:
+        return f'▼{-move}'
+    return ''
+
+
+class Standings:
+    """One day's ranks for every manager, plus the movement since the previous day's ranks."""
+
+    def __init__(self, managers, totals, prev_totals=None, day_num=None):
+        self.managers = np.asarray(managers, dtype=object)
+        self.totals = np.asarray(totals, dtype=np.float64)
+        self.day_num = day_num
+        self.ranks, self.order = competition_ranks(self.totals)
+        self._position = np.full(len(self.totals), -1, dtype=np.int64)
+        self._position[self.order] = np.arange(len(self.order))
+        self._ids = None
+        if prev_totals is None:
+            self.movement = np.zeros(len(self.totals), dtype=np.int64)
+        else:
+            prev_ranks, _ = competition_ranks(prev_totals)
+            ranked = (prev_ranks > 0) & (self.ranks > 0)
+            self.movement = np.where(ranked, prev_ranks - self.ranks, 0)
+
+    @classmethod
+    def from_store(cls, store, day_num=None):
+        days = store.days()
+        if not len(days):
+            raise KeyError(f'no results in {store.path}')
+        day_num = int(days[-1]) if day_num is None else int(day_num)
+        earlier = days[days < day_num]
+        prev = int(earlier[-1]) if len(earlier) else day_num
+        totals = store.totals(prev, day_num)
+        if day_num not in totals.columns:
+            raise KeyError(f'day_{day_num} not in results store {store.path}')
+        prev_totals = totals[prev].to_numpy() if prev != day_num else None
+        return cls(totals.index, totals[day_num].to_numpy(), prev_totals, day_num)
+
+    def __len__(self):
+        return len(self.order)
+
+    def rows(self, ids):
+        return pd.DataFrame({'Rank': self.ranks[ids], 'Manager': self.managers[ids], 'Points': self.totals[ids],
+                             'Move': [movement_label(m) for m in self.movement[ids]]})
+
+    def top(self, k=TOP_K):
+        return self.rows(self.order[:k])
+
+    def manager_id(self, manager):
+        if self._ids is None:
+            self._ids = {}
+            for i, name in enumerate(self.managers.tolist()):
+                self._ids.setdefault(name, i)
+        i = self._ids.get(manager)
+        if i is None or self._position[i] < 0:
+            on = f' on day_{self.day_num}' if self.day_num is not None else ''
+            raise KeyError(f'{manager!r} has no total{on}')
+        return i
+
+    def around(self, manager, radius=RADIUS):
+        """The manager's row with up to `radius` rows either side of it."""
+        pos = self._position[self.manager_id(manager)]
+        return self.rows(self.order[max(pos - radius, 0):pos + radius + 1])
+
+    def top_text(self, k=TOP_K):
+        return (f'*DAY_{self.day_num}* top {min(k, len(self))} of {len(self)}\n'
+                f'```\n{self.top(k).to_markdown(index=False)}\n```')
+
+    def around_text(self, manager, radius=RADIUS):
+        from tabulate import tabulate
+
+        i = self.manager_id(manager)
+        pos = self._position[i]
+        ids = self.order[max(pos - radius, 0):pos + radius + 1]
+        # Straight to tabulate (what DataFrame.to_markdown calls), since a league publishes one of
+        # these for every manager
+        rows = zip(self.ranks[ids].tolist(), self.managers[ids].tolist(), self.totals[ids].tolist(),
+                   [movement_label(m) for m in self.movement[ids]])
+        table = tabulate(list(rows), headers=['Rank', 'Manager', 'Points', 'Move'], tablefmt='pipe')
+        return (f'*DAY_{self.day_num}* {manager}: rank {self.ranks[i]} of {len(self)} '
+                f'{movement_label(self.movement[i])}'.rstrip() + f'\n```\n{table}\n```')
+
+
+def publish(store, group_dir, day_num=None, k=TOP_K, neighborhoods=(), radius=RADIUS, prefix='league'):
+    """Writes {prefix}_top.txt and, for the managers asked for (every ranked manager when
+    neighborhoods is None), neighborhoods/{manager}.txt."""
+    standings = Standings.from_store(store, day_num)
+    if neighborhoods is None:
+        neighborhoods = standings.managers[standings.order].tolist()
+    write_text(os.path.join(group_dir, f'{prefix}_top.txt'), standings.top_text(k))
+    for mgr in neighborhoods:
+        path = os.path.join(group_dir, 'neighborhoods', f'{mgr}.txt')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_text(path, standings.around_text(mgr, radius))
+    return standings
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="A large group's ranks, top of the table and neighborhoods")
+    parser.add_argument('group_dir')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('top')
+    p.add_argument('--k', type=int, default=TOP_K)
+    p = sub.add_parser('around')
+    p.add_argument('manager')
+    p.add_argument('--radius', type=int, default=RADIUS)
+    p = sub.add_parser('publish')
+    p.add_argument('--k', type=int, default=TOP_K)
+    p.add_argument('--neighborhoods', default='', help='comma separated managers')
+    p.add_argument('--radius', type=int, default=RADIUS)
+    for p in sub.choices.values():
+        p.add_argument('--day', type=int)
+    args = parser.parse_args()
+
+    store = ResultsStore(os.path.join(args.group_dir, 'results'))
+    if args.command == 'top':
+        print(Standings.from_store(store, args.day).top_text(args.k))
+    elif args.command == 'around':
+        print(Standings.from_store(store, args.day).around_text(args.manager, args.radius))
+    else:
+        managers = [m.strip() for m in args.neighborhoods.split(',') if m.strip()]
+        standings = publish(store, args.group_dir, args.day, args.k, managers, args.radius)
+        print(f'{args.group_dir}: day_{standings.day_num}, {len(standings)} managers ranked')
@@ -0,0 +1,145 @@
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from fantasy import instrument
+from fantasy.atomic import write_csv
+
+# Only the alias table's confirmed rows (alias,player) map a spelling onto another player. A fuzzy
+# match is never scored: it is printed as a suggestion and, at or above this token_sort_ratio, also
+# written to the alias table as a pending row (alias,,suggestion) that scores nothing until someone
+# fills in its player - two similar names on different teams are not the same player.
+PENDING_SCORE = 90
+ALIAS_COLUMNS = ['alias', 'player', 'suggestion']
+CANDIDATES = 8
+
+
+def normalize(name):
+    """Lowercase, accents stripped, punctuation dropped, whitespace collapsed."""
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode()
+    name = re.sub(r"[.'`\-]", ' ', name.lower())
+    return ' '.join(name.split())
+
+
+def compact(name):
+    """'surya kumar yadav' and 'suryakumar yadav' share a compact key."""
+    return normalize(name).replace(' ', '')
+
+
+def trigrams(name):
+    padded = f'  {normalize(name)} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameResolver:
+    """Maps rostered/auction spellings onto the canonical (MVP table) player names.
+
+    Lookups go alias table -> exact name -> compact name -> unique short name, all dict hits. Only
+    a miss falls through to the fuzzy path, which scores the few players sharing the most
+    trigrams with the name instead of the whole player list.
+    """
+
+    def __init__(self, alias_path=None):
+        self.names = []
+        self._exact = {}
+        self._compact = {}
+        self._short = defaultdict(set)
+        self._trigrams = defaultdict(list)
+        self.alias_path = alias_path
+        self.aliases = {}
+        self.pending = {}
+        self._dirty = False
+        if alias_path and os.path.exists(alias_path):
+            df = pd.read_csv(alias_path, dtype=str, keep_default_na=False).reindex(columns=ALIAS_COLUMNS, fill_value='')
+            confirmed = df['player'].str.strip() != ''
+            self.aliases = dict(zip(df.loc[confirmed, 'alias'].map(normalize), df.loc[confirmed, 'player']))
+            self.pending = dict(zip(df.loc[~confirmed, 'alias'].map(normalize), df.loc[~confirmed, 'suggestion']))
+
+    @classmethod
+    def from_sources(cls, snapshots=(), players_csv=None, alias_path=None):
+        """Snapshot (MVP table, or the player registry's) spellings go in first so they are the
+        canonical ones; players_csv is a Player (and optionally Player Short Name) list of extra spellings."""
+        with instrument.span('name index') as span:
+            resolver = cls(alias_path)
+            for snapshot in snapshots:
+                resolver.add_names(snapshot['Player'], snapshot.get('Player Short Name'))
+            if players_csv and os.path.exists(players_csv):
+                df = pd.read_csv(players_csv)
+                resolver.add_names(df['Player'], df.get('Player Short Name'))
+            span.rows = len(resolver.names)
+        return resolver
+
+    def add_names(self, names, short_names=None):
+        names = list(names)
+        shorts = list(short_names) if short_names is not None else [None] * len(names)
+        for name, short in zip(names, shorts):
+            if pd.isna(name):
+                continue
+            name = str(name).lower().strip()
+            key = normalize(name)
+            if key in self._exact:
+                continue
+            i = len(self.names)
+            self.names.append(name)
+            self._exact[key] = name
+            self._compact.setdefault(compact(name), name)
+            if short is not None and not pd.isna(short):
+                self._short[normalize(short)].add(name)
+            for gram in trigrams(name):
+                self._trigrams[gram].append(i)
+
+    def resolve(self, name):
+        """Canonical player name for `name`, or None if only a fuzzy match could find it."""
+        key = normalize(name)
+        if key in self.aliases:
+            return self.aliases[key]
+        if key in self._exact:
+            return self._exact[key]
+        if compact(key) in self._compact:
+            return self._compact[compact(key)]
+        short = self._short.get(key)
+        if short and len(short) == 1:
+            return next(iter(short))
+        return None
+
+    def suggest(self, name, limit=1):
+        """[(player, score)] best fuzzy matches, scored only over trigram-sharing candidates."""
+        from thefuzz import fuzz
+
+        counts = Counter(i for gram in trigrams(name) for i in self._trigrams.get(gram, ()))
+        scored = [(self.names[i], fuzz.token_sort_ratio(normalize(name), normalize(self.names[i])))
+                  for i, _ in counts.most_common(CANDIDATES)]
+        return sorted(scored, key=lambda m: m[1], reverse=True)[:limit]
+
+    def lookup(self, name):
+        """resolve(), else the best fuzzy match as a suggestion only (kept as a pending alias row
+        once it clears PENDING_SCORE).
+
+        Returns (player or None, best suggestion or None).
+        """
+        player = self.resolve(name)
+        if player is not None:
+            return player, None
+        best = self.suggest(name)
+        best = best[0] if best else None
+        if best and best[1] >= PENDING_SCORE and self.pending.get(normalize(name)) != best[0]:
+            self.pending[normalize(name)] = best[0]
+            self._dirty = True
+        return None, best
+
+    def confirm(self, alias, player):
+        self.aliases[normalize(alias)] = player
+        self.pending.pop(normalize(alias), None)
+        self._dirty = True
+
+    def save(self):
+        """Writes the confirmed aliases, then the pending ones with an empty player."""
+        if self.alias_path and self._dirty:
+            rows = [(alias, player, '') for alias, player in sorted(self.aliases.items())]
+            rows += [(alias, '', suggestion) for alias, suggestion in sorted(self.pending.items())
+                     if alias not in self.aliases]
+            write_csv(pd.DataFrame(rows, columns=ALIAS_COLUMNS), self.alias_path, index=False)
+            self._dirty = False
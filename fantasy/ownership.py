@@ -0,0 +1,215 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from fantasy.atomic import write_csv
+from fantasy.batch import discover_groups
+from fantasy.names import NameResolver
+from fantasy.registry import PlayerRegistry, normalize_name
+from fantasy.site import Site
+
+# Who owns whom, across every group of a tournament, built once per run from each group's
+# AuctionSummary.csv (or its sold_players.csv) and keyed by player id - the position of the
+# (resolved, canonical) player name in the index, which is the registry id when the index is
+# built over the player registry (fantasy.registry):
+#   owner of a player in a group       owners[group][player id]              array lookup
+#   a manager's roster                 rosters[group][manager]               dict hit
+#   share of groups owning a player    owned_groups[player id] / n groups    array lookup
+#   top-N undrafted scorers of a group undrafted[group][:n]                  slice of a presorted array
+# The per-group ownership reports (player_ownership.csv, squads_live.csv/.md, ownership.html) and the
+# tournament-wide data/ownership.csv are all written from it in one pass (the .md/.html pages through
+# fantasy.site, so they are only rewritten when they change):
+#   python -m fantasy.ownership                   from the tournament directory, latest mvp day
+#   python -m fantasy.ownership --day 8 group_1
+
+AUCTION_FILE = 'AuctionSummary.csv'
+SOLD_FILE = 'sold_players.csv'
+UNDRAFTED = 'UNDRAFTED'
+
+
+def group_rosters(group_dir, auction_file=AUCTION_FILE, team_row=False):
+    """({manager: [roster names]}, {manager: team}) from a group's auction summary, or from its
+    sold_players.csv if there's no summary. With team_row the summary's first row is each manager's
+    team (the IPL layout), otherwise there are no teams. Names are returned as spelled; the scoring
+    engine and the ownership index resolve them the same way (NameResolver.lookup)."""
+    summary = os.path.join(group_dir, auction_file)
+    if not os.path.exists(summary):
+        sold = pd.read_csv(os.path.join(group_dir, SOLD_FILE), dtype=str)
+        rosters = {}
+        for player, winner in zip(sold['Player'], sold['Winner']):
+            rosters.setdefault(winner.strip(), []).append(player)
+        return dict(sorted(rosters.items())), {}
+    df = pd.read_csv(summary, dtype=str, keep_default_na=False)
+    df.columns = [c.strip() for c in df.columns]
+    teams = df.iloc[0].to_dict() if team_row else {}
+    players = df.iloc[1:] if team_row else df
+    return {mgr: [p for p in players[mgr] if p.strip()] for mgr in df.columns}, teams
+
+
+class OwnershipIndex:
+    def __init__(self, players, points=None, resolver=None):
+        """players: the canonical player names (an mvp table's Player column, or a PlayerRegistry);
+        points: their Pts."""
+        if isinstance(players, PlayerRegistry):
+            players = players.names
+        names = normalize_name(pd.Series(list(players), dtype=object))
+        first = ~names.duplicated().to_numpy()
+        self._names = names[first].tolist()
+        self._ids = {name: i for i, name in enumerate(self._names)}
+        pts = np.zeros(len(names)) if points is None else pd.to_numeric(pd.Series(list(points)), errors='coerce')
+        self._points = list(np.nan_to_num(np.asarray(pts, dtype=np.float64))[first])
+        self.resolver = resolver
+        self.groups = []
+        self.managers = {}
+        self.rosters = {}
+        self._owners = {}
+        self.unmatched = {}
+
+    # ---------- building ----------
+
+    def player_id(self, name, add=False):
+        """Id of a roster/auction spelling: exact name, then the resolver's lookup (as in
+        ScoringEngine); None if unknown."""
+        key = str(name).lower().strip()
+        if key in self._ids:
+            return self._ids[key]
+        if self.resolver is not None:
+            player, _ = self.resolver.lookup(key)
+            if player is not None and player in self._ids:
+                return self._ids[player]
+        if not add:
+            return None
+        # Rostered but not in the points table (yet): still owned, with no points
+        self._ids[key] = len(self._names)
+        self._names.append(key)
+        self._points.append(0.0)
+        return self._ids[key]
+
+    def add_group(self, group, rosters):
+        self.groups.append(group)
+        self.managers[group] = list(rosters)
+        self.rosters[group] = {}
+        owned = {}
+        for m, (mgr, names) in enumerate(rosters.items()):
+            ids = [self.player_id(name, add=True) for name in names]
+            self.rosters[group][mgr] = np.array(ids, dtype=np.int64)
+            for i in ids:
+                owned[i] = m
+        self._owners[group] = owned
+
+    def finalize(self):
+        """Freezes the index into arrays once every group is in."""
+        self.names = np.array(self._names, dtype=object)
+        self.points = np.array(self._points, dtype=np.float64)
+        self.owners = {}
+        self.owned_groups = np.zeros(len(self.names), dtype=np.int64)
+        # Best scorer first (stable, so equal points keep the points table's order)
+        by_points = np.argsort(-self.points, kind='stable')
+        self.undrafted = {}
+        for group in self.groups:
+            owner = np.full(len(self.names), -1, dtype=np.int64)
+            owned = self._owners[group]
+            owner[list(owned)] = list(owned.values())
+            self.owners[group] = owner
+            self.owned_groups += owner >= 0
+            self.undrafted[group] = by_points[owner[by_points] < 0]
+        self._by_points = by_points
+        return self
+
+    @classmethod
+    def from_groups(cls, tournament_dir, players, points, groups=None, resolver=None):
+        index = cls(players, points, resolver)
+        for group in groups or discover_groups(tournament_dir):
+            index.add_group(group, group_rosters(os.path.join(tournament_dir, group))[0])
+        return index.finalize()
+
+    # ---------- queries ----------
+
+    def owner(self, group, player):
+        """The manager owning `player` in `group`, None if undrafted there (or unknown)."""
+        i = self.player_id(player)
+        if i is None or self.owners[group][i] < 0:
+            return None
+        return self.managers[group][self.owners[group][i]]
+
+    def roster(self, group, manager):
+        return self.names[self.rosters[group][manager]].tolist()
+
+    def ownership_pct(self, player):
+        i = self.player_id(player)
+        return 0.0 if i is None else 100.0 * self.owned_groups[i] / len(self.groups)
+
+    def top_undrafted(self, group, n=10):
+        ids = self.undrafted[group][:n]
+        return pd.DataFrame({'Player': self.names[ids], 'Points': self.points[ids]})
+
+    # ---------- reports ----------
+
+    def owned_table(self, group):
+        """Every owned player of the group, best scorer first: Player, Manager, Points."""
+        owner = self.owners[group]
+        ids = self._by_points[owner[self._by_points] >= 0]
+        managers = np.array(self.managers[group], dtype=object)
+        return pd.DataFrame({'Player': [display_name(n) for n in self.names[ids]],
+                             'Manager': managers[owner[ids]], 'Points': self.points[ids]})
+
+    def squads(self, group):
+        """[(manager, {'Player': [...], 'Points': [...]})] for every manager of the group, in roster order."""
+        squads = []
+        for mgr in self.managers[group]:
+            ids = self.rosters[group][mgr]
+            squads.append((mgr, {'Player': [display_name(n) for n in self.names[ids]],
+                                 'Points': self.points[ids].astype(int).tolist()}))
+        return squads
+
+    def tournament_table(self):
+        """Every player owned anywhere: Player, Points, Owned % and the owner in each group."""
+        ids = self._by_points[self.owned_groups[self._by_points] > 0]
+        table = pd.DataFrame({'Player': [display_name(n) for n in self.names[ids]], 'Points': self.points[ids],
+                              'Owned %': np.round(100.0 * self.owned_groups[ids] / len(self.groups), 1)})
+        for group in self.groups:
+            managers = np.array(self.managers[group] + [''], dtype=object)
+            table[group] = managers[self.owners[group][ids]]
+        return table
+
+    def write_reports(self, tournament_dir='.', site=None):
+        """The CSV reports, plus the squads_live.md and ownership.html pages through `site` (a
+        fantasy.site.Site over the tournament directory), which skips pages whose data hasn't changed."""
+        site = site or Site(tournament_dir)
+        for group in self.groups:
+            group_dir = os.path.join(tournament_dir, group)
+            owned = self.owned_table(group)
+            write_csv(owned, os.path.join(group_dir, 'player_ownership.csv'), index=False)
+            write_csv(owned, os.path.join(group_dir, 'player_ownership_web.csv'), index=False)
+            live = owned.assign(Manager=owned['Manager'].str.upper(), Points=owned['Points'].astype(int))
+            write_csv(live, os.path.join(group_dir, 'squads_live.csv'), index=False)
+            site.page(f'{group}/squads_live.md', 'squads_live.md', group=group, squads=self.squads(group))
+            site.page(f'{group}/ownership.html', 'ownership.html', group=group, rows=live.to_dict('records'))
+        write_csv(self.tournament_table(), os.path.join(tournament_dir, 'data', 'ownership.csv'), index=False)
+
+
+def display_name(name):
+    return str(name).title()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ownership reports for every group of a tournament')
+    parser.add_argument('groups', nargs='*', help='default: every group_* directory')
+    parser.add_argument('--day', type=int, help='mvp day to take points from (default: the latest)')
+    parser.add_argument('--top', type=int, default=10, help='undrafted scorers to list per group')
+    args = parser.parse_args()
+
+    from fantasy.season_store import import_archive
+
+    season = import_archive('./data')
+    day_num, points = season.day_points(args.day if args.day is not None else int(season.days()[-1]))
+    resolver = NameResolver.from_sources([season.players()], players_csv='./data/players.csv',
+                                         alias_path='./data/player_aliases.csv')
+    index = OwnershipIndex.from_groups('.', season.registry, points, args.groups, resolver)
+    index.write_reports('.')
+    resolver.save()
+    for group in index.groups:
+        print(f'{group}: day_{day_num}, {len(index.owned_table(group))} players owned; best undrafted:')
+        print(index.top_undrafted(group, args.top).to_markdown(index=False))
@@ -0,0 +1,100 @@
+import asyncio
+
+import pandas as pd
+
+from fantasy.sources import USER_AGENT, Page, rebase
+
+# Lists that the site serves a page at a time (and the browser pulls in with a "load more"
+# button) are fetched by asking page 1 how many pages there are and then requesting the rest
+# concurrently over a bounded httpx connection pool. Every page is parsed as soon as it arrives,
+# so the fetch takes about as long as the slowest page rather than the sum of all of them.
+
+CONCURRENCY = 8
+ATTEMPTS = 3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class PaginatedPage(Page):
+    """A Page whose table is split over page_url(1..n); page_count(first_page_html) gives n
+    (or None when it can't tell, in which case the next source gets a go)."""
+
+    def __init__(self, name, url, marker, page_url, page_count, **kwargs):
+        super().__init__(name, url, marker, **kwargs)
+        self.page_url = page_url
+        self.page_count = page_count
+
+
+class OrderedMerge:
+    """Collects pages in whatever order they arrive and releases rows in page order."""
+
+    def __init__(self):
+        self.frames = []
+        self._pending = {}
+        self._next = 1
+
+    def add(self, n, frame):
+        self._pending[n] = frame
+        while self._next in self._pending:
+            frame = self._pending.pop(self._next)
+            if frame is not None:
+                self.frames.append(frame)
+            self._next += 1
+
+    def frame(self):
+        if self._pending:
+            raise ValueError(f'pages {sorted(self._pending)} arrived but page {self._next} never did')
+        return pd.concat(self.frames, ignore_index=True) if self.frames else None
+
+
+async def _get(client, url):
+    import httpx
+
+    for attempt in range(1, ATTEMPTS + 1):
+        try:
+            response = await client.get(url)
+        except httpx.TransportError:
+            if attempt == ATTEMPTS:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == ATTEMPTS:
+                response.raise_for_status()
+                return response.text
+        await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+
+
+async def fetch_pages(page, base_url=None, concurrency=CONCURRENCY, timeout=30):
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout, headers={'User-Agent': USER_AGENT},
+                                 follow_redirects=True) as client:
+        first = await _get(client, rebase(page.page_url(1), base_url))
+        n_pages = page.page_count(first)
+        if n_pages is None:
+            return None
+        merge = OrderedMerge()
+        merge.add(1, page.parse_table(first))
+
+        async def fetch_and_parse(n):
+            return n, page.parse_table(await _get(client, rebase(page.page_url(n), base_url)))
+
+        for done in asyncio.as_completed([fetch_and_parse(n) for n in range(2, n_pages + 1)]):
+            n, frame = await done
+            merge.add(n, frame)
+        return merge.frame()
+
+
+class PaginatedHttpSource:
+    name = 'paginated'
+
+    def __init__(self, base_url=None, concurrency=CONCURRENCY):
+        self.base_url = base_url
+        self.concurrency = concurrency
+
+    def fetch_table(self, page):
+        if not isinstance(page, PaginatedPage):
+            return None
+        return asyncio.run(fetch_pages(page, self.base_url, self.concurrency))
+
+    def close(self):
+        pass
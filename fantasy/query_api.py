@@ -0,0 +1,298 @@
+import argparse
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import numpy as np
+
+from fantasy.batch import discover_groups
+from fantasy.league import TOP_K, Standings, competition_ranks, league_mode
+from fantasy.names import NameResolver
+from fantasy.ownership import OwnershipIndex, group_rosters, display_name
+from fantasy.replay import LAYOUTS
+from fantasy.results_store import ResultsStore
+from fantasy.season_store import SeasonStore
+
+# A read-only JSON API over a tournament's stores, for anyone who wants a leaderboard, a manager's
+# history or a player's owner without opening the group CSVs or a notebook. One process keeps
+# everything resident - the season store's players x days points, every group's managers x days
+# totals and the ownership index - and answers from memory:
+#   GET /                                           groups, days and when the data was loaded
+#   GET /groups/{group}/leaderboard[?day=N&k=K]     the table on day N (the latest day on or before it)
+#   GET /groups/{group}/managers/{manager}          total and rank every day, and the squad
+#   GET /players/{player}                           cumulative points on each day the table changed, and
+#                                                   each group's owner
+#   GET /groups/{group}/owner/{player}              who owns a player in a group
+#   GET /groups/{group}/undrafted[?n=10]            the best unowned scorers
+# Rendered responses are kept in an LRU cache, and every response carries the data's version as
+# its ETag, so a client that already has it gets a 304. The stores are only loaded again when
+# their files change (a new snapshot or results day, an edited roster); that is checked at most
+# every --check seconds, with a stat per file, and the reload happens on one thread while the
+# others keep answering from the previous load. Requests are served from a thread each.
+#   python -m fantasy.query_api                     from the tournament directory
+#   python -m fantasy serve --tournament ipl2025 --port 8767      from the repository root
+
+PORT = 8767
+CHECK_INTERVAL = 5.0
+CACHE_SIZE = 1024
+UNDRAFTED_N = 10
+
+
+def watched_files(tournament_dir, tournament, groups):
+    """The files a load reads; when any of them changes the API reloads."""
+    data = os.path.join(tournament_dir, 'data')
+    files = [os.path.join(data, 'season', name) for name in ('players.rec', 'points.idx')]
+    files += [os.path.join(data, 'players.csv'), os.path.join(data, 'player_aliases.csv')]
+    for group in groups:
+        group_dir = os.path.join(tournament_dir, group)
+        files += [os.path.join(group_dir, LAYOUTS[tournament][0]),
+                  os.path.join(group_dir, 'results', 'managers.rec'), os.path.join(group_dir, 'results', 'totals.idx')]
+    return files
+
+
+def version(files):
+    """Short hash of the files' sizes and modification times (missing files count too)."""
+    h = hashlib.sha1()
+    for path in files:
+        try:
+            st = os.stat(path)
+            h.update(f'{path}:{st.st_size}:{st.st_mtime_ns}\n'.encode())
+        except FileNotFoundError:
+            h.update(f'{path}:-\n'.encode())
+    return h.hexdigest()[:16]
+
+
+def _values(array):
+    """Floats for JSON, None where there is no value."""
+    return [None if np.isnan(v) else round(float(v), 2) for v in array]
+
+
+def _records(df):
+    return [{k: (v.item() if isinstance(v, np.generic) else v) for k, v in row.items()}
+            for row in df.to_dict(orient='records')]
+
+
+class TournamentData:
+    """One load of the stores, and the responses rendered from it (LRU-cached per load)."""
+
+    def __init__(self, tournament_dir, tournament, groups, version):
+        auction_file, team_row = LAYOUTS[tournament][:2]
+        data = os.path.join(tournament_dir, 'data')
+        self.tournament = tournament
+        self.groups = list(groups)
+        self.version = version
+        self.loaded = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        season = SeasonStore(os.path.join(data, 'season'))
+        self.registry = season.registry
+        self.days, self.points = season.points()
+        latest = np.nan_to_num(self.points[:, -1]) if len(self.days) else np.zeros(len(self.registry))
+        # Roster names are matched the way the scoring scripts match them; nothing is written back
+        resolver = NameResolver.from_sources([season.players()], players_csv=os.path.join(data, 'players.csv'),
+                                             alias_path=os.path.join(data, 'player_aliases.csv'))
+        self.ownership = OwnershipIndex(self.registry, latest, resolver)
+        self.totals = {}
+        for group in self.groups:
+            group_dir = os.path.join(tournament_dir, group)
+            rosters, _ = group_rosters(group_dir, auction_file, team_row)
+            self.ownership.add_group(group, rosters)
+            self.totals[group] = ResultsStore(os.path.join(group_dir, 'results')).totals()
+        self.ownership.finalize()
+        self.respond = functools.lru_cache(maxsize=CACHE_SIZE)(self._respond)
+
+    # ---------- queries ----------
+
+    def index(self):
+        days = [int(self.days[0]), int(self.days[-1])] if len(self.days) else []
+        return {'tournament': self.tournament, 'groups': self.groups, 'days': days,
+                'players': len(self.registry), 'version': self.version, 'loaded': self.loaded}
+
+    def group_totals(self, group):
+        if group not in self.totals:
+            raise KeyError(f'no group {group!r}')
+        return self.totals[group]
+
+    def standings(self, group, day_num=None):
+        """Standings on the latest results day on or before day_num (default: the latest)."""
+        totals = self.group_totals(group)
+        days = totals.columns.to_numpy()
+        j = len(days) - 1 if day_num is None else int(np.searchsorted(days, day_num, side='right')) - 1
+        if j < 0:
+            raise KeyError(f'{group} has no results on or before day_{day_num}')
+        prev = totals.iloc[:, j - 1].to_numpy() if j > 0 else None
+        return Standings(totals.index, totals.iloc[:, j].to_numpy(), prev, int(days[j]))
+
+    def leaderboard(self, group, day_num=None, k=None):
+        standings = self.standings(group, day_num)
+        if k is None:
+            k = TOP_K if league_mode(len(standings)) else len(standings)
+        return {'group': group, 'day': standings.day_num, 'managers': len(standings),
+                'rows': _records(standings.top(k))}
+
+    def manager(self, group, manager):
+        totals = self.group_totals(group)
+        if manager not in totals.index:
+            raise KeyError(f'no manager {manager!r} in {group}')
+        i = totals.index.get_loc(manager)
+        ranks = [int(competition_ranks(totals[day].to_numpy())[0][i]) for day in totals.columns]
+        squad = self.ownership.rosters[group].get(manager, np.empty(0, dtype=np.int64))
+        return {'group': group, 'manager': manager, 'days': totals.columns.tolist(),
+                'totals': _values(totals.iloc[i].to_numpy()), 'ranks': [r or None for r in ranks],
+                'squad': [{'Player': display_name(self.ownership.names[p]), 'Points': float(self.ownership.points[p])}
+                          for p in squad]}
+
+    def player_id(self, player):
+        i = self.ownership.player_id(player)
+        if i is None:
+            raise KeyError(f'no player {player!r}')
+        return i
+
+    def player(self, player):
+        i = self.player_id(player)
+        known = i < len(self.registry)
+        meta = self.registry.frame().iloc[i] if known else None
+        points = self.points[i] if known else np.full(len(self.days), np.nan)
+        owners = {group: self.owner(group, player)['owner'] for group in self.groups}
+        return {'player': display_name(self.ownership.names[i]),
+                'team': meta['Team'] if known else None, 'position': meta['Position'] if known else None,
+                'days': self.days.tolist(), 'points': _values(points), 'owners': owners}
+
+    def owner(self, group, player):
+        self.group_totals(group)
+        i = self.player_id(player)
+        owner = self.ownership.owners[group][i]
+        return {'group': group, 'player': display_name(self.ownership.names[i]),
+                'owner': self.ownership.managers[group][owner] if owner >= 0 else None}
+
+    def undrafted(self, group, n=UNDRAFTED_N):
+        self.group_totals(group)
+        top = self.ownership.top_undrafted(group, n)
+        return {'group': group, 'rows': [{'Player': display_name(p), 'Points': float(pts)}
+                                         for p, pts in zip(top['Player'], top['Points'])]}
+
+    # ---------- routing ----------
+
+    def route(self, path, query):
+        parts = [unquote(p) for p in path.split('/') if p]
+        query = dict(query)
+        if not parts:
+            return self.index()
+        if parts[0] == 'players' and len(parts) == 2:
+            return self.player(parts[1])
+        if parts[0] == 'groups' and len(parts) >= 3:
+            group, view = parts[1], parts[2]
+            if view == 'leaderboard' and len(parts) == 3:
+                day = int(query['day']) if 'day' in query else None
+                return self.leaderboard(group, day, int(query['k']) if 'k' in query else None)
+            if view == 'managers' and len(parts) == 4:
+                return self.manager(group, parts[3])
+            if view == 'owner' and len(parts) == 4:
+                return self.owner(group, parts[3])
+            if view == 'undrafted' and len(parts) == 3:
+                return self.undrafted(group, int(query.get('n', UNDRAFTED_N)))
+        raise LookupError(f'nothing at {path}')
+
+    def _respond(self, path, query):
+        """(status, JSON bytes) for a path and its sorted query pairs."""
+        try:
+            status, body = 200, self.route(path, query)
+        except LookupError as e:
+            status, body = 404, {'error': e.args[0] if e.args else str(e)}
+        except ValueError as e:
+            status, body = 400, {'error': str(e)}
+        return status, json.dumps(body).encode()
+
+
+class QueryService:
+    """The current TournamentData, reloaded when the files it was loaded from change."""
+
+    def __init__(self, tournament_dir='.', tournament=None, groups=None, check_interval=CHECK_INTERVAL):
+        self.tournament_dir = tournament_dir
+        self.tournament = tournament
+        self.group_names = groups
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._checked = 0.0
+        self._data = None
+        self.reload()
+
+    def groups(self):
+        return self.group_names or discover_groups(self.tournament_dir)
+
+    def reload(self, force=True):
+        """Loads the stores again if their files changed (or if force). True if it did."""
+        groups = self.groups()
+        current = version(watched_files(self.tournament_dir, self.tournament, groups))
+        if not force and self._data is not None and self._data.version == current:
+            return False
+        self._data = TournamentData(self.tournament_dir, self.tournament, groups, current)
+        self.reloads += 1
+        return True
+
+    def data(self):
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval and self._lock.acquire(blocking=False):
+            # One thread checks (and reloads); the rest answer from the data they already have
+            try:
+                self._checked = now
+                self.reload(force=False)
+            finally:
+                self._lock.release()
+        return self._data
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        data = self.service.data()
+        etag = f'"{data.version}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        status, body = data.respond(url.path, tuple(sorted(parse_qsl(url.query))))
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 200:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(service, host='127.0.0.1', port=PORT):
+    """Start the API on a background thread; returns (server, base_url)."""
+    handler = type('Handler', (QueryHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+if __name__ == '__main__':
+    here = os.path.basename(os.path.abspath('.'))
+    parser = argparse.ArgumentParser(description="Serve the tournament's leaderboards, histories and ownership as JSON")
+    parser.add_argument('groups', nargs='*', help='default: every group_* directory')
+    parser.add_argument('--tournament', choices=sorted(LAYOUTS), default=here if here in LAYOUTS else None,
+                        help='default: the tournament directory this is run from')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--check', type=float, default=CHECK_INTERVAL, help='seconds between checks for new data')
+    args = parser.parse_args()
+    if args.tournament is None:
+        parser.error('--tournament is required outside a tournament directory')
+
+    server, base_url = serve(QueryService('.', args.tournament, args.groups, args.check), args.host, args.port)
+    print(f'Serving {args.tournament} at {base_url}/')
+    threading.Event().wait()
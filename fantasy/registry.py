@@ -0,0 +1,114 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Every player the season has seen, with a stable integer id: the record number in
+# ./data/season/players.rec, a file of fixed-width (name, short name, team, position) records that
+# only ever grows. Loading it is one np.fromfile, and in memory the registry is a unique name index
+# plus short names, with team and position as categoricals.
+# Names are normalized (lowercased, stripped) once, when a player is first registered. After that,
+# snapshots (the season store's points rows), rosters (ScoringEngine), and ownership
+# (OwnershipIndex) all address players by id:
+#   registry.ids(names)           names -> ids (-1 for unknown), one vectorized lookup
+#   registry.names[ids]           ids -> names, for reports
+#   registry.points(mvp_df)       a snapshot's Pts as a vector indexed by id
+#   python -m fantasy.registry ./data/season      size and makeup of a registry
+
+PLAYER_DTYPE = np.dtype([('name', '<U48'), ('short_name', '<U32'), ('team', '<U32'), ('position', '<U16')])
+META_COLUMNS = ['Player Short Name', 'Team', 'Position']
+
+
+def normalize_name(names):
+    return names.astype(str).str.lower().str.strip()
+
+
+class _KeyTable:
+    """Append-only fixed-width records; the record number is the id."""
+
+    def __init__(self, path, dtype):
+        self.path = path
+        self.dtype = dtype
+
+    def records(self):
+        if not os.path.exists(self.path):
+            return np.empty(0, dtype=self.dtype)
+        return np.fromfile(self.path, dtype=self.dtype)
+
+    def ensure(self, records):
+        """Ids for `records` (matched on the first field), appending the unseen ones."""
+        existing = self.records()
+        key = self.dtype.names[0]
+        ids = {k: i for i, k in enumerate(existing[key].tolist())}
+        new = [r for r in records if r[0] not in ids]
+        new = list({r[0]: r for r in new}.values())
+        if new:
+            for i, r in enumerate(new):
+                ids[r[0]] = len(existing) + i
+            with open(self.path, 'ab') as f:
+                np.array(new, dtype=self.dtype).tofile(f)
+        return np.array([ids[r[0]] for r in records], dtype=np.int64), len(ids)
+
+
+class PlayerRegistry:
+
+    def __init__(self, path='./data/season/players.rec'):
+        self.path = path
+        self._table = _KeyTable(path, PLAYER_DTYPE)
+        self._frame = None
+
+    def frame(self):
+        """Player, Player Short Name, Team, Position, one row per id."""
+        if self._frame is None:
+            records = self._table.records()
+            self._frame = pd.DataFrame({'Player': records['name'].astype(object),
+                                        'Player Short Name': records['short_name'].astype(object),
+                                        'Team': pd.Categorical(records['team']),
+                                        'Position': pd.Categorical(records['position'])})
+            self._names = pd.Index(self._frame['Player'])
+        return self._frame
+
+    @property
+    def names(self):
+        self.frame()
+        return self._names
+
+    def __len__(self):
+        return len(self.frame())
+
+    def ids(self, names):
+        """Id of each name (-1 where it isn't registered)."""
+        return self.names.get_indexer(normalize_name(pd.Series(list(names), dtype=object)))
+
+    def add(self, snapshot):
+        """Registers a snapshot's new players (Player plus whichever of META_COLUMNS it has).
+
+        Returns (ids, rows): the snapshot's rows with names normalized and repeats dropped, and their ids."""
+        rows = snapshot.assign(Player=normalize_name(snapshot['Player'])).drop_duplicates('Player')
+        meta = pd.DataFrame({'Player': rows['Player']})
+        for col in META_COLUMNS:
+            meta[col] = rows[col].fillna('').astype(str) if col in rows else ''
+        before = len(self)
+        ids, n_players = self._table.ensure(list(meta.itertuples(index=False, name=None)))
+        if n_players != before:
+            self._frame = None
+        return ids, rows
+
+    def points(self, snapshot, column='Pts'):
+        """A snapshot's `column` as a vector indexed by player id (NaN where a player isn't listed).
+        Players not registered yet are left out."""
+        rows = snapshot.assign(Player=normalize_name(snapshot['Player'])).drop_duplicates('Player')
+        ids = self.names.get_indexer(rows['Player'])
+        out = np.full(len(self), np.nan)
+        known = ids >= 0
+        out[ids[known]] = pd.to_numeric(rows[column], errors='coerce').to_numpy()[known]
+        return out
+
+
+if __name__ == '__main__':
+    # python -m fantasy.registry ./data/season
+    registry = PlayerRegistry(os.path.join(sys.argv[1] if len(sys.argv) > 1 else './data/season', 'players.rec'))
+    players = registry.frame()
+    print(f'{registry.path}: {len(players)} players, {players["Team"].nunique()} teams, '
+          f'{players["Position"].nunique()} positions, {players.memory_usage(deep=True).sum() / 1024:.0f} KB in memory')
@@ -0,0 +1,116 @@
+import json
+import math
+import os
+
+import matplotlib
+
+# Charts are only ever written to files, never shown
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+from fantasy import instrument  # noqa: E402
+from fantasy.atomic import atomic_path, write_text  # noqa: E402
+from fantasy.checkpoint import fingerprint  # noqa: E402,F401
+
+# Each group directory keeps a .render_cache/ with a manifest of what every chart was last drawn
+# from (chart file -> hash of its input data) plus the rendered frames of the animated charts,
+# one PNG per frame named by the hash of what that frame shows. A chart whose data hash hasn't
+# changed is not redrawn, and an animation only draws the frames it doesn't have yet.
+
+CACHE_DIR = '.render_cache'
+
+
+class RenderCache:
+    def __init__(self, directory):
+        self.path = os.path.join(directory, CACHE_DIR)
+        self.frames_dir = os.path.join(self.path, 'frames')
+        self.manifest_path = os.path.join(self.path, 'manifest.json')
+        os.makedirs(self.frames_dir, exist_ok=True)
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+
+    def fresh(self, path, key):
+        return os.path.exists(path) and self.manifest.get(os.path.basename(path)) == key
+
+    def mark(self, path, key):
+        self.manifest[os.path.basename(path)] = key
+        write_text(self.manifest_path, json.dumps(self.manifest, indent=1, sort_keys=True))
+
+    def render(self, path, key, draw):
+        """draw(path) writes the chart unless it was last drawn from the same data. True if drawn."""
+        if self.fresh(path, key):
+            print(f'{path} unchanged, not redrawn')
+            return False
+        with instrument.span(f'draw {os.path.basename(path)}'):
+            draw(path)
+        self.mark(path, key)
+        return True
+
+    def frame_path(self, chart, key):
+        return os.path.join(self.frames_dir, f'{os.path.basename(chart)}-{key}.png')
+
+    def prune_frames(self, chart, keep):
+        """Drops the chart's cached frames that are no longer in it."""
+        prefix = f'{os.path.basename(chart)}-'
+        keep = {os.path.basename(self.frame_path(chart, key)) for key in keep}
+        for name in os.listdir(self.frames_dir):
+            if name.startswith(prefix) and name not in keep:
+                os.unlink(os.path.join(self.frames_dir, name))
+
+
+def nice_limit(value, steps_per_decade=2):
+    """Rounds up to 1/2/5-ish steps so an axis limit only moves now and then as data grows."""
+    if value <= 0:
+        return 1
+    step = 10 ** math.floor(math.log10(value)) / steps_per_decade
+    return math.ceil(value / step) * step
+
+
+def progression_gif(cache, path, series, title, interval=400):
+    """Animated line race, frame i showing every series up to day i ({label: [total per day]}).
+
+    Axis limits are rounded up with nice_limit, so adding a day normally leaves the earlier
+    frames exactly as they were and only the new one gets drawn.
+    """
+    from PIL import Image
+
+    labels = list(series)
+    n_frames = max(len(v) for v in series.values())
+    x_max = max(10, math.ceil((n_frames - 1) / 10) * 10)
+    y_max = nice_limit(max(max(v) for v in series.values()) * 1.1)
+    keys = [fingerprint(title, labels, x_max, y_max, [list(series[lb][:i + 1]) for lb in labels])
+            for i in range(n_frames)]
+    gif_key = fingerprint(interval, keys)
+    if cache.fresh(path, gif_key):
+        print(f'{path} unchanged, not redrawn')
+        return False
+
+    missing = [i for i, key in enumerate(keys) if not os.path.exists(cache.frame_path(path, key))]
+    if missing:
+        # One figure for every new frame; only the line data changes between them
+        with instrument.span('draw frames') as span, plt.style.context('dark_background'):
+            span.rows = len(missing)
+            fig, ax = plt.subplots(figsize=(10, 5))
+            lines = [ax.plot([], [], lw=3, marker='o', label=lb)[0] for lb in labels]
+            ax.set_xlim(0, x_max)
+            ax.set_ylim(0, y_max)
+            ax.set_title(title, fontsize=14, color='#00d4ff')
+            ax.legend(loc='center left', bbox_to_anchor=(1, 0.5))
+            for i in missing:
+                for line, lb in zip(lines, labels):
+                    line.set_data(range(min(i + 1, len(series[lb]))), series[lb][:i + 1])
+                with atomic_path(cache.frame_path(path, keys[i])) as tmp:
+                    fig.savefig(tmp, format='png', facecolor=fig.get_facecolor())
+            plt.close(fig)
+    print(f'{path}: {len(missing)} of {n_frames} frames drawn')
+
+    with instrument.span('encode gif') as span:
+        span.rows = n_frames
+        frames = [Image.open(cache.frame_path(path, key)).convert('RGB') for key in keys]
+        with atomic_path(path) as tmp:
+            frames[0].save(tmp, format='GIF', save_all=True, append_images=frames[1:], duration=interval, loop=0)
+    cache.prune_frames(path, keys)
+    cache.mark(path, gif_key)
+    return True
@@ -0,0 +1,142 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from fantasy import instrument
+from fantasy.batch import discover_groups
+from fantasy.history import COLUMNS, PointsHistory
+from fantasy.names import NameResolver
+from fantasy.ownership import group_rosters
+from fantasy.results_store import migrate_results
+from fantasy.scoring import ScoringEngine
+from fantasy.season_store import import_archive, on_grid
+
+# Season replay: rebuilds every group's points history, results and leaderboard for a range of days
+# from the archived snapshots (data/snapshots/, via the season store)
+# and the rosters as they are now - after fixing a roster typo, or when a day was never fetched or
+# scored. Every day of the range is scored at once (ownership matrix x players x days), and each
+# store gets one bulk write:
+#   ./{group}/points_history.csv + {manager}.csv    the range's rows replaced, wide tables re-exported
+#   ./{group}/results/                              one row per day appended (later rows win)
+#   ./{group}/{leaderboard file}                    as of the last day of the range
+# The days run to the last day of either table, like the daily run's. A day with no snapshot of
+# its own (its table didn't change, the fetcher failed, or the day count skipped it) gets the
+# latest snapshot before it, so totals carry forward over gaps.
+#   python -m fantasy.replay                                 every group, every archived day
+#   python -m fantasy.replay --start 10 --stop 40 group_1    from the tournament directory
+#   python -m fantasy replay --tournament ipl2025 --start 10 from the repository root
+
+# tournament directory -> (auction summary, first row is each manager's team, results file prefix,
+# leaderboard file)
+LAYOUTS = {
+    'ipl2025': ('IPL2025MockAuctionSummary.csv', True, 'ipl2025_results', 'ipl_leaderboard.txt'),
+    't20_wc_2026': ('AuctionSummary.csv', False, 't20_wc_2026_results', 't20_wc_2026_leaderboard.txt'),
+}
+
+
+class Season:
+    """The archive on a day grid: players x days points and teams x days wins/no-results."""
+
+    def __init__(self, data_dir='./data', start=None, stop=None):
+        store = import_archive(data_dir)
+        days, points = store.points()
+        if not len(days):
+            raise ValueError(f'no mvp days in {data_dir}')
+        # The grid runs to the last day of either table, as the daily run does: a final day that
+        # only changed the standings is still a day, with the last MVP table carried onto it
+        archived = store.all_days()
+        start = int(days[0]) if start is None else start
+        stop = int(archived[-1]) if stop is None else stop
+        self.grid = np.arange(start, stop + 1, dtype=np.int64)
+        self.gaps = np.setdiff1d(self.grid, archived)
+        self.players = store.players()
+        self.registry = store.registry
+        self.points = on_grid(days, points, self.grid)
+        self.teams = store.teams()
+        self.wins = self.nrs = None
+        standings_days = store.standings_days()
+        if len(standings_days):
+            self.wins, self.nrs = (on_grid(standings_days, store.standings_matrix(col).to_numpy(), self.grid)
+                                   for col in ('W', 'N/R'))
+            self.wins, self.nrs = np.nan_to_num(self.wins), np.nan_to_num(self.nrs)
+        self.resolver = NameResolver.from_sources([self.players], players_csv=os.path.join(data_dir, 'players.csv'),
+                                                  alias_path=os.path.join(data_dir, 'player_aliases.csv'))
+
+
+def history_rows(engine, points, grid):
+    """Every rostered player's points on every grid day as day, manager, player, points rows, day by day."""
+    points = np.nan_to_num(points)
+    frames = []
+    for mgr in engine.managers:
+        ids = engine._roster_ids[mgr]
+        found = ~np.isnan(ids)
+        values = np.zeros((len(ids), len(grid)))
+        values[found] = points[ids[found].astype(np.int64)]
+        names = np.asarray(engine.rosters[mgr], dtype=object)
+        frames.append(pd.DataFrame({'day': np.tile(grid, len(names)), 'manager': mgr,
+                                    'player': np.repeat(names, len(grid)), 'points': values.ravel()}))
+    rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+    return rows.sort_values('day', kind='stable')
+
+
+def replay_group(group_dir, season, layout):
+    auction_file, team_row, prefix, leaderboard = layout
+    rosters, manager_teams = group_rosters(group_dir, auction_file, team_row)
+    with_bonus = team_row and season.wins is not None
+    with instrument.span('score days', group=os.path.basename(group_dir)) as s:
+        engine = ScoringEngine(rosters, season.registry, manager_teams=manager_teams,
+                               teams=season.teams if with_bonus else None, resolver=season.resolver)
+        if with_bonus:
+            totals = engine.totals(season.points, season.wins, season.nrs)
+        else:
+            totals = engine.player_totals(season.points)
+        s.rows = totals.size
+    with instrument.span('history') as s:
+        history = PointsHistory(os.path.join(group_dir, 'points_history.csv'))
+        rows = history_rows(engine, season.points, season.grid)
+        history.replace_days(season.grid, rows)
+        history.export_wide(group_dir, engine.managers)
+        s.rows = len(rows)
+    with instrument.span('results store') as s:
+        # Any old {prefix}_day_N.csv files are folded in first, so days outside the range survive
+        results = migrate_results(group_dir, prefix, managers=engine.managers)
+        results.append_days(season.grid, engine.managers, totals.round(2))
+        results.write_leaderboard(os.path.join(group_dir, leaderboard), int(season.grid[-1]))
+        s.rows = totals.size
+    return engine
+
+
+def replay(tournament, tournament_dir='.', groups=None, start=None, stop=None):
+    """Rebuilds the groups (default: all) for start..stop (default: the archive's first..last day)."""
+    layout = LAYOUTS[tournament]
+    with instrument.span('season') as s:
+        season = Season(os.path.join(tournament_dir, 'data'), start, stop)
+        s.rows = len(season.grid)
+    engines = {}
+    for group in groups or discover_groups(tournament_dir):
+        engines[group] = replay_group(os.path.join(tournament_dir, group), season, layout)
+    season.resolver.save()
+    return season, engines
+
+
+if __name__ == '__main__':
+    here = os.path.basename(os.path.abspath('.'))
+    parser = argparse.ArgumentParser(description="Rebuild groups' history, results and leaderboards from the archive")
+    parser.add_argument('groups', nargs='*', help='default: every group_* directory')
+    parser.add_argument('--tournament', choices=sorted(LAYOUTS), default=here if here in LAYOUTS else None,
+                        help='default: the tournament directory this is run from')
+    parser.add_argument('--start', type=int, help="first day (default: the archive's first)")
+    parser.add_argument('--stop', type=int, help="last day (default: the archive's last)")
+    args = parser.parse_args()
+    if args.tournament is None:
+        parser.error('--tournament is required outside a tournament directory')
+
+    season, engines = replay(args.tournament, '.', args.groups, args.start, args.stop)
+    print(f'Replayed day_{season.grid[0]}..day_{season.grid[-1]} for {", ".join(engines)}')
+    if len(season.gaps):
+        print(f'No snapshot for days {", ".join(map(str, season.gaps))}: carried the day before forward')
+    for group, engine in engines.items():
+        for name, suggestion in engine.suggestions.items():
+            print(f'\t{group}: {name} not found, closest match is {suggestion}')
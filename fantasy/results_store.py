@@ -0,0 +1,151 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from fantasy.atomic import save_figure, write_csv, write_text
+from fantasy.season_store import _day_range, _KeyTable, _RaggedLog, day_files
+
+# A group's manager totals live in ./{group}/results/ instead of one {prefix}_results_day_N.csv per
+# day that each repeat the whole season so far:
+#   managers.rec              fixed-width manager names, row number == manager id
+#   totals.f8 / totals.idx    one float64 row per day (total by manager id) + (day, offset, width) index
+# A day is one append, and any day range is a memmap slice. The leaderboard text, the old results
+# CSV layout and the trend chart are views built from it when they are wanted:
+#   python -m fantasy.results_store ./group_1 migrate --prefix ipl2025_results
+#   python -m fantasy.results_store ./group_1 leaderboard [--day N]
+#   python -m fantasy.results_store ./group_1 export results.csv [--day N]
+#   python -m fantasy.results_store ./group_1 chart trend.png [--day N]
+
+MANAGER_DTYPE = np.dtype([('name', '<U64')])
+
+
+class ResultsStore:
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._managers = _KeyTable(os.path.join(path, 'managers.rec'), MANAGER_DTYPE)
+        self._totals = _RaggedLog(os.path.join(path, 'totals'))
+
+    def append(self, day_num, scores):
+        """scores: {manager: total}. Re-appending a day replaces it."""
+        ids, n_managers = self._managers.ensure([(mgr,) for mgr in scores])
+        row = np.full(n_managers, np.nan)
+        row[ids] = list(scores.values())
+        self._totals.append(day_num, row)
+
+    def append_days(self, days, managers, totals):
+        """append() for several days at once; totals is managers x days."""
+        ids, n_managers = self._managers.ensure([(mgr,) for mgr in managers])
+        rows = np.full((len(days), n_managers), np.nan)
+        rows[:, ids] = np.asarray(totals, dtype=np.float64).T
+        self._totals.extend(days, rows)
+
+    def managers(self):
+        return self._managers.records()['name'].tolist()
+
+    def days(self):
+        return np.array(sorted(self._totals.index()), dtype=np.int64)
+
+    def totals(self, start=None, stop=None):
+        """managers x days DataFrame for start <= day <= stop, NaN where a manager had no total."""
+        days = _day_range(self.days(), start, stop)
+        managers = self.managers()
+        return pd.DataFrame(self._totals.matrix(days, len(managers)), index=managers, columns=days)
+
+    def day(self, day_num=None):
+        """One day's totals (the latest day by default)."""
+        if day_num is None:
+            days = self.days()
+            if not len(days):
+                raise KeyError(f'no results in {self.path}')
+            day_num = days[-1]
+        totals = self.totals(day_num, day_num)
+        if totals.shape[1] == 0:
+            raise KeyError(f'day_{day_num} not in results store {self.path}')
+        return totals.iloc[:, 0].dropna()
+
+    # ---------- views ----------
+
+    def leaderboard(self, day_num=None):
+        scores = self.day(day_num).sort_values(ascending=False, kind='stable')
+        return pd.DataFrame({'Manager': scores.index, 'Points': scores.to_numpy()})
+
+    def leaderboard_text(self, day_num=None):
+        day_num = day_num if day_num is not None else int(self.days()[-1])
+        return f'*DAY_{day_num}*\n```\n{self.leaderboard(day_num).to_markdown(index=False)}\n```'
+
+    def results_frame(self, stop=None):
+        """Managers x days up to `stop`, best total first - the old {prefix}_results_day_N.csv layout."""
+        totals = self.totals(stop=stop)
+        return totals.sort_values(by=totals.columns[-1], ascending=False, kind='stable')
+
+    def trend(self, stop=None):
+        """days x managers totals to plot, managers in leaderboard order."""
+        return self.results_frame(stop).T
+
+    def write_leaderboard(self, path, day_num=None):
+        write_text(path, self.leaderboard_text(day_num))
+
+    def export_csv(self, path, stop=None):
+        write_csv(self.results_frame(stop), path, header=False)
+
+
+def save_trend_chart(trend, path):
+    """Line chart of ResultsStore.trend(), one line per manager."""
+    from fantasy.render import plt
+
+    ax = trend.plot.line(marker='o')
+    ax.set_ylabel("Points")
+    plt.legend(bbox_to_anchor=(1.02, 1), loc='upper left', borderaxespad=0)
+    save_figure(ax.figure, path, bbox_inches="tight")
+    plt.close(ax.figure)
+
+
+def migrate_results(group_dir, prefix, store=None, managers=None, remove=False):
+    """Collapses {prefix}_day_N.csv files into the group's results store.
+
+    Every file repeats the season up to its day, so only its last column (day N) is taken. Days the
+    store already has are skipped. `managers` fixes the order managers are first stored in.
+    """
+    store = store or ResultsStore(os.path.join(group_dir, 'results'))
+    files = day_files(group_dir, prefix)
+    have = set(store.days().tolist())
+    if managers is not None and not store.managers():
+        store._managers.ensure([(mgr,) for mgr in managers])
+    for day_num, path in files:
+        if day_num in have:
+            continue
+        df = pd.read_csv(path, header=None, index_col=0)
+        store.append(day_num, df.iloc[:, -1].dropna().to_dict())
+    if remove:
+        for _, path in files:
+            os.unlink(path)
+    return store
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="A group's manager totals store")
+    parser.add_argument('group_dir')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('migrate', help='collapse the {prefix}_day_N.csv results files into the store')
+    p.add_argument('--prefix', required=True, help='e.g. ipl2025_results or t20_wc_2026_results')
+    p.add_argument('--remove', action='store_true', help='delete the results files once imported')
+    for name in ('leaderboard', 'export', 'chart'):
+        p = sub.add_parser(name)
+        if name != 'leaderboard':
+            p.add_argument('out')
+        p.add_argument('--day', type=int)
+    args = parser.parse_args()
+
+    store = ResultsStore(os.path.join(args.group_dir, 'results'))
+    if args.command == 'migrate':
+        migrate_results(args.group_dir, args.prefix, store, remove=args.remove)
+        print(f'{args.group_dir}: {len(store.days())} days, {len(store.managers())} managers')
+    elif args.command == 'leaderboard':
+        print(store.leaderboard_text(args.day))
+    elif args.command == 'export':
+        store.export_csv(args.out, args.day)
+    else:
+        save_trend_chart(store.trend(args.day), args.out)
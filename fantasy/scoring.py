@@ -0,0 +1,182 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from fantasy.registry import PlayerRegistry, normalize_name
+
+WIN_PTS = 50
+NR_PTS = 25
+
+
+class OwnershipMatrix:
+    """Sparse 0/1 rows x cols matrix in CSR form (indptr/indices), e.g. managers x players."""
+
+    def __init__(self, rows, cols, n_rows, n_cols):
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        order = np.lexsort((cols, rows))
+        self.rows = rows[order]
+        self.indices = cols[order]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(self.rows, minlength=n_rows))])
+        self.shape = (n_rows, n_cols)
+
+    def dot(self, values):
+        """self @ values for a (n_cols,) vector or (n_cols, k) matrix; NaN counts as 0."""
+        values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+        out = np.zeros((self.shape[0],) + values.shape[1:])
+        if not len(self.indices):
+            return out
+        counts = np.diff(self.indptr)
+        nonempty = counts > 0
+        out[nonempty] = np.add.reduceat(values[self.indices], self.indptr[:-1][nonempty], axis=0)
+        return out
+
+    def row(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    @property
+    def T(self):
+        if not hasattr(self, '_transpose'):
+            self._transpose = OwnershipMatrix(self.indices, self.rows, self.shape[1], self.shape[0])
+        return self._transpose
+
+    def column_rows(self, ids):
+        """(rows, counts): the row of every nonzero of columns `ids`, column after column, and how
+        many each column has. Costs O(len(ids) x owners)."""
+        t = self.T
+        ids = np.asarray(ids, dtype=np.int64)
+        starts = t.indptr[ids]
+        counts = t.indptr[ids + 1] - starts
+        pos = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return t.indices[pos], counts
+
+    def dot_sparse(self, ids, values):
+        """self @ v for a v that is zero everywhere except at column `ids`. Costs O(len(ids) x owners)."""
+        rows, counts = self.column_rows(ids)
+        out = np.zeros(self.shape[0])
+        np.add.at(out, rows, np.repeat(np.asarray(values, dtype=np.float64), counts))
+        return out
+
+
+class ScoringEngine:
+    """Scores every manager of a group at once.
+
+    rosters maps manager -> player names, players is the player order of the points vectors/matrices
+    that get scored (an mvp snapshot's Player column, or a PlayerRegistry, whose ids are then the
+    engine's player positions, so the season store's points rows score as they are), and for IPL
+    style leagues manager_teams/teams give the standings bonus (W x 50, N/R x 25). Roster names not
+    in `players` go through the optional resolver (fantasy.names.NameResolver).
+    """
+
+    def __init__(self, rosters, players, manager_teams=None, teams=None, resolver=None):
+        self.managers = list(rosters)
+        if isinstance(players, PlayerRegistry):
+            self.players = players.names
+        else:
+            self.players = pd.Index(normalize_name(pd.Series(list(players), dtype=object)))
+        first = ~self.players.duplicated()
+        player_ids = pd.Series(np.arange(len(self.players))[first], index=self.players[first])
+
+        rows, cols = [], []
+        self.rosters, self.missing = {}, {}
+        # roster name -> canonical player for names that only matched through the resolver, and
+        # roster name -> best fuzzy suggestion for names the resolver doesn't know at all (names it
+        # knows that just aren't in the snapshot yet are in neither)
+        self.resolved, self.suggestions = {}, {}
+        self._roster_ids = {}
+        # How many roster names needed the resolver and how long that took, for the run report
+        self.lookup_stats = {'name_lookups': 0, 'name_lookup_s': 0.0}
+        for i, mgr in enumerate(self.managers):
+            names = pd.Series(list(rosters[mgr]), dtype=object).dropna()
+            names = normalize_name(names)
+            names = names[(names != '') & (names != 'nan')].tolist()
+            ids = player_ids.reindex(names)
+            if resolver is not None:
+                t = time.perf_counter()
+                for k in np.flatnonzero(ids.isna().to_numpy()):
+                    self.lookup_stats['name_lookups'] += 1
+                    player, suggestion = resolver.lookup(names[k])
+                    if player is None:
+                        self.suggestions[names[k]] = suggestion
+                    elif player in player_ids.index:
+                        self.resolved[names[k]] = player
+                        ids.iloc[k] = player_ids[player]
+                self.lookup_stats['name_lookup_s'] += time.perf_counter() - t
+            self.rosters[mgr] = names
+            self._roster_ids[mgr] = ids.to_numpy(dtype=np.float64)
+            self.missing[mgr] = [n for n, found in zip(names, ids.notna()) if not found]
+            ids = ids.dropna().astype(np.int64).to_numpy()
+            rows.extend([i] * len(ids))
+            cols.extend(ids)
+        self.ownership = OwnershipMatrix(rows, cols, len(self.managers), len(self.players))
+        # Ids of the players on at least one roster: the only points that can move a total
+        self.owned = np.unique(self.ownership.indices)
+        self._player_ids = player_ids
+
+        self.teams = pd.Index([str(t).strip() for t in (teams if teams is not None else [])])
+        team_ids = pd.Series(np.arange(len(self.teams)), index=self.teams)
+        manager_teams = manager_teams or {}
+        team_of = [team_ids.get(str(manager_teams.get(mgr, '')).strip(), -1) for mgr in self.managers]
+        has_team = np.array(team_of) >= 0
+        self.team_matrix = OwnershipMatrix(np.flatnonzero(has_team), np.array(team_of)[has_team],
+                                           len(self.managers), len(self.teams))
+
+    # ---------- aligning snapshots ----------
+
+    def snapshot_points(self, mvp_df):
+        """Pts of an mvp table aligned to self.players (NaN where the player isn't listed)."""
+        pts = pd.Series(pd.to_numeric(mvp_df['Pts'], errors='coerce').to_numpy(),
+                        index=normalize_name(mvp_df['Player']))
+        return pts[~pts.index.duplicated()].reindex(self.players).to_numpy()
+
+    def standings_results(self, standings_df):
+        """(wins, no-results) of a standings table aligned to self.teams."""
+        tbl = standings_df.assign(Teams=standings_df['Teams'].astype(str).str.strip()).drop_duplicates('Teams')
+        tbl = tbl.set_index('Teams').reindex(self.teams)
+        wins = pd.to_numeric(tbl['W'], errors='coerce').fillna(0).to_numpy()
+        nrs = pd.to_numeric(tbl['N/R'], errors='coerce').fillna(0).to_numpy()
+        return wins, nrs
+
+    # ---------- scoring ----------
+
+    def player_totals(self, points):
+        """Managers' summed player points for a (players,) vector or (players, days) matrix."""
+        return self.ownership.dot(points)
+
+    def team_bonus(self, wins, nrs):
+        """Managers' standings bonus for (teams,) or (teams, days) wins/no-results."""
+        return self.team_matrix.dot(np.asarray(wins, dtype=np.float64) * WIN_PTS
+                                    + np.asarray(nrs, dtype=np.float64) * NR_PTS)
+
+    def totals(self, points, wins=None, nrs=None):
+        totals = self.player_totals(points)
+        if wins is not None:
+            totals = totals + self.team_bonus(wins, nrs)
+        return totals
+
+    def score(self, mvp_df, standings_df=None):
+        """One day's totals as a Series indexed by manager."""
+        wins, nrs = self.standings_results(standings_df) if standings_df is not None else (None, None)
+        return pd.Series(self.totals(self.snapshot_points(mvp_df), wins, nrs), index=self.managers)
+
+    def score_days(self, points, days, wins=None, nrs=None):
+        """managers x days totals from players x days points (and teams x days wins/no-results)."""
+        return pd.DataFrame(self.totals(points, wins, nrs), index=self.managers, columns=list(days))
+
+    def roster_players(self, mgr):
+        """Canonical player name for each of mgr's roster entries ('' where unmatched)."""
+        return [self.players[int(i)] if not np.isnan(i) else '' for i in self._roster_ids[mgr]]
+
+    def roster_points(self, points, managers=None):
+        """manager -> {player: points} for one day, 0.0 for players missing from the snapshot, for
+        every manager or just `managers`."""
+        points = np.asarray(points, dtype=np.float64)
+        out = {}
+        for mgr in self.managers if managers is None else managers:
+            ids = self._roster_ids[mgr]
+            found = ~np.isnan(ids)
+            values = np.zeros(len(ids))
+            values[found] = np.nan_to_num(points[ids[found].astype(np.int64)])
+            out[mgr] = dict(zip(self.rosters[mgr], values.tolist()))
+        return out
@@ -0,0 +1,214 @@
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from fantasy.registry import PlayerRegistry, _KeyTable
+
+# A season lives in ./data/season/ as a handful of append-only binary files:
+#   players.rec / teams.rec   fixed-width metadata records, row number == player/team id
+#                             (players.rec is the player registry, fantasy.registry)
+#   points.f8 / points.idx    one float64 row per day (Pts by player id) + (day, offset, width) index
+#   standings.f8 / .idx       one float64 row per day (STANDINGS_COLUMNS by team id)
+# Rows only ever grow in width as new players/teams show up, so a day is appended without
+# touching anything already on disk, and loading a day range is a memmap slice - no CSV parsing.
+
+TEAM_DTYPE = np.dtype([('name', '<U48')])
+INDEX_DTYPE = np.dtype([('day', '<i8'), ('offset', '<i8'), ('width', '<i8')])
+STANDINGS_COLUMNS = ['M', 'W', 'L', 'N/R', 'PT']
+
+
+def day_files(data_dir, prefix):
+    """Sorted [(day_num, path)] for the `{prefix}_day_N.csv` files in data_dir."""
+    pattern = re.compile(rf'^{prefix}_day_(\d+)\.csv$')
+    found = []
+    for f in os.listdir(data_dir):
+        m = pattern.match(f)
+        if m:
+            found.append((int(m.group(1)), os.path.join(data_dir, f)))
+    return sorted(found)
+
+
+class _RaggedLog:
+    """Append-only float64 rows keyed by day number. Rows may get wider over time."""
+
+    def __init__(self, path):
+        self.data_path = path + '.f8'
+        self.index_path = path + '.idx'
+
+    def index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        entries = np.fromfile(self.index_path, dtype=INDEX_DTYPE)
+        # Later entries win, so re-appending a day is how a bad snapshot gets corrected
+        return {int(e['day']): (int(e['offset']), int(e['width'])) for e in entries}
+
+    def append(self, day_num, values):
+        values = np.ascontiguousarray(values, dtype='<f8')
+        offset = os.path.getsize(self.data_path) // 8 if os.path.exists(self.data_path) else 0
+        with open(self.data_path, 'ab') as f:
+            values.tofile(f)
+        with open(self.index_path, 'ab') as f:
+            np.array([(day_num, offset, len(values))], dtype=INDEX_DTYPE).tofile(f)
+
+    def extend(self, days, rows):
+        """append() for several days at once: rows is (days, width), written in one go."""
+        rows = np.ascontiguousarray(rows, dtype='<f8')
+        offset = os.path.getsize(self.data_path) // 8 if os.path.exists(self.data_path) else 0
+        width = rows.shape[1]
+        with open(self.data_path, 'ab') as f:
+            rows.tofile(f)
+        index = np.zeros(len(days), dtype=INDEX_DTYPE)
+        index['day'] = days
+        index['offset'] = offset + width * np.arange(len(days))
+        index['width'] = width
+        with open(self.index_path, 'ab') as f:
+            index.tofile(f)
+
+    def matrix(self, days, width):
+        """(width, len(days)) matrix of the requested rows; cells a row never covered are NaN."""
+        out = np.full((width, len(days)), np.nan)
+        index = self.index()
+        if not index or os.path.getsize(self.data_path) == 0:
+            return out
+        data = np.memmap(self.data_path, dtype='<f8', mode='r')
+        for j, d in enumerate(days):
+            offset, w = index[d]
+            out[:w, j] = data[offset:offset + w]
+        return out
+
+
+class SeasonStore:
+    def __init__(self, path='./data/season'):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.registry = PlayerRegistry(os.path.join(path, 'players.rec'))
+        self._teams = _KeyTable(os.path.join(path, 'teams.rec'), TEAM_DTYPE)
+        self._points = _RaggedLog(os.path.join(path, 'points'))
+        self._standings = _RaggedLog(os.path.join(path, 'standings'))
+
+    # ---------- writers ----------
+
+    def append_mvp(self, day_num, mvp_df):
+        """Append one day's MVP table (Player, Pts and optionally Player Short Name/Team/Position)."""
+        ids, df = self.registry.add(mvp_df)
+        row = np.full(len(self.registry), np.nan)
+        row[ids] = pd.to_numeric(df['Pts'], errors='coerce').to_numpy()
+        self._points.append(day_num, row)
+
+    def append_standings(self, day_num, standings_df):
+        """Append one day's points table (Teams plus whichever of STANDINGS_COLUMNS it has)."""
+        teams = standings_df['Teams'].astype(str).str.strip()
+        ids, n_teams = self._teams.ensure([(t,) for t in teams])
+        row = np.full((n_teams, len(STANDINGS_COLUMNS)), np.nan)
+        for j, col in enumerate(STANDINGS_COLUMNS):
+            if col in standings_df:
+                row[ids, j] = pd.to_numeric(standings_df[col], errors='coerce').to_numpy()
+        self._standings.append(day_num, row.ravel())
+
+    # ---------- loaders ----------
+
+    def days(self):
+        return np.array(sorted(self._points.index()), dtype=np.int64)
+
+    def standings_days(self):
+        return np.array(sorted(self._standings.index()), dtype=np.int64)
+
+    def all_days(self):
+        """Every day either table changed on. The archive skips a day whose table didn't change,
+        so the last day may be in only one of them (a match that moved the standings, not the MVP table)."""
+        return np.union1d(self.days(), self.standings_days())
+
+    def players(self):
+        return self.registry.frame()
+
+    def teams(self):
+        return self._teams.records()['name']
+
+    def points(self, start=None, stop=None):
+        """(days, matrix) for start <= day <= stop; matrix is players x days, NaN where unlisted."""
+        days = _day_range(self.days(), start, stop)
+        return days, self._points.matrix(days, len(self.registry))
+
+    def day_points(self, day_num):
+        """(day, Pts by player id) of the latest day on or before day_num."""
+        days = _day_range(self.days(), None, day_num)
+        if not len(days):
+            raise KeyError(f'no mvp day on or before day_{day_num} in season store {self.path}')
+        return int(days[-1]), self._points.matrix(days[-1:], len(self.registry))[:, 0]
+
+    def points_frame(self, start=None, stop=None):
+        days, matrix = self.points(start, stop)
+        return pd.DataFrame(matrix, index=self.registry.names, columns=days)
+
+    def snapshot(self, day_num):
+        """One day's MVP table in the same shape the fetchers write to mvp_day_N.csv."""
+        days, matrix = self.points(day_num, day_num)
+        if not len(days):
+            raise KeyError(f'day_{day_num} not in season store {self.path}')
+        df = self.players().assign(Pts=matrix[:, 0])
+        return df[df['Pts'].notna()].sort_values('Pts', ascending=False, kind='stable').reset_index(drop=True)
+
+    def standings_matrix(self, column, start=None, stop=None):
+        """teams x days DataFrame of one standings column."""
+        days = _day_range(self.standings_days(), start, stop)
+        teams = self.teams()
+        j = STANDINGS_COLUMNS.index(column)
+        flat = self._standings.matrix(days, len(teams) * len(STANDINGS_COLUMNS))
+        return pd.DataFrame(flat.reshape(len(teams), len(STANDINGS_COLUMNS), len(days))[:, j, :],
+                            index=teams, columns=days)
+
+    def standings(self, day_num):
+        days = _day_range(self.standings_days(), day_num, day_num)
+        if not len(days):
+            raise KeyError(f'day_{day_num} standings not in season store {self.path}')
+        df = pd.DataFrame({'Teams': self.teams()})
+        for col in STANDINGS_COLUMNS:
+            df[col] = self.standings_matrix(col, day_num, day_num).iloc[:, 0].to_numpy()
+        return df.dropna(subset=STANDINGS_COLUMNS, how='all').reset_index(drop=True)
+
+
+def on_grid(days, matrix, grid):
+    """matrix (rows x days) on the day grid, each grid day taking the latest column on or before it
+    (all NaN before the first)."""
+    pos = np.searchsorted(days, grid, side='right') - 1
+    out = np.full((matrix.shape[0], len(grid)), np.nan)
+    have = pos >= 0
+    out[:, have] = matrix[:, pos[have]]
+    return out
+
+
+def _day_range(days, start, stop):
+    if start is not None:
+        days = days[days >= start]
+    if stop is not None:
+        days = days[days <= stop]
+    return days
+
+
+def import_archive(data_dir='./data', store=None):
+    """One-shot import of the snapshot archive (and any mvp_day_*.csv / standings_day_*.csv files
+    not in it yet). Only days whose tables changed are stored; days already in the store are skipped."""
+    from fantasy.snapshots import import_snapshots
+
+    store = store or SeasonStore(os.path.join(data_dir, 'season'))
+    archive = import_snapshots(data_dir)
+    have = set(store.days().tolist())
+    for day_num in archive.days('mvp'):
+        if day_num not in have:
+            store.append_mvp(day_num, archive.read('mvp', day_num))
+    have = set(store.standings_days().tolist())
+    for day_num in archive.days('standings'):
+        if day_num not in have:
+            store.append_standings(day_num, archive.read('standings', day_num))
+    return store
+
+
+if __name__ == '__main__':
+    # python -m fantasy.season_store ./data
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else './data'
+    store = import_archive(data_dir)
+    print(f'{store.path}: {len(store.days())} mvp days, {len(store.standings_days())} standings days, '
+          f'{len(store.players())} players, {len(store.teams())} teams')
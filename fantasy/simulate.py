@@ -0,0 +1,205 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from fantasy import instrument
+from fantasy.atomic import write_csv
+from fantasy.batch import discover_groups
+from fantasy.league import league_mode
+from fantasy.names import NameResolver
+from fantasy.ownership import group_rosters
+from fantasy.scoring import ScoringEngine
+from fantasy.season_store import import_archive, on_grid
+
+# Title odds: how likely each manager is to win their group, finish top 3 or finish in any given
+# position once the rest of the tournament has played out, by Monte Carlo over the points history.
+# The season store holds every player's cumulative points per day (data/season/); the
+# differences between consecutive days are the players' daily points. A simulated day is one of
+# the days already played, drawn at random, with every player's points of that day together, so
+# players of the same match stay correlated and each player's points follow their own observed
+# distribution. Only how often each played day gets drawn matters, so a batch of simulations is a
+# played days x sims matrix of multinomial counts, and every manager of every group is scored at once:
+#   final = current[:, None] + daily @ counts        daily: all groups' managers x played days
+# where daily is the rosters' ownership matrix applied to the players' daily points (plus the
+# W x 50 / N/R x 25 standings bonus for IPL-style groups). Batches are seeded from one seed, so a
+# run gives the same odds with or without a process pool:
+#   python -m fantasy.simulate --days-left 20 --sims 1000000 --workers 4    writes group_N/probabilities.csv
+#   python -m fantasy.simulate --days-left 20 --auction-file IPL2025MockAuctionSummary.csv --team-row group_1
+
+SIMS = 100_000
+# Floats in a batch's biggest array (managers or played days x sims): 32 MB
+BATCH_CELLS = 2 ** 22
+TOP = 3
+
+
+def carry_forward(cumulative):
+    """A players x days cumulative matrix with each gap (a player missing from a day's table) taking
+    the player's last listed total, and 0 before their first appearance."""
+    return pd.DataFrame(cumulative).ffill(axis=1).fillna(0.0).to_numpy()
+
+
+def daily_points(cumulative):
+    """Day-over-day differences of a players x days cumulative matrix (the first day counts from 0).
+    Gaps are carried forward first, so a player missing from one day's table doesn't score minus
+    their whole total that day and plus it the next; a negative day is a real correction."""
+    return np.diff(carry_forward(cumulative), axis=1, prepend=0.0)
+
+
+def corrections(cumulative, daily):
+    """(player, day) of every negative daily value; raises if one isn't a fall in the listed totals."""
+    players, days = np.nonzero(daily < 0)
+    listed = carry_forward(cumulative)
+    fell = listed[players, days] < np.where(days > 0, listed[players, np.maximum(days - 1, 0)], 0.0)
+    if not fell.all():
+        raise ValueError(f'{int((~fell).sum())} negative daily points without a fall in the table')
+    return list(zip(players.tolist(), days.tolist()))
+
+
+class TitleOdds:
+    """Every group's managers with their current totals and daily points on each played day."""
+
+    def __init__(self, groups, managers, current, daily, day_num=None):
+        self.groups = list(groups)
+        self.managers = {g: list(managers[g]) for g in self.groups}
+        self.current = np.asarray(current, dtype=np.float64)
+        self.daily = np.asarray(daily, dtype=np.float64)
+        self.day_num = day_num
+        sizes = [len(self.managers[g]) for g in self.groups]
+        self.bounds = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+    @classmethod
+    def from_tournament(cls, tournament_dir='.', groups=None, auction_file='AuctionSummary.csv', team_row=False):
+        data = os.path.join(tournament_dir, 'data')
+        with instrument.span('season history') as s:
+            season = import_archive(data)
+            days, points = season.points()
+            if not len(days):
+                raise ValueError(f'no mvp days in {data}')
+            players = season.players()
+            wins = nrs = None
+            if team_row and len(season.standings_days()):
+                # The played days are both tables' days (a day may have changed only the standings),
+                # each table carried forward onto them and then differenced
+                grid = season.all_days()
+                wins, nrs = (np.nan_to_num(on_grid(season.standings_days(), season.standings_matrix(col).to_numpy(),
+                                                   grid)) for col in ('W', 'N/R'))
+                points, days = on_grid(days, points, grid), grid
+            player_daily = daily_points(points)
+            points = carry_forward(points)
+            s.rows = len(players)
+            s.set(days=len(days), corrections=len(corrections(points, player_daily)))
+        resolver = NameResolver.from_sources([players], players_csv=os.path.join(data, 'players.csv'),
+                                             alias_path=os.path.join(data, 'player_aliases.csv'))
+        groups = groups or discover_groups(tournament_dir)
+        managers, current, daily = {}, [], []
+        with instrument.span('ownership matrices') as s:
+            for group in groups:
+                rosters, manager_teams = group_rosters(os.path.join(tournament_dir, group), auction_file, team_row)
+                engine = ScoringEngine(rosters, season.registry, manager_teams=manager_teams,
+                                       teams=season.teams() if wins is not None else None, resolver=resolver)
+                managers[group] = engine.managers
+                if wins is not None:
+                    current.append(engine.totals(points[:, -1], wins[:, -1], nrs[:, -1]))
+                    daily.append(engine.totals(player_daily, daily_points(wins), daily_points(nrs)))
+                else:
+                    current.append(engine.player_totals(points[:, -1]))
+                    daily.append(engine.player_totals(player_daily))
+            s.rows = sum(len(m) for m in managers.values())
+        return cls(groups, managers, np.concatenate(current), np.vstack(daily), int(days[-1]))
+
+    def batches(self, sims, batch=None):
+        batch = batch or max(1, BATCH_CELLS // max(len(self.current), self.daily.shape[1]))
+        return [min(batch, sims - start) for start in range(0, sims, batch)]
+
+    def run(self, days_left, sims=SIMS, seed=None, workers=1, batch=None):
+        """{group: DataFrame} of each manager's odds, best chance of the title first."""
+        sizes = self.batches(sims, batch)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        args = [(self.daily, self.current, self.bounds, days_left, n, s) for n, s in zip(sizes, seeds)]
+        with instrument.span('simulate', sims=sims, batches=len(sizes), workers=workers):
+            if workers == 1 or len(sizes) == 1:
+                results = [simulate_batch(*a) for a in args]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(instrument.call_traced, simulate_batch, f'batch {i}', *a)
+                               for i, a in enumerate(args)]
+                    results = []
+                    for future in futures:
+                        result, span = future.result()
+                        instrument.attach(span)
+                        results.append(result)
+        positions = [sum(r[0][k] for r in results) for k in range(len(self.groups))]
+        expected = sum(r[1] for r in results) / sims
+        return {group: self._table(k, positions[k], expected, sims) for k, group in enumerate(self.groups)}
+
+    def _table(self, k, positions, expected, sims):
+        lo, hi = self.bounds[k], self.bounds[k + 1]
+        odds = 100.0 * positions / sims
+        table = pd.DataFrame({'Manager': self.managers[self.groups[k]], 'Points': self.current[lo:hi],
+                              'Expected': np.round(expected[lo:hi], 1),
+                              'Win %': np.round(odds[:, 0], 2), f'Top {TOP} %': np.round(odds[:, :TOP].sum(axis=1), 2)})
+        if odds.shape[1] > TOP:
+            for p in range(odds.shape[1]):
+                table[f'P{p + 1} %'] = np.round(odds[:, p], 2)
+        order = np.lexsort((-table['Expected'].to_numpy(), -table['Win %'].to_numpy()))
+        return table.iloc[order].reset_index(drop=True)
+
+
+def simulate_batch(daily, current, bounds, days_left, sims, seed):
+    """One batch: ([managers x positions counts per group], summed final totals).
+
+    Positions are counted in full for small groups and only up to TOP for league-sized ones."""
+    rng = np.random.default_rng(seed)
+    n_days = daily.shape[1]
+    counts = rng.multinomial(days_left, np.full(n_days, 1.0 / n_days), size=sims)
+    final = current[:, None] + daily @ counts.T.astype(np.float64)
+    positions = []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        totals = final[lo:hi]
+        m = hi - lo
+        n_positions = min(TOP, m) if league_mode(m) else m
+        if n_positions < m:
+            # Only the best few are counted: partition them out and sort just those
+            best = np.argpartition(-totals, n_positions, axis=0)[:n_positions + 1]
+            order = np.take_along_axis(best, np.argsort(-np.take_along_axis(totals, best, axis=0), axis=0), axis=0)
+        else:
+            order = np.argsort(-totals, axis=0)
+        ranked = np.take_along_axis(totals, order, axis=0)
+        k = min(n_positions, m - 1)
+        tied = (ranked[1:k + 1] == ranked[:k]).any(axis=0)
+        if tied.any():
+            # Equal totals are split at random, not by manager order, where that changes a counted position
+            shuffled = np.lexsort((rng.random((m, tied.sum())), -totals[:, tied]), axis=0)
+            order[:, tied] = shuffled[:len(order)]
+        flat = order[:n_positions] * n_positions + np.arange(n_positions)[:, None]
+        positions.append(np.bincount(flat.ravel(), minlength=m * n_positions).reshape(m, n_positions))
+    return positions, final.sum(axis=1)
+
+
+def write_odds(odds, tournament_dir='.'):
+    for group, table in odds.items():
+        write_csv(table, os.path.join(tournament_dir, group, 'probabilities.csv'), index=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Each manager's title and finishing-position odds by Monte Carlo")
+    parser.add_argument('groups', nargs='*', help='default: every group_* directory')
+    parser.add_argument('--days-left', type=int, required=True, help='match days still to play')
+    parser.add_argument('--sims', type=int, default=SIMS)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--workers', type=int, default=1, help='processes to spread the batches over')
+    parser.add_argument('--batch', type=int, help='simulations per batch (default: sized to ~32 MB)')
+    parser.add_argument('--auction-file', default='AuctionSummary.csv')
+    parser.add_argument('--team-row', action='store_true',
+                        help="the auction file's first row is each manager's team (adds the standings bonus)")
+    args = parser.parse_args()
+
+    model = TitleOdds.from_tournament('.', args.groups, args.auction_file, args.team_row)
+    odds = model.run(args.days_left, args.sims, args.seed, args.workers, args.batch)
+    write_odds(odds, '.')
+    for group, table in odds.items():
+        print(f'{group}: day_{model.day_num}, {args.days_left} days left, {args.sims} simulations')
+        print(table.head(10).to_markdown(index=False))
@@ -0,0 +1,142 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+
+from fantasy.atomic import atomic_open, atomic_path, write_text
+from fantasy.batch import discover_groups
+from fantasy.checkpoint import fingerprint
+from fantasy.league import TOP_K, Standings, league_mode
+from fantasy.results_store import ResultsStore
+
+# The tournament's web pages are built from the Jinja2 templates in fantasy/templates/ instead of
+# being patched into index.html with regexes:
+#   ./index.html                    the dashboard: every group's top of the table and its charts
+#   ./{group}/leaderboard.html      the group's full table, with rank movement
+#   ./{group}/ownership.html        who owns whom (written through OwnershipIndex.write_reports)
+#   ./{group}/squads_live.md        every manager's squad (ditto)
+# ./.site_manifest.json records the hash of what each page was last built from (its template and
+# the data it shows), like the charts' .render_cache, and a page whose inputs haven't changed is
+# neither rendered nor written. Charts are published as ./assets/{group}/{name}.{hash}{ext}, named
+# by their content, so a page only links to a new URL (and browsers only fetch the chart again)
+# when the chart itself changed; older copies are removed. Every page also gets a gzip'd copy next
+# to it (page.gz, mtime 0 so an unchanged page compresses to the same bytes) for servers that hand
+# out pre-compressed files (nginx gzip_static, most CDNs).
+#   python -m fantasy.site                 from the tournament directory, latest results day
+#   python -m fantasy.site --day 8 group_1
+
+TEMPLATES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+MANIFEST = '.site_manifest.json'
+ASSETS = 'assets'
+CHARTS = ('points_progression.gif', 'manager_distribution.png')
+DASHBOARD_ROWS = 10
+
+
+def markdown_table(records):
+    return pd.DataFrame(records).to_markdown(index=False)
+
+
+class Site:
+    def __init__(self, root='.', title='🏆 TOURNAMENT DASHBOARD'):
+        self.root = root
+        self.title = title
+        self.manifest_path = os.path.join(root, MANIFEST)
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        self._env = None
+        self.written = []
+
+    @property
+    def env(self):
+        if self._env is None:
+            # Only runs that publish pages pay for importing jinja2
+            from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+            self._env = Environment(loader=FileSystemLoader(TEMPLATES), autoescape=select_autoescape(['html']),
+                                    undefined=StrictUndefined, keep_trailing_newline=True)
+            self._env.filters['markdown_table'] = markdown_table
+        return self._env
+
+    def fresh(self, path, key):
+        # The .gz copies aren't committed, so a fresh checkout rebuilds them
+        out = os.path.join(self.root, path)
+        return os.path.exists(out) and os.path.exists(out + '.gz') and self.manifest.get(path) == key
+
+    def mark(self, path, key):
+        self.manifest[path] = key
+        write_text(self.manifest_path, json.dumps(self.manifest, indent=1, sort_keys=True))
+
+    def page(self, path, template, **context):
+        """Renders `template` to root/path (and path.gz) unless it was last built from the same
+        template and context. Context values are plain data or DataFrames. True if written."""
+        with open(os.path.join(TEMPLATES, template), 'rb') as f:
+            source = f.read()
+        key = fingerprint(source, self.title, *(part for item in sorted(context.items()) for part in item))
+        if self.fresh(path, key):
+            return False
+        text = self.env.get_template(template).render(title=self.title, **context)
+        out = os.path.join(self.root, path)
+        write_text(out, text)
+        with atomic_open(out + '.gz', 'wb') as f:
+            f.write(gzip.compress(text.encode(), compresslevel=9, mtime=0))
+        self.mark(path, key)
+        self.written.append(path)
+        return True
+
+    def asset(self, path):
+        """Publishes root/path as assets/{dir}/{name}.{hash}{ext} and returns that URL (None if
+        there is no such file). Earlier versions of the same file are removed."""
+        src = os.path.join(self.root, path)
+        if not os.path.exists(src):
+            return None
+        with open(src, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:12]
+        directory, name = os.path.split(os.path.normpath(path))
+        stem, ext = os.path.splitext(name)
+        url = '/'.join([ASSETS] + [d for d in directory.split(os.sep) if d] + [f'{stem}.{digest}{ext}'])
+        dest = os.path.join(self.root, url)
+        if not os.path.exists(dest):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            with atomic_path(dest) as tmp:
+                shutil.copyfile(src, tmp)
+        for old in os.listdir(os.path.dirname(dest)):
+            if old != os.path.basename(dest) and old.startswith(f'{stem}.') and old.endswith(ext):
+                os.unlink(os.path.join(os.path.dirname(dest), old))
+        return url
+
+
+def group_standings(tournament_dir, group, day_num=None):
+    """The group's Standings on `day_num` (default: its latest results day)."""
+    return Standings.from_store(ResultsStore(os.path.join(tournament_dir, group, 'results')), day_num)
+
+
+def build(site, groups, day_num=None):
+    """Every group's leaderboard.html, then index.html. Returns the pages written."""
+    cards = []
+    for group in groups:
+        standings = group_standings(site.root, group, day_num)
+        league = league_mode(len(standings.managers))
+        rows = (standings.top(TOP_K) if league else standings.top(len(standings))).to_dict('records')
+        site.page(f'{group}/leaderboard.html', 'leaderboard.html', group=group, day=standings.day_num,
+                  rows=rows, managers=len(standings), league=league)
+        cards.append({'group': group, 'day': standings.day_num, 'rows': rows[:DASHBOARD_ROWS],
+                      'charts': {chart: site.asset(f'{group}/{chart}') for chart in CHARTS}})
+    site.page('index.html', 'dashboard.html', groups=cards)
+    return site.written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the tournament's dashboard and leaderboard pages")
+    parser.add_argument('groups', nargs='*', help='default: every group_* directory')
+    parser.add_argument('--day', type=int, help='results day to publish (default: the latest)')
+    args = parser.parse_args()
+
+    site = Site('.')
+    written = build(site, args.groups or discover_groups('.'), args.day)
+    print(f'{len(written)} pages written: {", ".join(written)}' if written else 'All pages up to date')
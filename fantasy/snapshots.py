@@ -0,0 +1,141 @@
+import argparse
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from fantasy.atomic import write_text
+from fantasy.season_store import day_files
+
+# The fetched tables live in a content-addressed archive instead of one full CSV per day:
+#   ./data/snapshots/objects/{sha1}.csv    each distinct snapshot, stored once
+#   ./data/snapshots/manifest.csv          kind,day,hash - append-only, later rows for a day win
+# A day only gets a manifest row when its table differs from the one the day before resolves to,
+# so days without a match (the same MVP table, the same points table) cost nothing, and loaders
+# that walk archive.days(kind) never see them. Reading a day takes the latest snapshot on or
+# before it. The hash is of the CSV's header plus its sorted rows, so a table the site returned in
+# a different row order still counts as unchanged.
+# Old mvp_day_N.csv / standings_day_N.csv files are folded in whenever the archive is opened with
+# import_snapshots(), the same way the season store picks them up:
+#   python -m fantasy.snapshots import [--remove]     fold in (and delete) the day files
+#   python -m fantasy.snapshots ls                    which days have snapshots of their own
+
+KINDS = ('mvp', 'standings')
+MANIFEST_COLUMNS = ['kind', 'day', 'hash']
+
+
+def content_hash(text):
+    """sha1 of a CSV's header and its rows in sorted order."""
+    lines = text.splitlines()
+    canonical = '\n'.join(lines[:1] + sorted(lines[1:]))
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+class SnapshotArchive:
+
+    def __init__(self, data_dir='./data'):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, 'snapshots')
+        self.objects = os.path.join(self.path, 'objects')
+        self.manifest_path = os.path.join(self.path, 'manifest.csv')
+        self._pointers = None
+
+    def pointers(self):
+        """kind, day, hash of every day that has a snapshot of its own, by kind and day."""
+        if self._pointers is None:
+            if os.path.exists(self.manifest_path):
+                df = pd.read_csv(self.manifest_path, dtype={'kind': str, 'day': np.int64, 'hash': str})
+                df = df.drop_duplicates(['kind', 'day'], keep='last')
+            else:
+                df = pd.DataFrame({c: pd.Series(dtype=t) for c, t in zip(MANIFEST_COLUMNS, (str, np.int64, str))})
+            self._pointers = df.sort_values(['kind', 'day'], kind='stable').reset_index(drop=True)
+        return self._pointers
+
+    def days(self, kind):
+        pointers = self.pointers()
+        return pointers.loc[pointers['kind'] == kind, 'day'].to_numpy(dtype=np.int64)
+
+    def resolve(self, kind, day_num=None):
+        """(day, hash) of the snapshot `day_num` reads (default: the latest), or None before the first."""
+        pointers = self.pointers()
+        pointers = pointers[pointers['kind'] == kind]
+        if day_num is not None:
+            pointers = pointers[pointers['day'] <= day_num]
+        if not len(pointers):
+            return None
+        last = pointers.iloc[-1]
+        return int(last['day']), last['hash']
+
+    def object_path(self, digest):
+        return os.path.join(self.objects, f'{digest}.csv')
+
+    def read(self, kind, day_num=None, **kwargs):
+        found = self.resolve(kind, day_num)
+        if found is None:
+            raise KeyError(f'no {kind} snapshot on or before day_{day_num} in {self.path}')
+        return pd.read_csv(self.object_path(found[1]), **kwargs)
+
+    def put_text(self, kind, day_num, text):
+        """Stores one day's CSV text. True if it differs from what the day resolved to before."""
+        digest = content_hash(text)
+        found = self.resolve(kind, day_num)
+        if found is not None and found[1] == digest:
+            return False
+        os.makedirs(self.objects, exist_ok=True)
+        if not os.path.exists(self.object_path(digest)):
+            write_text(self.object_path(digest), text)
+        new = not os.path.exists(self.manifest_path)
+        with open(self.manifest_path, 'a', newline='') as f:
+            pd.DataFrame([(kind, day_num, digest)], columns=MANIFEST_COLUMNS).to_csv(f, header=new, index=False)
+        self._pointers = None
+        return True
+
+    def put(self, kind, day_num, df):
+        """Stores one day's table (as the fetchers wrote mvp_day_N.csv). True if it changed."""
+        return self.put_text(kind, day_num, df.to_csv(index=False))
+
+
+def import_snapshots(data_dir='./data', archive=None, remove=False):
+    """Folds any {kind}_day_N.csv files into the archive. Days up to its latest snapshot are skipped."""
+    archive = archive or SnapshotArchive(data_dir)
+    for kind in KINDS:
+        files = day_files(data_dir, kind)
+        latest = archive.resolve(kind)
+        for day_num, path in files:
+            if latest is not None and day_num <= latest[0]:
+                continue
+            with open(path, newline='') as f:
+                archive.put_text(kind, day_num, f.read())
+        if remove:
+            for _, path in files:
+                os.unlink(path)
+    return archive
+
+
+def github_output(**values):
+    """Adds key=value step outputs when running under GitHub Actions, for later steps' `if:`."""
+    path = os.environ.get('GITHUB_OUTPUT')
+    if path:
+        with open(path, 'a') as f:
+            for key, value in values.items():
+                f.write(f'{key}={str(value).lower()}\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='The content-addressed archive of fetched tables')
+    parser.add_argument('--data-dir', default='./data')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('import', help='fold the mvp_day_N.csv / standings_day_N.csv files into the archive')
+    p.add_argument('--remove', action='store_true', help='delete the day files once imported')
+    sub.add_parser('ls', help='the days with a snapshot of their own, per kind')
+    args = parser.parse_args()
+
+    archive = import_snapshots(args.data_dir, remove=args.command == 'import' and args.remove)
+    for kind in KINDS:
+        days = archive.days(kind)
+        if len(days):
+            objects = archive.pointers().query('kind == @kind')['hash'].nunique()
+            print(f'{kind}: {len(days)} days with changes ({days[0]}..{days[-1]}), {objects} distinct snapshots')
+            if args.command == 'ls':
+                print('\t' + ' '.join(map(str, days)))
@@ -0,0 +1,180 @@
+import os
+from urllib.parse import urlsplit
+
+from fantasy import instrument
+from fantasy.tables import read_table
+
+# Where the fetchers get their pages from. Each Page says what table it wants; the sources are
+# tried in order until one of them returns a page that actually contains that table:
+#   HttpSource      plain pooled requests.Session (keep-alive, gzip, timeouts, retries). Enough
+#                   whenever the table is in the served HTML or the page has a JSON feed.
+#   SeleniumSource  headless Chrome, for pages that only build the table in the browser. One
+#                   browser serves the whole run, a tab per page (fantasy.browser).
+#   PaginatedHttpSource (fantasy.paginated) fetches every page of a paginated list concurrently.
+#
+# FANTASY_SOURCES=http,selenium picks/orders the sources and FANTASY_SOURCE_BASE_URL points
+# them at a stand-in server (python -m fantasy.standin) instead of the real sites.
+
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/60.0.3112.50 Safari/537.36'
+
+
+class Page:
+    """A page the fetchers scrape.
+
+    marker is a column name that identifies the wanted table among all tables on the page.
+    data_url/from_json optionally give the JSON feed the page renders from and how to turn it
+    into that table. browser_steps(driver) runs in Selenium after the page loads (clicks etc.);
+    ready(driver) is when it counts as loaded (default: the document has finished loading).
+    complete(html) rejects pages that only carry part of the table, e.g. the first page of a
+    "load more" list, so a source doesn't hand back a truncated table. row turns each table row
+    into a typed record (see fantasy.tables).
+    """
+
+    def __init__(self, name, url, marker, data_url=None, from_json=None, browser_steps=None, complete=None,
+                 row=None, ready=None):
+        self.name = name
+        self.url = url
+        self.marker = marker
+        self.data_url = data_url
+        self.from_json = from_json
+        self.browser_steps = browser_steps
+        self.complete = complete
+        self.row = row
+        self.ready = ready
+
+    def table_from_html(self, html):
+        if self.complete is not None and not self.complete(html):
+            return None
+        return self.parse_table(html)
+
+    def parse_table(self, html):
+        with instrument.span(f'parse {self.name}', bytes=len(html)) as s:
+            table = read_table(html, self.marker, self.row)
+            s.rows = len(table) if table is not None else None
+        return table
+
+
+def rebase(url, base_url):
+    """https://host/path?q -> {base_url}/host/path?q, the layout the stand-in server serves."""
+    if not base_url:
+        return url
+    parts = urlsplit(url)
+    return f"{base_url.rstrip('/')}/{parts.netloc}{parts.path}" + (f'?{parts.query}' if parts.query else '')
+
+
+class HttpSource:
+    name = 'http'
+
+    def __init__(self, base_url=None, timeout=(5, 30), retries=3, pool_size=8):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, deflate'})
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=('GET', 'HEAD'))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url, **kwargs):
+        with instrument.span('http get', url=url) as s:
+            response = self.session.get(rebase(url, self.base_url), timeout=self.timeout, **kwargs)
+            response.raise_for_status()
+            s.set(status=response.status_code, bytes=len(response.content))
+        return response
+
+    def fetch_table(self, page):
+        if page.data_url and page.from_json:
+            return page.from_json(self.get(page.data_url).json())
+        return page.table_from_html(self.get(page.url).text)
+
+    def close(self):
+        self.session.close()
+
+
+class SeleniumSource:
+    name = 'selenium'
+
+    def __init__(self, base_url=None):
+        from fantasy.browser import BrowserSession
+
+        self.base_url = base_url
+        self.session = BrowserSession(USER_AGENT, base_url=base_url)
+
+    def prefetch(self, pages):
+        """Opens every page in its own tab up front, so they load side by side."""
+        self.session.prefetch(pages)
+
+    def fetch_table(self, page):
+        return page.table_from_html(self.session.html(page))
+
+    def close(self):
+        self.session.close()
+
+
+SOURCES = {'http': HttpSource, 'selenium': SeleniumSource}
+
+
+def default_sources(default='http,selenium'):
+    from fantasy.paginated import PaginatedHttpSource
+
+    sources = dict(SOURCES, paginated=PaginatedHttpSource)
+    names = os.environ.get('FANTASY_SOURCES', default).split(',')
+    base_url = os.environ.get('FANTASY_SOURCE_BASE_URL')
+    return [sources[n.strip()](base_url=base_url) for n in names if n.strip()]
+
+
+def _try_source(page, source, errors):
+    try:
+        with instrument.span(f'fetch {page.name} via {source.name}') as s:
+            table = source.fetch_table(page)
+            s.rows = len(table) if table is not None else None
+    except Exception as e:
+        errors.append(f'{source.name}: {e!r}')
+        print(f'{page.name}: {source.name} source failed ({e!r}), trying the next one')
+        return None
+    if table is not None:
+        print(f'{page.name}: fetched via {source.name}')
+        return table
+    errors.append(f'{source.name}: no table with a {page.marker!r} column')
+    print(f'{page.name}: {source.name} source returned no {page.marker!r} table, trying the next one')
+    return None
+
+
+def fetch_tables(pages, sources=None):
+    """{page name: table} for several pages. Each source gets every page still missing before the
+    next source is tried, so the browser opens all the pages it is needed for at once."""
+    sources = sources if sources is not None else default_sources()
+    tables, errors = {}, {page.name: [] for page in pages}
+    for source in sources:
+        missing = [page for page in pages if page.name not in tables]
+        if not missing:
+            break
+        if len(missing) > 1 and hasattr(source, 'prefetch'):
+            try:
+                source.prefetch(missing)
+            except Exception as e:
+                # Each page then fails on its own with the same error
+                print(f'{source.name} source could not open {len(missing)} pages ({e!r})')
+        for page in missing:
+            table = _try_source(page, source, errors[page.name])
+            if table is not None:
+                tables[page.name] = table
+    for page in pages:
+        if page.name not in tables:
+            raise RuntimeError(f'Could not fetch {page.name} from {page.url}: ' + '; '.join(errors[page.name]))
+    return tables
+
+
+def fetch_table(page, sources=None):
+    """The page's table from the first source that can produce it."""
+    return fetch_tables([page], sources)[page.name]
+
+
+def close_sources(sources):
+    for source in sources:
+        source.close()
@@ -0,0 +1,246 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from fantasy.atomic import write_csv
+from fantasy.names import NameResolver
+from fantasy.registry import normalize_name
+
+# Auction retrospectives: the best squad money could have bought, and how well each manager spent.
+# The pool is the sold players at the price they went for (sold_players.csv: Player, Team, Category,
+# Sold Price, Winner), and with --with-undrafted also every undrafted player of the points table at
+# the base price. Points are the final (or --day) mvp points. Each manager's efficiency is always
+# measured against the sold pool: undrafted players at the base price make the best squad so cheap
+# that it would be every manager's baseline whatever they spent. With --with-undrafted that squad
+# is solved for as well and reported next to it.
+# The solve is exact: a 0/1 knapsack per role over (players picked, credits spent), kept for every
+# budget at once, then the roles are combined under their min/max counts with a max-plus convolution:
+#   role[r][n, c]   best points from n players of role r costing at most c credit steps
+#   squad[n, c]     best points from n players over all roles, each role within its limits
+# so "best squad for budget B" and "best squad for what manager M spent" are both a table lookup:
+#   python -m fantasy.squad_solver group_1                 from the tournament directory
+#   python -m fantasy.squad_solver group_1 --budget 100 --roles Wicketkeeper=1-1 --with-undrafted
+# writes optimal_squad.csv, manager_efficiency.csv and player_value.csv to the group.
+
+SQUAD = 11
+BUDGET = 110.0
+STEP = 0.5
+BASE_PRICE = 1.0
+# (min, max) players of each role in a squad
+ROLE_LIMITS = {'Batsman': (3, 4), 'Bowler': (3, 4), 'All-Rounder': (2, 3), 'Wicketkeeper': (1, 2)}
+# mvp table Position -> auction Category
+POSITION_ROLES = {'bat': 'Batsman', 'bowl': 'Bowler', 'alr': 'All-Rounder', 'wk': 'Wicketkeeper'}
+SOLD_FILE = 'sold_players.csv'
+
+
+class PlayerPool:
+    """The pool as flat arrays: names, role codes, prices, points and owner (manager index, -1 if undrafted)."""
+
+    def __init__(self, names, roles, prices, points, owners, managers, role_names):
+        self.names = np.asarray(names, dtype=object)
+        self.roles = np.asarray(roles, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.points = np.nan_to_num(np.asarray(points, dtype=np.float64))
+        self.owners = np.asarray(owners, dtype=np.int64)
+        self.managers = list(managers)
+        self.role_names = list(role_names)
+
+    @classmethod
+    def from_auction(cls, sold_df, mvp_df, resolver=None, undrafted=False, base_price=BASE_PRICE):
+        mvp = mvp_df.assign(Player=normalize_name(mvp_df['Player'])).drop_duplicates('Player')
+        pts = pd.Series(pd.to_numeric(mvp['Pts'], errors='coerce').to_numpy(), index=mvp['Player'])
+        names = [(resolver.lookup(p)[0] if resolver is not None else None) or str(p).lower().strip()
+                 for p in sold_df['Player']]
+        managers = sorted(sold_df['Winner'].astype(str).str.strip().unique())
+        frame = pd.DataFrame({'Player': names, 'Role': sold_df['Category'].astype(str).str.strip(),
+                              'Price': pd.to_numeric(sold_df['Sold Price'], errors='coerce'),
+                              'Owner': pd.Categorical(sold_df['Winner'].astype(str).str.strip(),
+                                                      categories=managers).codes})
+        if undrafted:
+            rest = mvp[~mvp['Player'].isin(names)]
+            frame = pd.concat([frame, pd.DataFrame({
+                'Player': rest['Player'], 'Role': rest['Position'].map(POSITION_ROLES).fillna(rest['Position']),
+                'Price': base_price, 'Owner': -1})], ignore_index=True)
+        role_names = list(ROLE_LIMITS) + sorted(set(frame['Role']) - set(ROLE_LIMITS))
+        roles = pd.Categorical(frame['Role'], categories=role_names).codes
+        return cls(frame['Player'], roles, frame['Price'].fillna(base_price), pts.reindex(frame['Player']).to_numpy(),
+                   frame['Owner'], managers, role_names)
+
+    def __len__(self):
+        return len(self.names)
+
+
+class SquadSolver:
+    """Best squad of `squad` players for every budget up to max_budget, in credit steps of `step`."""
+
+    def __init__(self, pool, squad=SQUAD, limits=None, max_budget=BUDGET, step=STEP):
+        self.pool = pool
+        self.squad = squad
+        self.step = step
+        limits = {**ROLE_LIMITS, **(limits or {})}
+        self.limits = [limits.get(role, (0, squad)) for role in pool.role_names]
+        self.costs = np.ceil(pool.prices / step - 1e-9).astype(np.int64)
+        self.n_steps = int(round(max_budget / step)) + 1
+        self._solve()
+
+    def _role_table(self, ids, n_max):
+        """Knapsack over one role's players: (best[n, c], keep[k, n, c]) for n <= n_max players."""
+        best = np.full((n_max + 1, self.n_steps), -np.inf)
+        best[0] = 0.0
+        keep = np.zeros((len(ids), n_max + 1, self.n_steps), dtype=bool)
+        for k, i in enumerate(ids):
+            w, v = self.costs[i], self.pool.points[i]
+            if w >= self.n_steps:
+                continue
+            # Fewest players first would let a player be picked twice, so go from n_max down
+            for n in range(n_max, 0, -1):
+                candidate = best[n - 1, :self.n_steps - w] + v
+                better = candidate > best[n, w:]
+                best[n, w:][better] = candidate[better]
+                keep[k, n, w:] = better
+        return best, keep
+
+    def _solve(self):
+        self._roles = []
+        squad = np.full((self.squad + 1, self.n_steps), -np.inf)
+        squad[0] = 0.0
+        self._splits = []
+        for r, (lo, hi) in enumerate(self.limits):
+            ids = np.flatnonzero(self.pool.roles == r)
+            hi = min(hi, len(ids), self.squad)
+            best, keep = self._role_table(ids, hi)
+            self._roles.append((ids, best, keep))
+            # Max-plus convolution with the squad so far: a players of this role costing at most c2
+            combined = np.full_like(squad, -np.inf)
+            split_n = np.zeros(squad.shape, dtype=np.int64)
+            split_c = np.zeros(squad.shape, dtype=np.int64)
+            for a in range(lo, hi + 1):
+                for c2 in range(self.n_steps):
+                    if best[a, c2] == -np.inf or (c2 and best[a, c2] == best[a, c2 - 1]):
+                        continue
+                    candidate = squad[:self.squad + 1 - a, :self.n_steps - c2] + best[a, c2]
+                    target = combined[a:, c2:]
+                    better = candidate > target
+                    target[better] = candidate[better]
+                    split_n[a:, c2:][better] = a
+                    split_c[a:, c2:][better] = c2
+            squad = combined
+            self._splits.append((split_n, split_c))
+        self.table = squad[self.squad]
+
+    def budget_steps(self, budget):
+        return min(int(np.floor(budget / self.step + 1e-9)), self.n_steps - 1)
+
+    def best_points(self, budget=BUDGET):
+        points = self.table[self.budget_steps(budget)]
+        return None if points == -np.inf else float(points)
+
+    def best_squad(self, budget=BUDGET):
+        """Pool ids of the best squad costing at most `budget`."""
+        c = self.budget_steps(budget)
+        if self.table[c] == -np.inf:
+            raise ValueError(f'no squad of {self.squad} within {budget:g} credits and the role limits')
+        n, picked = self.squad, []
+        for (ids, best, keep), (split_n, split_c) in zip(reversed(self._roles), reversed(self._splits)):
+            a, c2 = split_n[n, c], split_c[n, c]
+            n, c = n - a, c - c2
+            for k in range(len(ids) - 1, -1, -1):
+                if a and keep[k, a, c2]:
+                    picked.append(ids[k])
+                    a, c2 = a - 1, c2 - self.costs[ids[k]]
+        return np.array(sorted(picked, key=lambda i: -self.pool.points[i]), dtype=np.int64)
+
+    def squad_table(self, ids):
+        pool = self.pool
+        managers = np.array(pool.managers + [''], dtype=object)
+        return pd.DataFrame({'Player': pool.names[ids], 'Role': np.array(pool.role_names, dtype=object)[pool.roles[ids]],
+                             'Price': pool.prices[ids], 'Points': pool.points[ids], 'Owner': managers[pool.owners[ids]]})
+
+
+def player_value(pool):
+    """Every sold player's points per credit, best value first."""
+    sold = np.flatnonzero(pool.owners >= 0)
+    per_credit = pool.points[sold] / np.where(pool.prices[sold] > 0, pool.prices[sold], np.nan)
+    table = pd.DataFrame({'Player': pool.names[sold], 'Manager': np.array(pool.managers, dtype=object)[pool.owners[sold]],
+                          'Role': np.array(pool.role_names, dtype=object)[pool.roles[sold]], 'Price': pool.prices[sold],
+                          'Points': pool.points[sold], 'Pts/Credit': np.round(per_credit, 2)})
+    return table.sort_values('Pts/Credit', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def manager_efficiency(solver, open_solver=None):
+    """Per manager: spend, points, points per credit, the best squad of sold players the same spend
+    could have bought, and the best and worst value picks. With open_solver (a solver over a pool
+    that includes the undrafted players) also the best squad that pool gives for the spend."""
+    pool = solver.pool
+    owned = pool.owners >= 0
+    n = len(pool.managers)
+    spent = np.bincount(pool.owners[owned], weights=pool.prices[owned], minlength=n)
+    points = np.bincount(pool.owners[owned], weights=pool.points[owned], minlength=n)
+    players = np.bincount(pool.owners[owned], minlength=n)
+    value = player_value(pool)
+    best_pick = value.drop_duplicates('Manager').set_index('Manager')['Player']
+    worst_pick = value.iloc[::-1].drop_duplicates('Manager').set_index('Manager')['Player']
+    best = np.array([solver.best_points(s) for s in spent], dtype=np.float64)
+    table = pd.DataFrame({'Manager': pool.managers, 'Players': players, 'Spent': spent, 'Points': points,
+                          'Pts/Credit': np.round(points / np.where(spent > 0, spent, np.nan), 2),
+                          'Best for spend': best, 'Efficiency %': np.round(100.0 * points / best, 1),
+                          'Best value': best_pick.reindex(pool.managers).to_numpy(),
+                          'Worst value': worst_pick.reindex(pool.managers).to_numpy()})
+    if open_solver is not None:
+        table['Best with undrafted'] = [open_solver.best_points(s) for s in spent]
+    return table.sort_values('Efficiency %', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def parse_limits(text):
+    """'Batsman=3-4,Wicketkeeper=1-1' -> {'Batsman': (3, 4), 'Wicketkeeper': (1, 1)}"""
+    limits = {}
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        role, _, bounds = part.partition('=')
+        lo, _, hi = bounds.partition('-')
+        limits[role.strip()] = (int(lo), int(hi or lo))
+    return limits
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Best possible squad under the auction budget, and auction value reports')
+    parser.add_argument('group_dir')
+    parser.add_argument('--day', type=int, help='mvp day to take points from (default: the latest)')
+    parser.add_argument('--budget', type=float, default=BUDGET)
+    parser.add_argument('--squad', type=int, default=SQUAD)
+    parser.add_argument('--roles', default='', help='role limits, e.g. "Batsman=3-4,Wicketkeeper=1-2"')
+    parser.add_argument('--step', type=float, default=STEP, help='smallest price increment')
+    parser.add_argument('--with-undrafted', action='store_true',
+                        help='also solve with the undrafted players in the pool, at the base price')
+    parser.add_argument('--base-price', type=float, default=BASE_PRICE, help='price of undrafted players')
+    args = parser.parse_args()
+
+    from fantasy.snapshots import import_snapshots
+
+    # The day's MVP table is the latest snapshot on or before it (see fantasy.snapshots)
+    archive = import_snapshots('./data')
+    day_num = archive.resolve('mvp', args.day)[0]
+    mvp_df = archive.read('mvp', day_num)
+    resolver = NameResolver.from_sources([mvp_df], players_csv='./data/players.csv',
+                                         alias_path='./data/player_aliases.csv')
+    sold = pd.read_csv(os.path.join(args.group_dir, SOLD_FILE))
+    pool = PlayerPool.from_auction(sold, mvp_df, resolver)
+    max_budget = max(args.budget, np.bincount(pool.owners[pool.owners >= 0],
+                                              weights=pool.prices[pool.owners >= 0]).max())
+    limits = parse_limits(args.roles)
+    solver = SquadSolver(pool, args.squad, limits, max_budget, args.step)
+    open_solver = None
+    if args.with_undrafted:
+        open_pool = PlayerPool.from_auction(sold, mvp_df, resolver, True, args.base_price)
+        open_solver = SquadSolver(open_pool, args.squad, limits, max_budget, args.step)
+
+    optimal = (open_solver or solver).squad_table((open_solver or solver).best_squad(args.budget))
+    efficiency = manager_efficiency(solver, open_solver)
+    write_csv(optimal, os.path.join(args.group_dir, 'optimal_squad.csv'), index=False)
+    write_csv(efficiency, os.path.join(args.group_dir, 'manager_efficiency.csv'), index=False)
+    write_csv(player_value(pool), os.path.join(args.group_dir, 'player_value.csv'), index=False)
+    print(f'Best squad for {args.budget:g} credits from {len((open_solver or solver).pool)} players (day_{day_num}): '
+          f'{optimal["Points"].sum():g} points, {optimal["Price"].sum():g} credits')
+    print(optimal.to_markdown(index=False))
+    print(efficiency.to_markdown(index=False))
@@ -0,0 +1,141 @@
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, urlsplit
+
+# A local stand-in for the sites the fetchers scrape, serving recorded pages and JSON feeds so
+# the fetch path can be exercised offline:
+#   python -m fantasy.standin record fixtures/ https://www.espncricinfo.com/series/...
+#   python -m fantasy.standin serve fixtures/ --port 8765
+#   FANTASY_SOURCES=http FANTASY_SOURCE_BASE_URL=http://127.0.0.1:8765 python ipl2025_fantasy_points_fetcher.py
+#   python -m fantasy.standin replay snapshots/ --every 30     snapshots/1/, snapshots/2/, ... in turn
+# Fixtures live at fixtures/<host>/<path>, with index.html for directory-style paths and the
+# query string appended after '@' (e.g. fixtures/cricketxi.com/players/index.html@pg=2), which
+# is also how a paginated list is stood in for.
+
+
+def fixture_path(root, host, path, query=''):
+    path = path.lstrip('/')
+    if not path or path.endswith('/'):
+        path += 'index.html'
+    if query:
+        path += '@' + quote(query, safe='=&')
+    return os.path.join(root, host, *path.split('/'))
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    root = '.'
+    delay = 0.0
+
+    def do_GET(self):
+        if self.delay:
+            time.sleep(self.delay)
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip('/').partition('/')
+        fixture = fixture_path(self.fixture_root(), host, '/' + path, parts.query)
+        if os.path.isdir(fixture):
+            fixture = os.path.join(fixture, 'index.html')
+        if not os.path.isfile(fixture):
+            self.send_error(404, f'no fixture {fixture}')
+            return
+        with open(fixture, 'rb') as f:
+            body = f.read()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        content_type = mimetypes.guess_type(fixture.split('@')[0])[0] or 'text/html'
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('ETag', etag)
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def fixture_root(self):
+        return self.root
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayHandler(StandinHandler):
+    """Serves root's snapshot directories (root/1/, root/2/, ... each a fixture tree) one after
+    another, moving on every `every` seconds and staying on the last, so a poller sees a match
+    play out."""
+    every = 30.0
+    started = 0.0
+    snapshots = ()
+
+    def fixture_root(self):
+        n = int((time.monotonic() - self.started) / self.every) if self.every > 0 else 0
+        return self.snapshots[min(n, len(self.snapshots) - 1)]
+
+
+def replay(root, port=0, every=30.0, delay=0.0):
+    names = sorted((d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d))),
+                   key=lambda d: (not d.isdigit(), int(d) if d.isdigit() else 0, d))
+    handler = type('Replay', (ReplayHandler,), {'snapshots': [os.path.join(root, d) for d in names],
+                                                'every': every, 'started': time.monotonic()})
+    return serve(root, port, handler, delay)
+
+
+def serve(root, port=0, handler=StandinHandler, delay=0.0):
+    """Start a stand-in server on a background thread; returns (server, base_url).
+
+    delay adds that many seconds to every response, to see what latency does to a fetch."""
+    handler = type('Handler', (handler,), {'root': root, 'delay': delay})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def record(root, urls):
+    from fantasy.sources import HttpSource
+
+    source = HttpSource()
+    for url in urls:
+        parts = urlsplit(url)
+        fixture = fixture_path(root, parts.netloc, parts.path, parts.query)
+        os.makedirs(os.path.dirname(fixture), exist_ok=True)
+        with open(fixture, 'wb') as f:
+            f.write(source.get(url).content)
+        print(f'{url} -> {fixture}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stand-in server for the points/standings sites')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('serve')
+    p.add_argument('root')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--delay', type=float, default=0.0, help='seconds added to every response')
+    p = sub.add_parser('replay', help='serve root/1/, root/2/, ... one after another')
+    p.add_argument('root')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--every', type=float, default=30.0, help='seconds each snapshot is served for')
+    p.add_argument('--delay', type=float, default=0.0, help='seconds added to every response')
+    p = sub.add_parser('record')
+    p.add_argument('root')
+    p.add_argument('urls', nargs='+')
+    args = parser.parse_args()
+    if args.command == 'serve':
+        server, base_url = serve(args.root, args.port, delay=args.delay)
+        print(f'Serving {args.root} at {base_url}')
+        threading.Event().wait()
+    elif args.command == 'replay':
+        server, base_url = replay(args.root, args.port, args.every, args.delay)
+        print(f'Replaying {args.root} at {base_url}, a snapshot every {args.every:g}s')
+        threading.Event().wait()
+    else:
+        record(args.root, args.urls)
@@ -0,0 +1,159 @@
+import io
+import re
+
+import pandas as pd
+
+# Streams just the wanted table out of a scraped page with lxml instead of having pd.read_html
+# build a DataFrame for every table on it. The table is picked by a column in its header row;
+# rows are cleared as soon as they are read and parsing stops at the end of that table, so the
+# rest of the page is never built into a tree. A row function turns each row into a typed record
+# (the string surgery the fetchers used to do on the DataFrame afterwards).
+#
+# Cell text gets the same whitespace treatment as read_html, so markers such as
+# 'Points  Points  Arrow up  Arrow down  Total Points' match the same headers they always did.
+
+_WHITESPACE = re.compile(r'[\r\n]+|\s{2,}')
+
+
+def cell_text(el):
+    return _WHITESPACE.sub(' ', ''.join(el.itertext()).strip())
+
+
+def number(text):
+    """'12' -> 12, '257.5' -> 257.5, '' / '-' -> None; anything else is left as text."""
+    if text in ('', '-'):
+        return None
+    digits = text.replace(',', '')
+    try:
+        return int(digits)
+    except ValueError:
+        pass
+    try:
+        return float(digits)
+    except ValueError:
+        return text
+
+
+def _cells(tr):
+    cells = []
+    for cell in tr:
+        if not isinstance(cell.tag, str) or cell.tag not in ('td', 'th'):
+            continue
+        text = cell_text(cell)
+        try:
+            span = int(cell.get('colspan', 1))
+        except ValueError:
+            span = 1
+        cells.extend([text] * max(span, 1))
+    return cells
+
+
+def _header(cells):
+    return [c if c else f'Unnamed: {i}' for i, c in enumerate(cells)]
+
+
+def iter_rows(html, marker):
+    """Yields the header and then each body row (lists of cell text) of the first table whose
+    header has a `marker` column. Yields nothing if no table on the page has one."""
+    from lxml import etree
+
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    # Per open <table>: [header or None, in <thead>, is the wanted table]
+    tables = []
+    for event, el in etree.iterparse(io.BytesIO(html), events=('start', 'end'), html=True,
+                                     encoding='utf-8', tag=('table', 'thead', 'tr')):
+        if event == 'start':
+            if el.tag == 'table':
+                tables.append([None, False, False])
+            elif el.tag == 'thead' and tables:
+                tables[-1][1] = True
+            continue
+        if el.tag == 'table':
+            if tables.pop()[2]:
+                return
+        elif el.tag == 'thead' and tables:
+            tables[-1][1] = False
+        elif el.tag == 'tr' and tables:
+            table = tables[-1]
+            if table[0] is None:
+                all_th = all(c.tag == 'th' for c in el if isinstance(c.tag, str))
+                if table[1] or all_th:
+                    table[0] = _header(_cells(el))
+                    if marker in table[0]:
+                        table[2] = True
+                        yield table[0]
+            elif table[2] and not table[1]:
+                yield _cells(el)
+            # Done with the row: drop it and anything already read before it
+            el.clear(keep_tail=True)
+            parent = el.getparent()
+            while el.getprevious() is not None and parent is not None:
+                del parent[0]
+
+
+def read_table(html, marker, row=None):
+    """The marker table as a DataFrame, or None if the page doesn't have it.
+
+    row(record) gets each body row as a {column: text} dict and returns the typed record to keep
+    (or None to drop the row); without one the cells are kept with numeric columns converted.
+    """
+    rows = iter_rows(html, marker)
+    header = next(rows, None)
+    if header is None:
+        return None
+    records = []
+    for cells in rows:
+        if row is None:
+            records.append(cells + [''] * (len(header) - len(cells)))
+            continue
+        record = row(dict(zip(header, cells)))
+        if record is not None:
+            records.append(record)
+    if row is not None:
+        return pd.DataFrame.from_records(records)
+    df = pd.DataFrame(records, columns=header)
+    return df.apply(lambda col: pd.Series([number(v) for v in col], dtype=object).infer_objects())
+
+
+# Row functions for the pages the fetchers scrape
+
+def _split_last(text, sep):
+    """Like str.rsplit(sep, 1): ('a b', 'c') for 'a b c', (text, None) without a sep."""
+    head, found, tail = text.rpartition(sep)
+    return (head, tail) if found else (text, None)
+
+
+def ipl_mvp_row(record):
+    """iplt20.com MVP table: 'Yashasvi Jaiswal RR' -> Player 'yashasvi jaiswal', Team 'RR'."""
+    player, team = _split_last(record['Player'], ' ')
+    record = {k: re.sub(r'\s+', ' ', player).lower() if k == 'Player' else number(v) for k, v in record.items()}
+    record['Team'] = team
+    return record
+
+
+def ipl_standings_row(record):
+    """espncricinfo points table. Every team row is followed by a detail row that is one cell
+    spanning the table; those are dropped here instead of slicing with iloc[::2]."""
+    if len({v for v in record.values() if v}) <= 2:
+        return None
+    record = dict(list(record.items())[:12])
+    record['Teams'] = re.sub(r'\d', '', ' '.join(record['Teams'].split()))
+    return {k: v if k == 'Teams' else number(v) for k, v in record.items()}
+
+
+T20_POINTS = 'Points  Points  Arrow up  Arrow down  Total Points'
+
+
+def t20_player_row(record):
+    """cricketxi.com players list: each cell carries a long and a short form two spaces apart."""
+    player, short = _split_last(record['Player'], '  ')
+    team = _split_last(record['Team'], '  ')[1]
+    position = _split_last(record['Position'], '  ')[1]
+    return {
+        'Player': player.lower(),
+        'Player Short Name': short and short.lower(),
+        'Team': team and team.lower(),
+        'Position': position and position.lower(),
+        'Pts': number(record[T20_POINTS]),
+    }
@@ -1,13 +1,23 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-# In[55]:
-
+import os
+import sys
+from datetime import date
 
 import pandas as pd
-from pprint import pprint
-from bs4 import BeautifulSoup
-import io
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fantasy import instrument
+from fantasy.batch import groups_from_args, run_groups
+from fantasy.checkpoint import ScoringCheckpoint, engine_key, incremental_player_totals, roster_fingerprint
+from fantasy.history import PointsHistory
+from fantasy.league import league_mode, publish
+from fantasy.names import NameResolver
+from fantasy.results_store import migrate_results, save_trend_chart
+from fantasy.scoring import ScoringEngine
+from fantasy.season_store import import_archive
+from fantasy.snapshots import SnapshotArchive
 
 pd.set_option('display.max_colwidth', 200)
 pd.set_option('display.max_columns',None) #display all columns
@@ -26,12 +36,15 @@ pd.set_option('display.max_rows',None) #display all rows
 #  pip3 install selenium
 #  pip3 install tabulate
 
-
-# In[ ]:
-
-
-import sys
-from datetime import date
+# Usage
+#  python ipl2025_fantasy.py group_1            score one group
+#  python ipl2025_fantasy.py group_1 group_2    score several groups in one process
+#  python ipl2025_fantasy.py all                score every group_* directory
+#  python -m fantasy score --tournament ipl2025 --day 60    the same without charts, from the repo root
+#  python -m fantasy.history ./group_1          write the per-manager player x day tables ({manager}.csv)
+#  python -m fantasy.results_store ./group_1 export results.csv    the season's totals as one CSV
+#  FANTASY_PROFILE=cprofile python ipl2025_fantasy.py all           also profile the run (see fantasy.instrument)
+# Every run writes per-stage timings to ./reports/ipl2025_fantasy.json
 
 # Backup the input and output files for each day for posterity
 
@@ -40,193 +53,161 @@ ipl_day_0 = date(2025, 3, 21)
 ipl_day_cur = date.today()
 day_num = abs((ipl_day_cur - ipl_day_0).days)
 day = 'day_' + str(day_num)
-prev_day = 'day_' + str(day_num - 1)
-print(day_num)
-
-# Change for each group
-group = sys.argv[1]
-print(group)
-
-results_file = f'./{group}/ipl2025_results_{day}.csv'
-prev_results_file = f'./{group}/ipl2025_results_{prev_day}.csv'
-leaderboard_graph_file = f'./{group}/ipl_leaderboard.png'
-leaderboard_file = f'./{group}/ipl_leaderboard.txt'
-
-ipl_mock_auction_summary = f'./{group}/IPL2025MockAuctionSummary.csv'
-
-
-# In[57]:
-
-
-mvp_df = pd.read_csv(f'./data/mvp_{day}.csv')
-mvp_df
-
 
-# In[58]:
 
-
-fantasy_teams_auction_df = pd.read_csv(ipl_mock_auction_summary)
-fantasy_teams_auction_df
-
-
-# In[59]:
-
-
-fantasy_mgrs = fantasy_teams_auction_df.columns
-fantasy_mgrs.to_list()
-
-
-# In[60]:
-
-
-#Make new dataframe for manager_teams 
-fantasy_mgr_teams = fantasy_teams_auction_df.iloc[:1]
-fantasy_mgr_teams
-
-
-# In[61]:
-
-
-import os
-#Create new dataframe for manager_players
-fantasy_teams_df = fantasy_teams_auction_df.iloc[1:]
-fantasy_teams_df = fantasy_teams_df.apply(lambda x: x.astype(str).str.lower())
-
-fantasy_teams_df_per_mgr = {}
-for mgr in fantasy_teams_df.columns:
-    mgr_file = f'./{group}/{mgr}.csv'
-    if not os.path.exists(mgr_file):
-        df = pd.DataFrame(fantasy_teams_df[mgr])
-        df.to_csv(mgr_file, index=False)
-    else:
-        df = pd.read_csv(mgr_file)
-    fantasy_teams_df_per_mgr[mgr] = df
-fantasy_teams_df
-
-
-# In[62]:
-
-
-from thefuzz import fuzz
-from thefuzz import process
-
-# Compute total score for each fantasy team based on MVP points of each player
-scores = { fantasy_mgr:0 for fantasy_mgr in fantasy_mgrs.to_list() }
-for mgr in fantasy_mgrs:
-    print(mgr)
-    mgr_df = fantasy_teams_df_per_mgr[mgr]
-    mgr_day_pts = {}
-    mgr_file = f'./{group}/{mgr}.csv'
-    all_players_have_min_pts = True
-    mvp_players_with_pts = mvp_df['Player'].to_list()
-    for i in range(len(fantasy_teams_df[mgr])):
-        player_name = str(fantasy_teams_df[mgr].iloc[i]).lower()
-        if player_name in mvp_players_with_pts:
-            player_score = float(mvp_df.loc[mvp_df['Player'] == fantasy_teams_df[mgr].iloc[i],'Pts'].iloc[0])
-            scores[mgr] += player_score
-            mgr_day_pts[player_name] = player_score
-            print(f'\t{player_name} points found. Adding his score {player_score} to total. New score {scores[mgr]}')
+def load_shared():
+    """Tournament-wide inputs, read once no matter how many groups get scored."""
+    print(day_num)
+    # The day's points are the season store's row for the latest snapshot on or before it, indexed
+    # by player id (fantasy.registry), so scoring needs no join on player names
+    with instrument.span('read mvp') as s:
+        season = import_archive('./data')
+        day_pts = season.day_points(day_num)[1]
+        s.rows = len(day_pts)
+    with instrument.span('read standings') as s:
+        ipl_team_pts_tbl = SnapshotArchive('./data').read('standings', day_num)
+        s.rows = len(ipl_team_pts_tbl)
+    return {
+        'registry': season.registry,
+        'day_pts': day_pts,
+        'ipl_team_pts_tbl': ipl_team_pts_tbl,
+        # Misspelt roster names resolve through the confirmed rows of ./data/player_aliases.csv; close
+        # fuzzy matches are added there as pending rows, which score nothing until confirmed
+        'resolver': NameResolver.from_sources([season.players()], players_csv='./data/players.csv',
+                                              alias_path='./data/player_aliases.csv'),
+    }
+
+
+def score_group(group, shared):
+    ipl_team_pts_tbl = shared['ipl_team_pts_tbl']
+
+    leaderboard_graph_file = f'./{group}/ipl_leaderboard.png'
+    leaderboard_file = f'./{group}/ipl_leaderboard.txt'
+    checkpoint_file = f'./{group}/scoring_checkpoint.npz'
+    history_file = f'./{group}/points_history.csv'
+
+    ipl_mock_auction_summary = f'./{group}/IPL2025MockAuctionSummary.csv'
+
+    fantasy_teams_auction_df = pd.read_csv(ipl_mock_auction_summary)
+    fantasy_mgrs = fantasy_teams_auction_df.columns
+
+    #Make new dataframe for manager_teams
+    fantasy_mgr_teams = fantasy_teams_auction_df.iloc[:1]
+
+    #Create new dataframe for manager_players
+    fantasy_teams_df = fantasy_teams_auction_df.iloc[1:]
+    fantasy_teams_df = fantasy_teams_df.apply(lambda x: x.astype(str).str.lower())
+
+    # Per-player daily points go to an append-only (day, manager, player, points) log; the wide
+    # per-manager files it replaces are folded into it the first time round
+    history = PointsHistory(history_file)
+    if not history.exists():
+        wide_files = {mgr: f'./{group}/{mgr}.csv' for mgr in fantasy_mgrs if os.path.exists(f'./{group}/{mgr}.csv')}
+        if wide_files:
+            history.import_wide(wide_files)
+
+    # Ownership (manager x player) and team (manager x IPL team) matrices are built over the
+    # registry's player ids, then every manager is scored in one sparse product. The last run's
+    # checkpoint keeps them, and they are reused for as long as the rosters, aliases and teams are
+    # unchanged (fantasy.checkpoint)
+    checkpoint = ScoringCheckpoint.load(checkpoint_file)
+    key = engine_key(ipl_mock_auction_summary, shared['resolver'], ipl_team_pts_tbl['Teams'])
+    with instrument.span('ownership matrix') as s:
+        engine = checkpoint.engine_for(key, shared['registry']) if checkpoint is not None else None
+        if engine is None:
+            engine = ScoringEngine({mgr: fantasy_teams_df[mgr] for mgr in fantasy_mgrs}, shared['registry'],
+                                   manager_teams=fantasy_mgr_teams.iloc[0].to_dict(), teams=ipl_team_pts_tbl['Teams'],
+                                   resolver=shared['resolver'])
+            s.set(players=len(engine.players), **engine.lookup_stats)
         else:
-            closest_match = process.extractOne(player_name, mvp_players_with_pts)
-            mgr_day_pts[player_name] = 0.0
-            print(f'\t{player_name} not found in mvp_table... Double check the spelling of player name, closest match is {closest_match}')
-            all_players_have_min_pts = False
-    mgr_df[f'{day}'] = mgr_df[mgr].map(mgr_day_pts)
-    mgr_df = mgr_df.reindex(sorted(mgr_df.columns, key = lambda x: int(x.split("_")[1] if '_' in x else 0)), axis=1)
-    mgr_df.to_csv(mgr_file, index=False)
-    print(f'*{day.upper()}*\n```\n{mgr_df.to_markdown(index=False)}\n```')
-    if all_players_have_min_pts:
-        print(f'All players have min fantasy points.')
-
-
-# In[63]:
-
-
-scores
-
-
-# In[64]:
-
-
-ipl_team_pts_tbl = pd.read_csv(f'./data/standings_{day}.csv')
-ipl_team_pts_tbl
-
-
-# In[65]:
-
-
-for mgr in fantasy_teams_df.columns:
-    no_of_wins = 0
-    no_of_nrs = 0
-    if fantasy_mgr_teams[mgr].item() in ipl_team_pts_tbl.Teams.to_list():
-        no_of_wins = ipl_team_pts_tbl.loc[ipl_team_pts_tbl['Teams'] == fantasy_mgr_teams[mgr].item(),'W'].item()
-        if no_of_wins == '-':
-            no_of_wins=0
-        no_of_nrs = ipl_team_pts_tbl.loc[ipl_team_pts_tbl['Teams'] == fantasy_mgr_teams[mgr].item(),'N/R'].item()
-        scores[mgr] += (float(no_of_wins)*50)
-        scores[mgr] += (float(no_of_nrs)*25)
-        print(f'{str(mgr)}\t{str(fantasy_mgr_teams[mgr].values)}\twins:{str(no_of_wins)}\tnr:{str(no_of_nrs)}')
-scores
-
-
-# In[66]:
-
-
-prev_scores = pd.read_csv(prev_results_file, header=None)
-prev_scores = prev_scores.T
-new_header = prev_scores.iloc[0]
-prev_scores = prev_scores[1:]
-prev_scores.columns = new_header
-prev_scores_dicts = prev_scores.to_dict(orient='records')
-prev_scores_dicts
-
-
-# In[68]:
-
-
-current_scores_dict = prev_scores_dicts + [scores]
-
-
-# In[69]:
-
-
-graph_scores = pd.DataFrame(current_scores_dict)
-graph_scores
-
-
-# In[18]:
-
-
-graph_scores_t = graph_scores.T
-graph_scores_t = graph_scores_t.sort_values(by=graph_scores_t.columns[-1], ascending=False)
-graph_scores_t.to_csv(results_file, header=False)
-graph_scores_t
-
-
-# In[70]:
-
-
-import matplotlib.pyplot as plt
-ax = graph_scores.plot.line(marker='o')
-#ax.set_xlabel("Days")
-ax.set_ylabel("Points")
-plt.legend(bbox_to_anchor=(1.02, 1), loc='upper left', borderaxespad=0)
-plt.savefig(leaderboard_graph_file, bbox_inches="tight")
-plt.show()
-
-
-# In[71]:
-
-
-scores_sorted = {k: v for k, v in sorted(scores.items(), key=lambda item: item[1], reverse=True)}
-score_msg = str(scores_sorted)
-
-scores_msg_df = pd.DataFrame(
-    scores_sorted.items(),
-    columns=['Manager', 'Points']
-)
-leaderboard_table = f'*{day.upper()}*\n```\n{scores_msg_df.to_markdown(index=False)}\n```'
-print()
-with open(leaderboard_file, 'w') as f:
-    f.write(leaderboard_table)
-
+            s.set(reused=True)
+        s.rows = len(engine.managers)
+    # Going forward from the checkpoint's day, only the rostered players whose points moved are pushed
+    # through the ownership matrix, and only the managers owning one get new rows in the history
+    incremental = checkpoint is not None and engine is checkpoint.engine and checkpoint.day_num <= day_num
+    with instrument.span('scoring') as s:
+        day_pts = shared['day_pts']
+        if incremental:
+            player_scores, changed, affected = incremental_player_totals(engine, checkpoint, day_pts)
+            print(f'Incremental from day_{checkpoint.day_num}: {len(changed)} players changed, '
+                  f'{len(affected)} managers affected')
+            s.set(incremental=True, changed_players=len(changed), managers_affected=len(affected))
+            mgr_day_pts = engine.roster_points(day_pts, [engine.managers[i] for i in affected])
+        else:
+            player_scores = engine.player_totals(day_pts)
+            mgr_day_pts = engine.roster_points(day_pts)
+        s.rows = len(player_scores)
+    for player_name, player in engine.resolved.items():
+        print(f'\t{player_name} scored as {player}')
+
+    # Public leagues (fantasy.league) skip the per-manager tables and charts
+    league = league_mode(len(fantasy_mgrs))
+    for i, mgr in enumerate([] if league else fantasy_mgrs):
+        print(f'{mgr}\t{player_scores[i]}')
+        if mgr not in mgr_day_pts:
+            print(f'\tNo points changed since day_{checkpoint.day_num}')
+            continue
+        for player_name in engine.missing[mgr]:
+            if player_name in engine.suggestions:
+                closest_match = engine.suggestions[player_name]
+                print(f'\t{player_name} not found in mvp_table... Double check the spelling of player name, closest match is {closest_match}'
+                      ' (confirm it in ./data/player_aliases.csv)')
+            else:
+                print(f'\t{player_name} has no points in mvp_table yet')
+        mgr_df = pd.DataFrame(fantasy_teams_df[mgr])
+        mgr_df[f'{day}'] = mgr_df[mgr].str.strip().map(mgr_day_pts[mgr])
+        print(f'*{day.upper()}*\n```\n{mgr_df.to_markdown(index=False)}\n```')
+        if not engine.missing[mgr]:
+            print(f'All players have min fantasy points.')
+
+    with instrument.span('history append') as s:
+        history.append(day_num, mgr_day_pts)
+        s.rows = sum(len(players) for players in mgr_day_pts.values())
+
+    wins, nrs = engine.standings_results(ipl_team_pts_tbl)
+    scores = dict(zip(fantasy_mgrs, player_scores + engine.team_bonus(wins, nrs)))
+    for mgr in [] if league else fantasy_mgrs:
+        team = fantasy_mgr_teams[mgr].item()
+        if team in engine.teams:
+            j = engine.teams.get_loc(team)
+            print(f'{str(mgr)}\t{str(fantasy_mgr_teams[mgr].values)}\twins:{wins[j]:g}\tnr:{nrs[j]:g}')
+    fingerprint = checkpoint.fingerprint if checkpoint is not None and engine is checkpoint.engine else roster_fingerprint(engine)
+    ScoringCheckpoint(day_num, shared['registry'].names, day_pts, engine.managers, player_scores,
+                      [scores[mgr] for mgr in engine.managers], fingerprint, engine, key).save(checkpoint_file)
+    shared['resolver'].save()
+
+    # Manager totals go to the group's manager x day store (./{group}/results/); the old
+    # ipl2025_results_day_N.csv files are folded into it the first time round
+    with instrument.span('results store') as s:
+        results = migrate_results(f'./{group}', 'ipl2025_results', managers=fantasy_mgrs)
+        results.append(day_num, scores)
+        print()
+        s.rows = len(scores)
+
+    if league:
+        with instrument.span('league table') as s:
+            standings = publish(results, f'./{group}', day_num, neighborhoods=None)
+            s.rows = len(standings)
+        print(standings.top_text())
+        return None
+    results.write_leaderboard(leaderboard_file, day_num)
+
+    return leaderboard_graph_file, results.trend(stop=day_num)
+
+
+def render_group(leaderboard_graph_file, trend):
+    from fantasy.render import RenderCache, fingerprint
+
+    # Not redrawn unless the totals behind it changed since the last run
+    cache = RenderCache(os.path.dirname(leaderboard_graph_file))
+    cache.render(leaderboard_graph_file, fingerprint(trend), lambda path: save_trend_chart(trend, path))
+
+
+def main(groups, render=True):
+    """Scores the groups for `day`; with render=False the charts (and matplotlib) are skipped."""
+    instrument.start('ipl2025_fantasy', day=day, render=render)
+    run_groups(groups, load_shared, score_group, render_group if render else None)
+
+
+if __name__ == '__main__':
+    main(groups_from_args(sys.argv))
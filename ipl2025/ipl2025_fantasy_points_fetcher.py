@@ -7,7 +7,6 @@
 import pandas as pd
 from pprint import pprint
 from bs4 import BeautifulSoup
-import io
 
 pd.set_option('display.max_colwidth', 200)
 pd.set_option('display.max_columns',None) #display all columns
@@ -31,8 +30,25 @@ pd.set_option('display.max_rows',None) #display all rows
 # In[ ]:
 
 
+import os
+import sys
 from datetime import date
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fantasy import instrument
+from fantasy.season_store import import_archive
+from fantasy.snapshots import SnapshotArchive, github_output
+
+# Per-stage timings (Chrome startup, page loads, parsing, ...) go to a JSON report in ./reports/,
+# and FANTASY_PROFILE=cprofile profiles the run as well (see fantasy.instrument)
+instrument.start('ipl2025_fantasy_points_fetcher')
+
+# Picks up any mvp/standings snapshots not yet in ./data/season (a no-op once the archive is imported)
+with instrument.span('season store'):
+    season = import_archive('./data')
+# Snapshots only store what changed since the day before (see fantasy.snapshots)
+archive = SnapshotArchive('./data')
+
 # Change for each day
 ipl_day_0 = date(2025, 3, 21)
 ipl_day_cur = date.today()
@@ -40,86 +56,79 @@ day_num = abs((ipl_day_cur - ipl_day_0).days)
 day = 'day_' + str(day_num)
 prev_day = 'day_' + str(day_num - 1)
 print(day_num)
+instrument.set_meta(day=day)
 
 
 # In[ ]:
 
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
+from fantasy.sources import Page, close_sources, default_sources, fetch_tables
+from fantasy.tables import ipl_mvp_row, ipl_standings_row
 
-user_agent = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/60.0.3112.50 Safari/537.36'
-chrome_options = Options()
-chrome_options.add_argument('user-agent={0}'.format(user_agent))
-chrome_options.add_argument("--window-size=1920,1080")
-chrome_options.add_argument("--headless=new")
-chrome_options.add_argument("--no-sandbox")
+# Plain HTTP first; headless Chrome only if the page didn't carry the table (set FANTASY_SOURCES to override)
+sources = default_sources()
 
-driver = webdriver.Chrome(options=chrome_options)
 
-url = 'https://www.iplt20.com/stats/2025'
-driver.get(url)
+def show_all_mvp(driver):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
 
-button = driver.find_element(By.CLASS_NAME, "awardsStats")
+    button = driver.find_element(By.CLASS_NAME, "awardsStats")
 
-button.click()
+    button.click()
 
-button = driver.find_element(By.CLASS_NAME, "ups")
+    button = driver.find_element(By.CLASS_NAME, "ups")
 
-button.click()
-button = WebDriverWait(driver, 10).until(
-    EC.element_to_be_clickable((By.XPATH, ".//a[contains(@ng-click, 'showAllmvp')]"))
-)
+    button.click()
+    button = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.XPATH, ".//a[contains(@ng-click, 'showAllmvp')]"))
+    )
 
-driver.execute_script("arguments[0].click();", button)
+    driver.execute_script("arguments[0].click();", button)
 
-html = driver.page_source
 
-driver.quit()
+# The row functions split Player into player/team and drop the standings detail rows as the
+# table is read
+mvp_page = Page('mvp', 'https://www.iplt20.com/stats/2025', marker='Pts', browser_steps=show_all_mvp,
+                row=ipl_mvp_row,
+                # In the browser, loaded means the stats tabs show_all_mvp clicks have rendered
+                ready=lambda driver: driver.execute_script(
+                    "return document.getElementsByClassName('awardsStats').length > 0"))
+standings_page = Page('standings', 'https://www.espncricinfo.com/series/ipl-2025-1449924/points-table-standings',
+                      marker='PT', row=ipl_standings_row)
 
 
 # In[16]:
 
 
-tables = pd.read_html(io.StringIO(html))
-mvp_df = [table for table in tables if 'Pts' in table][0]
-## Clean up Player coloumn
-mvp_df[['Player', 'Team']] = mvp_df['Player'].str.rsplit(' ', n=1, expand=True)
-mvp_df['Player'] = mvp_df['Player'].str.replace('\\s+', ' ', regex=True)
-mvp_df['Player'] = mvp_df['Player'].str.lower()
-mvp_df.to_csv(f'./data/mvp_{day}.csv', index=False)
+# Both pages in one go: if the browser is needed after all, one Chrome loads them side by side
+tables = fetch_tables([mvp_page, standings_page], sources)
+close_sources(sources)
+
+mvp_df = tables['mvp']
+with instrument.span('save mvp') as s:
+    mvp_changed = archive.put('mvp', day_num, mvp_df)
+    if mvp_changed:
+        season.append_mvp(day_num, mvp_df)
+    s.rows = len(mvp_df)
+    s.set(changed=mvp_changed)
 mvp_df
 
 
 # In[ ]:
 
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-user_agent = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/60.0.3112.50 Safari/537.36'
-chrome_options = Options()
-chrome_options.add_argument('user-agent={0}'.format(user_agent))
-chrome_options.add_argument("--window-size=1920,1080")
-chrome_options.add_argument("--headless=new")
-chrome_options.add_argument("--no-sandbox")
-driver = webdriver.Chrome(options=chrome_options)
-
-url = 'https://www.espncricinfo.com/series/ipl-2025-1449924/points-table-standings'
-driver.get(url)
-html = driver.page_source
-driver.quit()
-
-tables = pd.read_html(io.StringIO(html))
+ipl_team_pts_tbl = tables['standings']
+with instrument.span('save standings') as s:
+    standings_changed = archive.put('standings', day_num, ipl_team_pts_tbl)
+    if standings_changed:
+        season.append_standings(day_num, ipl_team_pts_tbl)
+    s.rows = len(ipl_team_pts_tbl)
+    s.set(changed=standings_changed)
 
-ipl_team_pts_tbl = [table for table in tables if 'PT' in table][0]
-ipl_team_pts_tbl = ipl_team_pts_tbl.iloc[::2]
-ipl_team_pts_tbl = ipl_team_pts_tbl.iloc[:, :12]
-ipl_team_pts_tbl['Teams'] = ipl_team_pts_tbl['Teams'].replace('\\s+', ' ', regex=True).replace('\\d', '', regex=True)
-ipl_team_pts_tbl.to_csv(f'./data/standings_{day}.csv',index=False)
+# Neither table changed (no match yesterday): nothing to score, render or commit today
+changed = mvp_changed or standings_changed
+print('tables changed' if changed else 'mvp and standings unchanged since the last snapshots')
+github_output(changed=changed)
 
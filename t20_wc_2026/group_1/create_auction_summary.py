@@ -1,5 +1,12 @@
 import pandas as pd
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from fantasy.names import NameResolver
+
+# Auction spellings are mapped onto the points table's names through the confirmed alias table
+resolver = NameResolver.from_sources(players_csv='../data/players.csv', alias_path='../data/player_aliases.csv')
 
 # Read the sold players CSV
 df = pd.read_csv('sold_players.csv')
@@ -10,9 +17,8 @@ winners = sorted(df['Winner'].unique())
 # Create a dictionary to store players for each winner
 summary_data = {}
 
-for winner in winners:
-    winner_players = df[df['Winner'] == winner]['Player'].str.lower().tolist()
-    summary_data[winner] = winner_players
+for winner, players in df.groupby('Winner', sort=True)['Player']:
+    summary_data[winner] = [resolver.lookup(p)[0] or p.lower() for p in players]
 
 # Create DataFrame with equal length columns (pad with empty strings)
 max_length = max(len(players) for players in summary_data.values())
@@ -25,6 +31,7 @@ summary_df = pd.DataFrame(summary_data)
 # Save to CSV
 output_file = 'AuctionSummary.csv'
 summary_df.to_csv(output_file, index=False)
+resolver.save()
 print(f'Created {output_file}')
 print(f'Winners: {len(winners)}')
 print(f'Max players per winner: {max_length}')
@@ -1,5 +1,13 @@
 import pandas as pd
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from fantasy.names import NameResolver
+from fantasy.results_store import ResultsStore
+
+# Auction spellings are mapped onto the points table's names through the confirmed alias table
+resolver = NameResolver.from_sources(players_csv='../data/players.csv', alias_path='../data/player_aliases.csv')
 
 # Read the sold players CSV
 df = pd.read_csv('./sold_players.csv')
@@ -12,19 +20,17 @@ output_dir = './winners'
 os.makedirs(output_dir, exist_ok=True)
 
 # Create individual CSV files for each winner
-for winner in winners:
-    winner_df = df[df['Winner'] == winner][['Player', 'Team']].copy()
-    winner_df['Player'] = winner_df['Player'].str.lower()
+for winner, winner_df in df.groupby('Winner', sort=False)[['Player', 'Team']]:
+    winner_df = winner_df.copy()
+    winner_df['Player'] = [resolver.lookup(p)[0] or p.lower() for p in winner_df['Player']]
     winner_df['Team'] = winner_df['Team'].str.lower()
     output_file = os.path.join(output_dir, f'{winner}.csv')
     winner_df.to_csv(output_file, index=False)
     print(f'Created {output_file} with {len(winner_df)} players')
 
+resolver.save()
 print(f'\nTotal winners: {len(winners)}')
 
-# Create results file with winners and initial score of 0.0
-results_data = {'Winner': sorted(winners), 'Points': [0.0] * len(winners)}
-results_df = pd.DataFrame(results_data)
-results_file = 't20_wc_2026_results_day_0.csv'
-results_df.to_csv(results_file, index=False, header=False)
-print(f'\nCreated {results_file} with {len(winners)} winners')
+# Seed the results store (./results/) with every winner on 0.0 as day 0
+ResultsStore('./results').append(0, {winner: 0.0 for winner in sorted(winners)})
+print(f'\nSeeded ./results with {len(winners)} winners')
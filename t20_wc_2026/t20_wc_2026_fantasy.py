@@ -1,18 +1,34 @@
 import pandas as pd
 import sys
 import os
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-import time
-import re
 from datetime import date
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fantasy import instrument
+from fantasy.atomic import save_figure
+from fantasy.batch import groups_from_args, run_groups
+from fantasy.checkpoint import ScoringCheckpoint, engine_key, incremental_player_totals, roster_fingerprint
+from fantasy.league import league_mode, publish
+from fantasy.names import NameResolver
+from fantasy.ownership import OwnershipIndex
+from fantasy.results_store import migrate_results
+from fantasy.season_store import import_archive
+from fantasy.scoring import ScoringEngine
+from fantasy.site import Site, build as build_site
+from fantasy.snapshots import import_snapshots
+
+# Usage
+#  python t20_wc_2026_fantasy.py                    score every group_* directory
+#  python t20_wc_2026_fantasy.py group_1 [group_2]  score just those groups (in one process)
+#  python -m fantasy score --tournament t20_wc_2026   just the scores and leaderboards, from the repo root
+#  FANTASY_PROFILE=cprofile python t20_wc_2026_fantasy.py   also profile the run (see fantasy.instrument)
+# Every run writes per-stage timings to ./reports/t20_wc_2026_fantasy.json
+
 # ==========================================
 # 1. SETUP & PATHS
 # ==========================================
 USERNAME = "suddu16"
 REPO = "cricket-fantasy"
-group = sys.argv[1] if len(sys.argv) > 1 else 'group_1'
 
 # Detect current day
 ipl_day_0 = date(2026, 2, 6)
@@ -20,127 +36,150 @@ ipl_day_cur = date.today()
 day_num = abs((ipl_day_cur - ipl_day_0).days)
 day = f'day_{day_num}'
 
-# Fallback to latest file
-if not os.path.exists(f'./data/mvp_{day}.csv'):
-    files = sorted([f for f in os.listdir('./data/') if f.startswith('mvp_day_')], 
-                   key=lambda x: int(x.split('_')[2].split('.')[0]), reverse=True)
-    day = files[0].replace('mvp_', '').replace('.csv', '') if files else 'day_1'
+# Fallback to the latest day with a snapshot of its own (days with an unchanged table have none)
+archive = import_snapshots('./data')
+mvp_days = archive.days('mvp')
+if day_num not in mvp_days:
+    day = f'day_{mvp_days[-1]}' if len(mvp_days) else 'day_1'
 
-ts = int(time.time())
-print(f"🚀 Processing {day.upper()} for {group}...")
 
 # ==========================================
 # 2. LOAD & MAP DATA
 # ==========================================
-mvp_df = pd.read_csv(f'./data/mvp_{day}.csv')
-mvp_df['Player'] = mvp_df['Player'].astype(str).str.lower().str.strip()
-
-auction_file = f'./{group}/AuctionSummary.csv'
-fantasy_teams_df = pd.read_csv(auction_file)
-fantasy_mgrs = [c.strip() for c in fantasy_teams_df.columns]
-fantasy_teams_df.columns = fantasy_mgrs
-
-player_to_owner = {}
-scores = {mgr: 0.0 for mgr in fantasy_mgrs}
-
-for mgr in fantasy_mgrs:
-    mgr_players = fantasy_teams_df[mgr].dropna().astype(str).str.lower().str.strip().tolist()
-    for p in mgr_players: player_to_owner[p] = mgr.upper()
-    mgr_pts = mvp_df[mvp_df['Player'].isin(mgr_players)]['Pts'].sum()
-    scores[mgr] = round(mgr_pts, 2)
-
-scores_df = pd.DataFrame(list(scores.items()), columns=['Manager', 'Pts']).sort_values(by='Pts', ascending=False)
-
-# ==========================================
-# 3. GENERATE ANIMATED PROGRESSION (MOVING GRAPH)
-# ==========================================
-print("🎬 Creating animated race...")
-plt.style.use('dark_background')
-fig, ax = plt.subplots(figsize=(10, 5))
-
-history_data = {mgr: [0] for mgr in fantasy_mgrs}
-days_files = sorted([f for f in os.listdir('./data/') if f.startswith('mvp_day_')], 
-                    key=lambda x: int(x.split('_')[2].split('.')[0]))
-
-for d_file in days_files:
-    temp_df = pd.read_csv(f'./data/{d_file}')
-    temp_df['Player'] = temp_df['Player'].astype(str).str.lower().str.strip()
-    for mgr in fantasy_mgrs:
-        mgr_players = fantasy_teams_df[mgr].dropna().astype(str).str.lower().str.strip().tolist()
-        pts = temp_df[temp_df['Player'].isin(mgr_players)]['Pts'].sum()
-        history_data[mgr].append(pts)
-
-lines = [ax.plot([], [], lw=3, marker='o', label=mgr)[0] for mgr in fantasy_mgrs]
-ax.set_xlim(0, len(days_files))
-ax.set_ylim(0, max([max(v) for v in history_data.values()]) * 1.1)
-ax.set_title("📈 THE CHASE: LIVE PROGRESSION", fontsize=14, color='#00d4ff')
-ax.legend(loc='center left', bbox_to_anchor=(1, 0.5))
-
-def animate(i):
-    for j, mgr in enumerate(fantasy_mgrs):
-        lines[j].set_data(range(i+1), history_data[mgr][:i+1])
-    return lines
-
-ani = animation.FuncAnimation(fig, animate, frames=len(days_files)+1, interval=400, blit=True)
-ani.save(f'./{group}/points_progression.gif', writer='pillow')
-plt.close()
-
-# ==========================================
-# 4. GENERATE PIE CHART (TRANSPARENT)
-# ==========================================
-plt.figure(figsize=(6, 6))
-plt.pie(scores_df['Pts'], labels=scores_df['Manager'], autopct='%1.1f%%', colors=plt.cm.Paired.colors)
-plt.savefig(f'./{group}/manager_distribution.png', transparent=True)
-plt.close()
-
-# ==========================================
-# 5. WEB INJECTION & GROUP 2 REMOVAL
-# ==========================================
-print("🏗️ Updating index.html UI...")
-
-ui_html = f"""
-<style>
-    :root {{ --bg: #0b0e11; --card: #15191c; --text: #f0f0f0; --accent: #00d4ff; }}
-    body.light-mode {{ --bg: #f8f9fa; --card: #ffffff; --text: #212529; --accent: #007bff; }}
-    body {{ background: var(--bg) !important; color: var(--text) !important; transition: 0.3s ease; font-family: sans-serif; }}
-    .f-container {{ background: var(--card); border: 1px solid #333; border-radius: 15px; padding: 20px; margin: 20px auto; max-width: 1000px; box-shadow: 0 4px 20px rgba(0,0,0,0.4); text-align: center; }}
-    #t-btn {{ position: fixed; bottom: 25px; right: 25px; z-index: 9999; background: var(--accent); color: white; border: none; border-radius: 50%; width: 55px; height: 55px; cursor: pointer; font-size: 22px; box-shadow: 0 4px 10px rgba(0,0,0,0.3); }}
-</style>
-<button id="t-btn" onclick="toggleT()">🌓</button>
-<div class="f-container">
-    <h2 style="color: var(--accent); letter-spacing: 1px;">🏆 TOURNAMENT DASHBOARD</h2>
-    <img src="./{group}/points_progression.gif?v={ts}" style="width: 100%; border-radius: 10px;">
-    <div style="display: flex; flex-wrap: wrap; justify-content: center; margin-top: 20px; gap: 20px;">
-        <div style="flex: 1; min-width: 300px;">
-            <h4 style="color: var(--accent)">Points Distribution</h4>
-            <img src="./{group}/manager_distribution.png?v={ts}" style="width: 100%; max-width: 350px;">
-        </div>
-    </div>
-</div>
-<script>
-    function toggleT() {{
-        document.body.classList.toggle('light-mode');
-        localStorage.setItem('theme', document.body.classList.contains('light-mode')?'light':'dark');
-    }}
-    if(localStorage.getItem('theme')==='light') document.body.classList.add('light-mode');
-</script>
-"""
-
-if os.path.exists('index.html'):
-    with open('index.html', 'r') as f:
-        content = f.read()
-    
-    # 1. Remove Group 2 Tabs/Content
-    content = re.sub(r'<li.*?>.*?Group 2.*?</li>', '', content, flags=re.I)
-    content = re.sub(r'<div.*?id="group_2".*?>.*?</div>', '', content, flags=re.I | re.S)
-    
-    # 2. Inject or Update Dashboard
-    if "" in content:
-        content = re.sub(r".*?", ui_html, content, flags=re.S)
-    else:
-        content = content.replace("<body>", "<body>" + ui_html)
-        
-    with open('index.html', 'w') as f:
-        f.write(content)
-
-print(f"✅ Success! Run 'git push' to see the moving graph and toggle on your site.")
\ No newline at end of file
+def load_shared():
+    """Tournament-wide inputs, read once no matter how many groups get scored."""
+    # Whole-season history comes from the columnar store (players x days), not one CSV per day;
+    # its rows are indexed by player id (fantasy.registry), and so is the day's points vector
+    with instrument.span('season store') as s:
+        season = import_archive('./data')
+        history_days, history_pts = season.points()
+        day_pts = season.day_points(int(day.split('_')[1]))[1]
+        s.rows = len(history_days)
+    # Misspelt roster names resolve through the confirmed rows of ./data/player_aliases.csv; close
+    # fuzzy matches are added there as pending rows, which score nothing until confirmed
+    resolver = NameResolver.from_sources([season.players()], players_csv='./data/players.csv',
+                                         alias_path='./data/player_aliases.csv')
+    return {'day_pts': day_pts, 'history_days': history_days, 'history_pts': history_pts,
+            'registry': season.registry, 'resolver': resolver}
+
+
+def score_group(group, shared):
+    print(f"🚀 Processing {day.upper()} for {group}...")
+    auction_file = f'./{group}/AuctionSummary.csv'
+    fantasy_teams_df = pd.read_csv(auction_file)
+    fantasy_mgrs = [c.strip() for c in fantasy_teams_df.columns]
+    fantasy_teams_df.columns = fantasy_mgrs
+
+    # The engine is reused from the last run's checkpoint while the rosters and aliases are unchanged,
+    # and going forward only the rostered players whose points moved are pushed through it
+    checkpoint_file = f'./{group}/scoring_checkpoint.npz'
+    checkpoint = ScoringCheckpoint.load(checkpoint_file)
+    key = engine_key(auction_file, shared['resolver'])
+    with instrument.span('ownership matrix') as s:
+        engine = checkpoint.engine_for(key, shared['registry']) if checkpoint is not None else None
+        if engine is None:
+            rosters = {mgr: fantasy_teams_df[mgr] for mgr in fantasy_mgrs}
+            engine = ScoringEngine(rosters, shared['registry'], resolver=shared['resolver'])
+            s.set(players=len(engine.players), **engine.lookup_stats)
+        else:
+            s.set(reused=True)
+        s.rows = len(engine.managers)
+    shared['resolver'].save()
+
+    scored_day = int(day.split('_')[1])
+    reused = checkpoint is not None and engine is checkpoint.engine
+    with instrument.span('scoring') as s:
+        day_pts = shared['day_pts']
+        if reused and checkpoint.day_num <= scored_day:
+            player_scores, changed, affected = incremental_player_totals(engine, checkpoint, day_pts)
+            s.set(incremental=True, changed_players=len(changed), managers_affected=len(affected))
+        else:
+            player_scores = engine.player_totals(day_pts)
+        scores = dict(zip(fantasy_mgrs, player_scores.round(2)))
+        s.rows = len(scores)
+    ScoringCheckpoint(scored_day, shared['registry'].names, day_pts, engine.managers, player_scores,
+                      [scores[mgr] for mgr in engine.managers],
+                      checkpoint.fingerprint if reused else roster_fingerprint(engine), engine, key).save(checkpoint_file)
+
+    # Totals per day go to the group's results store (any old t20_wc_2026_results_day_N.csv files
+    # are folded into it first); the leaderboard text is a view of it
+    with instrument.span('results store') as s:
+        results = migrate_results(f'./{group}', 't20_wc_2026_results', managers=fantasy_mgrs)
+        results.append(scored_day, scores)
+        s.rows = len(scores)
+
+    if league_mode(len(fantasy_mgrs)):
+        # Public league: ranks and movement for everyone, written as the top of the table plus each
+        # manager's own neighborhood, and no per-manager charts (see fantasy.league)
+        with instrument.span('league table') as s:
+            standings = publish(results, f'./{group}', scored_day, neighborhoods=None)
+            s.rows = len(standings)
+        print(standings.top_text())
+        return None
+    results.write_leaderboard(f'./{group}/t20_wc_2026_leaderboard.txt', scored_day)
+
+    scores_df = pd.DataFrame(list(scores.items()), columns=['Manager', 'Pts']).sort_values(by='Pts', ascending=False)
+
+    # One sparse product gives every manager's total for every day
+    with instrument.span('season totals') as s:
+        history_totals = engine.player_totals(shared['history_pts'])
+        s.rows = history_totals.size
+    history_data = {mgr: [0] + history_totals[i].tolist() for i, mgr in enumerate(fantasy_mgrs)}
+    return group, fantasy_mgrs, history_data, len(shared['history_days']), scores_df
+
+
+def render_group(group, fantasy_mgrs, history_data, n_days, scores_df):
+    from fantasy.render import RenderCache, fingerprint, plt, progression_gif
+
+    # Charts are only redrawn when their data changed, and the GIF only draws the frames
+    # (days) it hasn't drawn before - see fantasy.render
+    cache = RenderCache(f'./{group}')
+
+    # ==========================================
+    # 3. GENERATE ANIMATED PROGRESSION (MOVING GRAPH)
+    # ==========================================
+    print("🎬 Creating animated race...")
+    progression_gif(cache, f'./{group}/points_progression.gif',
+                    {mgr: history_data[mgr][:n_days + 1] for mgr in fantasy_mgrs},
+                    title="📈 THE CHASE: LIVE PROGRESSION")
+
+    # ==========================================
+    # 4. GENERATE PIE CHART (TRANSPARENT)
+    # ==========================================
+    def draw_pie(path):
+        with plt.style.context('dark_background'):
+            fig = plt.figure(figsize=(6, 6))
+            plt.pie(scores_df['Pts'], labels=scores_df['Manager'], autopct='%1.1f%%', colors=plt.cm.Paired.colors)
+            save_figure(fig, path, transparent=True)
+            plt.close(fig)
+
+    cache.render(f'./{group}/manager_distribution.png', fingerprint(scores_df), draw_pie)
+
+
+def main(groups, render=True):
+    """Scores the groups for `day`, then draws the charts and builds the site (index.html, the
+    leaderboard, ownership and squads pages); with render=False only the scores and leaderboards
+    are written."""
+    instrument.start('t20_wc_2026_fantasy', day=day, render=render)
+    shared = run_groups(groups, load_shared, score_group, render_group if render else None)
+    if not render:
+        return
+    # Pages are only rewritten when what they show changed, and charts are linked by content hash
+    # (see fantasy.site); the site is shared by every group, so it is only built from this process
+    site = Site('.')
+    # Who-owns-whom reports for every group, from one ownership index (see fantasy.ownership)
+    with instrument.span('ownership reports') as s:
+        ownership = OwnershipIndex.from_groups('.', shared['registry'], shared['day_pts'], groups,
+                                               shared['resolver'])
+        ownership.write_reports('.', site)
+        s.rows = len(ownership.names)
+    with instrument.span('site') as s:
+        build_site(site, groups, int(day.split('_')[1]))
+        s.rows = len(site.written)
+    print(f"🏗️ {len(site.written)} pages updated: {', '.join(site.written) or 'none'}")
+
+    print(f"✅ Success! Run 'git push' to see the moving graph and toggle on your site.")
+
+
+if __name__ == '__main__':
+    main(groups_from_args(sys.argv))
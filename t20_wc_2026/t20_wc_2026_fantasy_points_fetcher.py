@@ -7,7 +7,6 @@
 import pandas as pd
 from pprint import pprint
 from bs4 import BeautifulSoup
-import io
 
 pd.set_option('display.max_colwidth', 200)
 pd.set_option('display.max_columns',None) #display all columns
@@ -31,8 +30,25 @@ pd.set_option('display.max_rows',None) #display all rows
 # In[1]:
 
 
+import os
+import sys
 from datetime import date
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fantasy import instrument
+from fantasy.season_store import import_archive
+from fantasy.snapshots import SnapshotArchive, github_output
+
+# Per-stage timings (Chrome startup, page loads, parsing, ...) go to a JSON report in ./reports/,
+# and FANTASY_PROFILE=cprofile profiles the run as well (see fantasy.instrument)
+instrument.start('t20_wc_2026_fantasy_points_fetcher')
+
+# Picks up any mvp snapshots not yet in ./data/season (a no-op once the archive is imported)
+with instrument.span('season store'):
+    season = import_archive('./data')
+# Snapshots only store what changed since the day before (see fantasy.snapshots)
+archive = SnapshotArchive('./data')
+
 # Change for each day
 ipl_day_0 = date(2026, 2, 6)
 ipl_day_cur = date.today()
@@ -40,71 +56,87 @@ day_num = abs((ipl_day_cur - ipl_day_0).days)
 day = 'day_' + str(day_num)
 prev_day = 'day_' + str(day_num - 1)
 print(day_num)
+instrument.set_meta(day=day)
 
 
 # In[ ]:
 
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import NoSuchElementException
+import re
 
-user_agent = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/60.0.3112.50 Safari/537.36'
-chrome_options = Options()
-chrome_options.add_argument('user-agent={0}'.format(user_agent))
-chrome_options.add_argument("--window-size=1920,1080")
-chrome_options.add_argument("--headless=new")
-chrome_options.add_argument("--no-sandbox")
+from fantasy.paginated import PaginatedPage
+from fantasy.sources import close_sources, default_sources, fetch_table
+from fantasy.tables import T20_POINTS, t20_player_row
 
-driver = webdriver.Chrome(options=chrome_options)
+# All player pages fetched concurrently first, headless Chrome's click-to-load loop only as the
+# fallback (set FANTASY_SOURCES to override)
+sources = default_sources('paginated,http,selenium')
 
-url = 'https://cricketxi.com/t20-world-cup-2026/players/'
-driver.get(url)
 
+def load_all_players(driver):
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException, TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
 
-# Keep clicking the awardsStats button until it's no longer found
-import time
+    # Keep clicking the loading button until it's no longer found, each time waiting for the click
+    # to bring in more rows (or the button to go) rather than sleeping a fixed time
+    while True:
+        try:
+            button = driver.find_element(By.CLASS_NAME, "loading")
+            rows = len(driver.find_elements(By.CSS_SELECTOR, "table tr"))
+            button.click()
+            print("Clicked loading button")
+            WebDriverWait(driver, 10, poll_frequency=0.1).until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, "table tr")) > rows
+                or not d.find_elements(By.CLASS_NAME, "loading"))
+        except NoSuchElementException:
+            print("loading button no longer found - continuing...")
+            break
+        except TimeoutException:
+            print("loading button stopped bringing in players - continuing...")
+            break
 
-while True:
-    try:
-        button = driver.find_element(By.CLASS_NAME, "loading")
-        button.click()
-        print("Clicked loading button")
-        # Optional: add a small delay to avoid overwhelming the server
-        time.sleep(0.5)
-    except NoSuchElementException:
-        print("loading button no longer found - continuing...")
-        break
 
-html = driver.page_source
+def no_more_to_load(html):
+    # The served page only has the first batch of players while a "loading" element is present
+    return re.search(r'class="[^"]*\bloading\b', html) is None
 
-driver.quit()
 
+def players_page_url(n):
+    return f'https://cricketxi.com/t20-world-cup-2026/players/?pg={n}'
 
-# In[5]:
 
+def players_page_count(html):
+    # The "loading" (load more) element carries the number of pages it can pull in
+    m = re.search(r'data-max-pages="(\d+)"', html)
+    if m:
+        return int(m.group(1))
+    return 1 if no_more_to_load(html) else None
 
-tables = pd.read_html(io.StringIO(html))
-tables[0].columns
-mvp_df = [table for table in tables if 'Points  Points  Arrow up  Arrow down  Total Points' in table][0]
 
-mvp_df[['Player', 'Player Short Name']] = mvp_df['Player'].str.rsplit('  ', n=1, expand=True)
-mvp_df[['Team long name', 'Team']] = mvp_df['Team'].str.rsplit('  ', n=1, expand=True)
-mvp_df[['Position long name', 'Position']] = mvp_df['Position'].str.rsplit('  ', n=1, expand=True)
+players_page = PaginatedPage('players', 'https://cricketxi.com/t20-world-cup-2026/players/',
+                             marker=T20_POINTS, page_url=players_page_url, page_count=players_page_count,
+                             browser_steps=load_all_players, complete=no_more_to_load,
+                             # Comes back as Player / Player Short Name / Team / Position / Pts, lowercased
+                             row=t20_player_row)
+
+
+# In[5]:
+
 
-# mvp_df['Player'] = mvp_df['Player'].str.replace('\\s+', ' ', regex=True)
-mvp_df['Player'] = mvp_df['Player'].str.lower()
-mvp_df['Team'] = mvp_df['Team'].str.lower()
-mvp_df['Position'] = mvp_df['Position'].str.lower()
-mvp_df['Player Short Name'] = mvp_df['Player Short Name'].str.lower()
+mvp_df = fetch_table(players_page, sources)
+close_sources(sources)
 
-mvp_df = mvp_df.rename(columns={"Points  Points  Arrow up  Arrow down  Total Points": "Pts"})
-mvp_df = mvp_df[['Player', 'Player Short Name', 'Team', 'Position', 'Pts']]
+with instrument.span('save mvp') as s:
+    changed = archive.put('mvp', day_num, mvp_df)
+    if changed:
+        season.append_mvp(day_num, mvp_df)
+    s.rows = len(mvp_df)
+    s.set(changed=changed)
 
-mvp_df.to_csv(f'./data/mvp_{day}.csv', index=False)
+# An unchanged table means nothing to score, render or commit today
+print('mvp table changed' if changed else 'mvp table unchanged since the last snapshot')
+github_output(changed=changed)
 
 mvp_df
 